@@ -1,8 +1,9 @@
 import discord
 import asyncio
+import heapq
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union, List, Dict
+from typing import Optional, Union, List, Dict, Tuple
 from collections import deque
 
 from redbot.core import Config, commands, checks
@@ -71,6 +72,18 @@ class BeriCautions(commands.Cog):
 
         # Members temporarily excluded from enforcement during intentional unmute operations.
         self._suppress_enforcement = set()
+
+        # Warning expiry index: per-guild min-heaps of (next expiry, member_id).
+        # _expiry_due holds each member's live (earliest) entry; superseded heap entries are skipped when popped.
+        self._expiry_heaps: Dict[int, List[Tuple[float, int]]] = {}
+        self._expiry_due: Dict[Tuple[int, int], float] = {}
+        self._expiry_wakeup = asyncio.Event()
+
+        # Pending auto-unmutes: one min-heap of (muted_until, guild_id, member_id), loaded at startup.
+        self._unmute_heap: List[Tuple[float, int, int]] = []
+        self._unmute_due: Dict[Tuple[int, int], float] = {}
+        self._unmute_wakeup = asyncio.Event()
+        self._unmute_retries: Dict[Tuple[int, int], int] = {}  # failed auto-unmute attempts, for backoff
         
         # Start background tasks
         self.warning_cleanup_task = self.bot.loop.create_task(self.warning_cleanup_loop())
@@ -122,6 +135,10 @@ class BeriCautions(commands.Cog):
                 if not warning.get("pause_anchor"):
                     warning["pause_anchor"] = current_time
 
+        # Paused warnings now expire later; an existing earlier entry still fires and
+        # re-files the member at the shifted time.
+        await self._reschedule_member_expiry(member)
+
     async def _release_caution_hold(self, member: discord.Member) -> None:
         """Resume warning expiry countdown when punishment is no longer active."""
         current_time = datetime.utcnow().timestamp()
@@ -137,6 +154,9 @@ class BeriCautions(commands.Cog):
                     warning["paused_seconds"] = warning.get("paused_seconds", 0) + max(0, current_time - pause_anchor)
                     warning["pause_anchor"] = None
 
+        # The countdown resumes now, possibly earlier than the hold end that was scheduled.
+        await self._reschedule_member_expiry(member)
+
     async def _is_fine_exempt(self, member: discord.Member) -> bool:
         """Check if member is exempt from fines."""
         exempt_roles = await self.config.guild(member.guild).fine_exempt_roles()
@@ -209,182 +229,288 @@ class BeriCautions(commands.Cog):
             log.error(f"Error applying Beri fine: {e}", exc_info=True)
             return False
 
+    def _next_warning_expiry(self, member_data: Dict, expiry_days: int, current_time: float) -> Optional[float]:
+        """Earliest time one of the member's warnings can expire (paused warnings resume when the hold ends)."""
+        warnings = member_data.get("warnings") or []
+        if not warnings:
+            return None
+        pause_end = member_data.get("caution_hold_until") or current_time
+        return min(self._calculate_warning_expiry(w, expiry_days, pause_end) for w in warnings)
+
+    def _schedule_warning_expiry(self, guild_id: int, member_id: int, due: Optional[float]) -> None:
+        """
+        File a member in their guild's expiry heap, keeping whichever of the new and
+        current times is earlier. Firing early is harmless: _expire_member_warnings
+        re-reads the member and files their real next expiry. None leaves it as is.
+        Superseded heap entries are skipped lazily when popped.
+        """
+        key = (int(guild_id), int(member_id))
+        current = self._expiry_due.get(key)
+        if due is None or (current is not None and current <= due):
+            return
+        self._expiry_due[key] = due
+        heap = self._expiry_heaps.setdefault(key[0], [])
+        heapq.heappush(heap, (due, key[1]))
+        if heap[0] == (due, key[1]):
+            self._expiry_wakeup.set()
+
+    async def _reschedule_member_expiry(self, member: discord.Member) -> None:
+        """Refresh a member's heap entry after their warnings or hold changed."""
+        expiry_days = await self.config.guild(member.guild).warning_expiry_days()
+        member_data = await self.config.member(member).all()
+        due = self._next_warning_expiry(member_data, expiry_days, datetime.utcnow().timestamp())
+        self._schedule_warning_expiry(member.guild.id, member.id, due)
+
+    async def _build_guild_expiry_heap(self, guild: discord.Guild, expiry_days: int) -> None:
+        """Index every warned member of a guild (startup and expiry setting changes)."""
+        current_time = datetime.utcnow().timestamp()
+        all_members = await self.config.all_members(guild)
+        for member_id, member_data in all_members.items():
+            due = self._next_warning_expiry(member_data, expiry_days, current_time)
+            self._schedule_warning_expiry(guild.id, member_id, due)
+
+    def _pop_due_warning_expiry(self, current_time: float):
+        """Pop the next live heap entry due by current_time as (guild_id, member_id); otherwise return (None, next_due)."""
+        earliest = None
+        for guild_id, heap in self._expiry_heaps.items():
+            while heap and self._expiry_due.get((guild_id, heap[0][1])) != heap[0][0]:
+                heapq.heappop(heap)
+            if heap and (earliest is None or heap[0][0] < earliest[0]):
+                earliest = (heap[0][0], guild_id)
+        if earliest is None:
+            return None, None
+        due, guild_id = earliest
+        if due > current_time:
+            return None, due
+        _, member_id = heapq.heappop(self._expiry_heaps[guild_id])
+        del self._expiry_due[(guild_id, member_id)]
+        return (guild_id, member_id), None
+
+    async def _expire_member_warnings(self, guild: discord.Guild, member_id: int, guild_data: Dict) -> Optional[float]:
+        """Drop a member's expired warnings in one write; returns when their next warning expires."""
+        expiry_days = guild_data["warning_expiry_days"]
+        current_time = datetime.utcnow().timestamp()
+        removed_warnings_count = 0
+
+        async with self.config.member_from_ids(guild.id, member_id).all() as member_data:
+            warnings = member_data.get("warnings") or []
+            if not warnings:
+                return None
+
+            hold_until = member_data.get("caution_hold_until")
+            hold_active = bool(hold_until and current_time < hold_until)
+            # A hold that lapsed without being released paused the countdown until its end, not until now.
+            pause_end = hold_until if hold_until and not hold_active else current_time
+
+            updated_warnings = []
+            for warning in warnings:
+                pause_anchor = warning.get("pause_anchor")
+
+                # If hold is active, keep warnings paused. If hold ended, finalize paused time.
+                if hold_active and not pause_anchor:
+                    warning["pause_anchor"] = current_time
+                elif not hold_active and pause_anchor:
+                    warning["paused_seconds"] = warning.get("paused_seconds", 0) + max(0, pause_end - pause_anchor)
+                    warning["pause_anchor"] = None
+
+                expiry_time = self._calculate_warning_expiry(warning, expiry_days, current_time)
+                warning["expiry"] = expiry_time
+
+                # Keep warning if not expired
+                if current_time < expiry_time:
+                    updated_warnings.append(warning)
+                else:
+                    removed_warnings_count += 1
+
+            member_data["warnings"] = updated_warnings
+            # Clear hold marker once it has passed.
+            if hold_until and not hold_active:
+                member_data["caution_hold_until"] = None
+            total_points = sum(w.get("points", 1) for w in updated_warnings)
+            member_data["total_points"] = total_points
+            next_due = self._next_warning_expiry(member_data, expiry_days, current_time)
+
+        # Only log when one or more warnings were actually removed.
+        if removed_warnings_count > 0:
+            log_channel_id = guild_data.get("log_channel")
+            if log_channel_id:
+                log_channel = guild.get_channel(log_channel_id)
+                if log_channel:
+                    member = guild.get_member(int(member_id))
+                    if member:
+                        embed = discord.Embed(
+                            title="Warnings Expired",
+                            description=f"{removed_warnings_count} warning(s) for {member.mention} have expired.",
+                            color=0x00ff00
+                        )
+                        embed.add_field(name="Current Points", value=str(total_points))
+                        embed.set_footer(text=datetime.utcnow().strftime("%m/%d/%Y %I:%M %p"))
+                        await self.safe_send_message(log_channel, embed=embed)
+        return next_due
+
     async def warning_cleanup_loop(self):
-        """Background task to check and remove expired warnings."""
+        """Background task that removes warnings as they expire, sleeping until the next one is due."""
         await self.bot.wait_until_ready()
-        
+
+        # Index every guild once; warns, hold changes and setexpiry re-file members afterwards.
+        try:
+            all_guilds = await self.config.all_guilds()
+            for guild_id, guild_data in all_guilds.items():
+                guild = self.bot.get_guild(guild_id)
+                if guild:
+                    await self._build_guild_expiry_heap(guild, guild_data["warning_expiry_days"])
+                    await asyncio.sleep(0)
+            log.info(f"Tracking warning expiry for {len(self._expiry_due)} member(s)")
+        except Exception as e:
+            log.error(f"Error loading warning expiries: {e}", exc_info=True)
+
         while True:
+            entry = None
             try:
-                log.info("Running warning cleanup task")
-                
-                # Yield control before starting heavy work
-                await asyncio.sleep(0)
-                
-                all_guilds = await self.config.all_guilds()
-                
-                guild_count = 0
-                for guild_id, guild_data in all_guilds.items():
-                    # Yield control between guilds
-                    guild_count += 1
-                    if guild_count % 5 == 0:
-                        await asyncio.sleep(0)
-                    
-                    guild = self.bot.get_guild(guild_id)
-                    if not guild:
-                        continue
-                        
-                    expiry_days = guild_data["warning_expiry_days"]
-                    current_time = datetime.utcnow().timestamp()
-                    
-                    # Get all members with warnings in this guild
-                    all_members = await self.config.all_members(guild)
-                    
-                    member_count = 0
-                    for member_id, member_data in all_members.items():
-                        # Yield control every 10 members
-                        member_count += 1
-                        if member_count % 10 == 0:
-                            await asyncio.sleep(0)
-                        
-                        if not member_data.get("warnings"):
-                            continue
-
-                        hold_until = member_data.get("caution_hold_until")
-                        hold_active = bool(hold_until and current_time < hold_until)
-                            
-                        warnings = member_data["warnings"]
-                        updated_warnings = []
-                        warnings_changed = False
-                        removed_warnings_count = 0
-                        
-                        for warning in warnings:
-                            pause_anchor = warning.get("pause_anchor")
-
-                            # If hold is active, keep warnings paused. If hold ended, finalize paused time.
-                            if hold_active and not pause_anchor:
-                                warning["pause_anchor"] = current_time
-                                warnings_changed = True
-                            elif not hold_active and pause_anchor:
-                                warning["paused_seconds"] = warning.get("paused_seconds", 0) + max(0, current_time - pause_anchor)
-                                warning["pause_anchor"] = None
-                                warnings_changed = True
-
-                            expiry_time = self._calculate_warning_expiry(warning, expiry_days, current_time)
-                            if warning.get("expiry") != expiry_time:
-                                warning["expiry"] = expiry_time
-                                warnings_changed = True
-                            
-                            # Keep warning if not expired
-                            if current_time < expiry_time:
-                                updated_warnings.append(warning)
-                            else:
-                                removed_warnings_count += 1
-                        
-                        # Update if warnings were removed
-                        if len(warnings) != len(updated_warnings) or warnings_changed:
-                            member_config = self.config.member_from_ids(guild_id, member_id)
-                            await member_config.warnings.set(updated_warnings)
-
-                            # Clear hold marker once it has passed.
-                            if hold_until and not hold_active:
-                                await member_config.caution_hold_until.set(None)
-                            
-                            # Recalculate total points
-                            total_points = sum(w.get("points", 1) for w in updated_warnings)
-                            await member_config.total_points.set(total_points)
-                            
-                            # Only log when one or more warnings were actually removed.
-                            if removed_warnings_count > 0:
-                                log_channel_id = guild_data.get("log_channel")
-                                if log_channel_id:
-                                    log_channel = guild.get_channel(log_channel_id)
-                                    if log_channel:
-                                        member = guild.get_member(int(member_id))
-                                        if member:
-                                            embed = discord.Embed(
-                                                title="Warnings Expired",
-                                                description=f"{removed_warnings_count} warning(s) for {member.mention} have expired.",
-                                                color=0x00ff00
-                                            )
-                                            embed.add_field(name="Current Points", value=str(total_points))
-                                            embed.set_footer(text=datetime.utcnow().strftime("%m/%d/%Y %I:%M %p"))
-                                            await self.safe_send_message(log_channel, embed=embed)
-            
+                self._expiry_wakeup.clear()
+                entry, next_due = self._pop_due_warning_expiry(datetime.utcnow().timestamp())
+                if entry is None:
+                    # Sleep until the next expiry (or until an earlier one is scheduled).
+                    timeout = 21600 if next_due is None else min(21600, max(0, next_due - datetime.utcnow().timestamp()))
+                    try:
+                        await asyncio.wait_for(self._expiry_wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                guild_id, member_id = entry
+                guild = self.bot.get_guild(guild_id)
+                if not guild:
+                    continue
+                guild_data = await self.config.guild(guild).all()
+                next_due = await self._expire_member_warnings(guild, member_id, guild_data)
+                # Only ever moves the entry earlier, so a warn or hold change filed meanwhile is kept.
+                self._schedule_warning_expiry(guild_id, member_id, next_due)
+
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 log.error(f"Error in warning expiry check: {e}", exc_info=True)
-            
-            # Run every 6 hours
-            await asyncio.sleep(21600)
+                if entry is not None:
+                    # retry this member once the error has had a chance to clear
+                    self._schedule_warning_expiry(entry[0], entry[1], datetime.utcnow().timestamp() + 60)
+                await asyncio.sleep(60)
+
+    async def _set_muted_until(self, member: discord.Member, until: Optional[float]) -> None:
+        """Store when a member's mute ends and (re)schedule or cancel their auto-unmute."""
+        await self.config.member(member).muted_until.set(until)
+        self._unmute_retries.pop((member.guild.id, member.id), None)
+        self._schedule_unmute(member.guild.id, member.id, until)
+
+    def _schedule_unmute(self, guild_id: int, member_id: int, until: Optional[float]) -> None:
+        """(Re)file a mute expiry in the unmute heap; None cancels it. Old entries are skipped lazily."""
+        key = (int(guild_id), int(member_id))
+        if not until:
+            self._unmute_due.pop(key, None)
+            return
+        if self._unmute_due.get(key) == until:
+            return
+        self._unmute_due[key] = until
+        heapq.heappush(self._unmute_heap, (until, key[0], key[1]))
+        if self._unmute_heap[0] == (until, key[0], key[1]):
+            self._unmute_wakeup.set()
+
+    def _retry_unmute(self, guild_id: int, member_id: int) -> None:
+        """Re-file a failed auto-unmute, backing off from 1 minute up to 1 hour."""
+        key = (int(guild_id), int(member_id))
+        attempts = self._unmute_retries.get(key, 0)
+        self._unmute_retries[key] = attempts + 1
+        delay = min(3600, 60 * 2 ** min(attempts, 6))
+        self._schedule_unmute(key[0], key[1], datetime.utcnow().timestamp() + delay)
+
+    def _pop_due_unmute(self, current_time: float):
+        """Pop the next live mute expiry due by current_time as (guild_id, member_id); otherwise return (None, next_due)."""
+        heap = self._unmute_heap
+        while heap and self._unmute_due.get((heap[0][1], heap[0][2])) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            return None, None
+        if heap[0][0] > current_time:
+            return None, heap[0][0]
+        _, guild_id, member_id = heapq.heappop(heap)
+        del self._unmute_due[(guild_id, member_id)]
+        return (guild_id, member_id), None
+
+    async def _auto_unmute(self, guild: discord.Guild, member_id: int) -> None:
+        """Lift an expired mute; retried with backoff if the mute role is missing or could not be removed."""
+        mute_role_id = await self.config.guild(guild).mute_role()
+        mute_role = guild.get_role(mute_role_id) if mute_role_id else None
+        if not mute_role:
+            self._retry_unmute(guild.id, member_id)
+            return
 
+        member = guild.get_member(int(member_id))
+        if not member:
+            # on_member_join re-files the mute from muted_until if they come back
+            return
+
+        # Check if they still have the mute role
+        if mute_role in member.roles:
+            # Restore original roles
+            await self.restore_member_roles(guild, member)
+
+            # Log unmute
+            await self.log_action(
+                guild,
+                "Auto-Unmute",
+                member,
+                self.bot.user,
+                "Temporary mute duration expired"
+            )
+
+            if mute_role in member.roles:
+                self._retry_unmute(guild.id, member.id)
 
     async def mute_check_loop(self):
-        """Background task to check and remove expired mutes."""
+        """Background task that lifts mutes as they expire, sleeping until the next one is due."""
         await self.bot.wait_until_ready()
-        
+
+        # Load pending mutes once; mute/unmute paths keep the heap current afterwards.
+        try:
+            for guild in self.bot.guilds:
+                all_members = await self.config.all_members(guild)
+                for member_id, member_data in all_members.items():
+                    muted_until = member_data.get("muted_until")
+                    if muted_until:
+                        self._schedule_unmute(guild.id, member_id, muted_until)
+                await asyncio.sleep(0)
+            log.info(f"Tracking {len(self._unmute_due)} pending mute expiry(s)")
+        except Exception as e:
+            log.error(f"Error loading pending mutes: {e}", exc_info=True)
+
         while True:
             try:
-                guild_count = 0
-                for guild in self.bot.guilds:
-                    # Yield control between guilds
-                    guild_count += 1
-                    if guild_count % 5 == 0:
-                        await asyncio.sleep(0)
-                    
-                    # Get the mute role
-                    guild_data = await self.config.guild(guild).all()
-                    mute_role_id = guild_data.get("mute_role")
-                    if not mute_role_id:
-                        continue
-                        
-                    mute_role = guild.get_role(mute_role_id)
-                    if not mute_role:
-                        continue
-                    
-                    # Get all members and check their mute status
-                    all_members = await self.config.all_members(guild)
-                    current_time = datetime.utcnow().timestamp()
-                    
-                    member_count = 0
-                    for member_id, member_data in all_members.items():
-                        # Yield control every 10 members
-                        member_count += 1
-                        if member_count % 10 == 0:
-                            await asyncio.sleep(0)
-                        
-                        # Skip if no mute end time
-                        muted_until = member_data.get("muted_until")
-                        if not muted_until:
-                            continue
-                            
-                        # Check if mute has expired
-                        if current_time > muted_until:
-                            try:
-                                # Get member
-                                member = guild.get_member(int(member_id))
-                                if not member:
-                                    continue
-                                
-                                # Check if they still have the mute role
-                                if mute_role in member.roles:
-                                    # Restore original roles
-                                    await self.restore_member_roles(guild, member)
-                                    
-                                    # Log unmute
-                                    await self.log_action(
-                                        guild, 
-                                        "Auto-Unmute", 
-                                        member, 
-                                        self.bot.user, 
-                                        "Temporary mute duration expired"
-                                    )
-                            except Exception as e:
-                                log.error(f"Error during automatic unmute check: {e}", exc_info=True)
-                
+                self._unmute_wakeup.clear()
+                entry, next_due = self._pop_due_unmute(datetime.utcnow().timestamp())
+                if entry is None:
+                    # Sleep until the next mute ends (or until an earlier one is scheduled).
+                    timeout = 21600 if next_due is None else min(21600, max(0, next_due - datetime.utcnow().timestamp()))
+                    try:
+                        await asyncio.wait_for(self._unmute_wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                guild_id, member_id = entry
+                guild = self.bot.get_guild(guild_id)
+                if not guild:
+                    continue
+                try:
+                    await self._auto_unmute(guild, member_id)
+                except Exception as e:
+                    log.error(f"Error during automatic unmute check: {e}", exc_info=True)
+                    self._retry_unmute(guild_id, member_id)
+
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 log.error(f"Error in mute check task: {e}", exc_info=True)
-            
-            # Check every minute
-            await asyncio.sleep(60)
+                await asyncio.sleep(60)
 
     async def safe_send_message(self, channel, content=None, *, embed=None, file=None):
         """Rate-limited message sending to avoid hitting Discord's API limits."""
@@ -739,6 +865,7 @@ class BeriCautions(commands.Cog):
             return await ctx.send(embed=self._quick_embed("Expiry time must be at least 1 day.", discord.Color.red()))
         
         await self.config.guild(ctx.guild).warning_expiry_days.set(days)
+        await self._build_guild_expiry_heap(ctx.guild, days)
         await ctx.send(embed=self._quick_embed(f"Warnings will now expire after {days} days.", discord.Color.green()))
 
     @caution_settings.command(name="setthreshold")
@@ -920,6 +1047,9 @@ class BeriCautions(commands.Cog):
             member_data["total_points"] = sum(w.get("points", 1) for w in member_data["warnings"])
             member_data["warning_count"] = member_data.get("warning_count", 0) + 1
             total_points = member_data["total_points"]
+        self._schedule_warning_expiry(
+            ctx.guild.id, member.id, self._next_warning_expiry(member_data, expiry_days, current_time)
+        )
         
         # Create warning embed
         embed = discord.Embed(title=f"Warning Issued", color=0xff9900)
@@ -1057,7 +1187,7 @@ class BeriCautions(commands.Cog):
                 # Set muted_until time if duration provided
                 if duration:
                     muted_until = datetime.utcnow() + timedelta(minutes=duration)
-                    await self.config.member(member).muted_until.set(muted_until.timestamp())
+                    await self._set_muted_until(member, muted_until.timestamp())
                     await self._activate_caution_hold(member, muted_until.timestamp())
                 
                 # Apply mute by adding the mute role
@@ -1177,7 +1307,7 @@ class BeriCautions(commands.Cog):
             if mute_role in member.roles:
                 # Update duration if already muted
                 muted_until = datetime.utcnow() + timedelta(minutes=duration)
-                await self.config.member(member).muted_until.set(muted_until.timestamp())
+                await self._set_muted_until(member, muted_until.timestamp())
                 await self._activate_caution_hold(member, muted_until.timestamp())
                 desc = f"{member.mention} was already muted. Updated mute duration to end {duration} minutes from now."
                 embed = discord.Embed(description=desc, color=discord.Color.orange())
@@ -1199,7 +1329,7 @@ class BeriCautions(commands.Cog):
                     
                 # Set muted_until time
                 muted_until = datetime.utcnow() + timedelta(minutes=duration)
-                await self.config.member(member).muted_until.set(muted_until.timestamp())
+                await self._set_muted_until(member, muted_until.timestamp())
                 await self._activate_caution_hold(member, muted_until.timestamp())
                 
                 # Confirm the mute
@@ -1438,7 +1568,7 @@ class BeriCautions(commands.Cog):
             # Clear stored mute data only if role was successfully removed
             if not (mute_role and mute_role in member.roles):
                 # Successfully removed
-                await self.config.member(member).muted_until.set(None)
+                await self._set_muted_until(member, None)
                 await self._release_caution_hold(member)
                 
                 # Log the unmute action
@@ -1457,7 +1587,7 @@ class BeriCautions(commands.Cog):
                     # Check again
                     if not (mute_role and mute_role in member.roles):
                         # Now successfully removed
-                        await self.config.member(member).muted_until.set(None)
+                        await self._set_muted_until(member, None)
                         await self._release_caution_hold(member)
                         
                         # Log the unmute action
@@ -1482,6 +1612,15 @@ class BeriCautions(commands.Cog):
         finally:
             self._suppress_enforcement.discard(member.id)
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        """Put a returning member's unfinished mute back on the unmute schedule."""
+        if member.bot:
+            return
+        muted_until = await self.config.member(member).muted_until()
+        if muted_until:
+            self._schedule_unmute(member.guild.id, member.id, muted_until)
+
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         """Handle mute role removal to release caution hold."""
@@ -1499,7 +1638,7 @@ class BeriCautions(commands.Cog):
         mute_role_id = await self.config.guild(after.guild).mute_role()
         mute_role = after.guild.get_role(mute_role_id) if mute_role_id else None
         if mute_role and mute_role not in after.roles:
-            await self.config.member(after).muted_until.set(None)
+            await self._set_muted_until(after, None)
             await self._release_caution_hold(after)
 
 @commands.command(name="unquiet")
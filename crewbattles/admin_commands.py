@@ -1,15 +1,19 @@
 import io
 import json
 import copy
+import asyncio
 import discord
 import hashlib
 from datetime import datetime, timezone
 from pathlib import Path
 
-from redbot.core import commands
+from redbot.core import commands, Config
 from redbot.core.data_manager import cog_data_path
 
+from . import backups
+from .batch_sim import numpy_available, simulate_batch
 from .constants import DEFAULT_PRICE_RULES, DEFAULT_USER, MAX_LEVEL
+from .replay import DEFAULT_MAX_FRAMES
 from .utils import exp_to_next
 
 
@@ -141,71 +145,50 @@ class AdminCommandsMixin:
             return rp
         return None
 
-    async def _write_backup(self, *, note: str = "", guild: discord.Guild = None) -> Path:
-        """Write a backup of member-scoped data for this guild."""
+    async def _write_backup(self, *, note: str = "", guild: discord.Guild = None, incremental: bool = False) -> Path:
+        """Stream member-scoped data for this guild to a gzip'd JSONL backup (see backups.py)."""
         if guild is None:
             raise ValueError("Guild required for backup")
 
         ts = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
         note = " ".join((note or "").strip().split())
 
+        await self.players.flush(guild)
         members = await self.config.all_members(guild)
-        payload = {
-            "meta": {
-                "cog": "crewbattles",
-                "ts": datetime.now(timezone.utc).isoformat(),
-                "note": note,
-                "scope": "guild",
-                "guild_id": int(guild.id),
-                "guild_name": str(getattr(guild, "name", "")),
-                "count": len(members or {}),
-            },
-            "members": members or {},
+        meta = {
+            "cog": "crewbattles",
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "note": note,
+            "scope": "guild",
+            "guild_id": int(guild.id),
+            "guild_name": str(getattr(guild, "name", "")),
         }
-        fname = f"users_{ts}.json"
-        path = self._guild_backup_dir(guild) / fname
+        path = self._guild_backup_dir(guild) / f"users_{ts}{backups.BACKUP_SUFFIX}"
 
-        def _sync_write():
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(payload, f, indent=2, ensure_ascii=False)
-
-        await self.bot.loop.run_in_executor(None, _sync_write)
+        await asyncio.to_thread(
+            backups.write_snapshot, path, meta, {int(guild.id): members or {}}, incremental=incremental
+        )
         return path
 
     async def _restore_backup(self, backup_path: Path, guild: discord.Guild = None) -> int:
         if guild is None:
             raise ValueError("Guild required for restore")
 
-        def _sync_read():
-            with open(backup_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-
-        data = await self.bot.loop.run_in_executor(None, _sync_read)
-        members = (data or {}).get("members")
-        guilds_map = (data or {}).get("guilds")
-        legacy_users = (data or {}).get("users") or (data or {}).get("users_legacy")
-
-        if isinstance(members, dict):
-            bucket = members
-        elif isinstance(guilds_map, dict):
-            bucket = guilds_map.get(str(int(guild.id)), {})
-        elif isinstance(legacy_users, dict):
-            # legacy backups (global) restored into THIS guild
-            bucket = legacy_users
-        else:
-            raise ValueError("Backup file format invalid")
-
-        restored = 0
-        for uid, pdata in bucket.items():
+        bucket = await asyncio.to_thread(backups.load_members, backup_path, guild.id)
+        records = {}
+        for uid, pdata in (bucket or {}).items():
             try:
                 uid_int = int(uid)
             except Exception:
                 continue
-            if not isinstance(pdata, dict):
-                continue
-            await self.config.member_from_ids(guild.id, uid_int).set(pdata)
-            restored += 1
-        return restored
+            if isinstance(pdata, dict):
+                records[str(uid_int)] = pdata
+
+        if records:
+            async with self.config._get_base_group(Config.MEMBER, str(int(guild.id)))() as members:
+                members.update(records)
+        self.players.invalidate(guild)
+        return len(records)
 
     # -----------------------------
     # Helpers
@@ -436,7 +419,7 @@ class AdminCommandsMixin:
         if not filename:
             root = self._backup_dir()
             gdir = self._guild_backup_dir(ctx.guild)
-            paths = [p for p in (list(root.glob("*.json")) + list(gdir.glob("*.json"))) if p.exists() and p.is_file()]
+            paths = backups.list_backups(root, gdir)
             if not paths:
                 return await ctx.reply("No backup files found.")
 
@@ -458,16 +441,7 @@ class AdminCommandsMixin:
                     return tail or note
                 return note
 
-            def read_meta(p: Path) -> dict:
-                try:
-                    with open(p, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    meta = (data or {}).get("meta")
-                    return meta if isinstance(meta, dict) else {}
-                except Exception:
-                    return {}
-
-            metas = await self.bot.loop.run_in_executor(None, lambda: [read_meta(p) for p in paths])
+            metas = await self.bot.loop.run_in_executor(None, lambda: [backups.read_meta(p) for p in paths])
 
             e = discord.Embed(
                 title="CrewBattles Backups (latest 10)",
@@ -489,6 +463,7 @@ class AdminCommandsMixin:
                     [
                         f"**File:** `{rel}`",
                         f"**Time (UTC):** `{ts or '—'}`",
+                        f"**Type:** {(meta or {}).get('kind') or 'full'}",
                         f"**Description:** {note}",
                     ]
                 )
@@ -575,7 +550,7 @@ class AdminCommandsMixin:
 
     @cbadmin.command(name="storedcounts")
     async def cbadmin_storedcounts(self, ctx: commands.Context):
-        all_users = await self.config.all_members(ctx.guild)
+        all_users = await self.players.all(ctx.guild)
         total = len(all_users or {})
         started = sum(1 for _, v in (all_users or {}).items() if isinstance(v, dict) and v.get("started"))
         await ctx.reply(f"Stored member records (this server): {total} | started=True: {started}")
@@ -585,7 +560,7 @@ class AdminCommandsMixin:
         if confirm != "confirm":
             return await ctx.reply("Run: `.cbadmin resetall confirm`")
 
-        all_users = await self.config.all_members(ctx.guild)
+        all_users = await self.players.all(ctx.guild)
         reset = 0
         async with ctx.typing():
             for uid, pdata in (all_users or {}).items():
@@ -597,6 +572,7 @@ class AdminCommandsMixin:
                     continue
                 await self.config.member_from_ids(ctx.guild.id, uid_int).set(copy.deepcopy(DEFAULT_USER))
                 reset += 1
+            self.players.invalidate(ctx.guild)
 
         await ctx.reply(f"Reset data for {reset} started player(s).")
 
@@ -616,6 +592,7 @@ class AdminCommandsMixin:
                         await self.config.member_from_ids(ctx.guild.id, int(uid)).set(copy.deepcopy(DEFAULT_USER))
                     except Exception:
                         pass
+            self.players.invalidate(ctx.guild)
 
         await ctx.reply("HARD WIPE complete.")
 
@@ -623,15 +600,17 @@ class AdminCommandsMixin:
     async def cbadmin_prunebackups(self, ctx: commands.Context, confirm: str = None):
         """Delete all backups for this server except the most recent one."""
         gdir = self._guild_backup_dir(ctx.guild)
-        all_backups = sorted(
-            [p for p in gdir.glob("*.json") if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-        )
+        all_backups = sorted(backups.list_backups(gdir), key=lambda p: p.stat().st_mtime)
 
         if not all_backups:
             return await ctx.reply("No backups found for this server.")
 
-        to_delete = all_backups[:-1]  # all except last (newest)
+        # keep the newest and, if it is incremental, the backups it builds on
+        try:
+            keep = set(await asyncio.to_thread(backups.chain, all_backups[-1]))
+        except Exception:
+            keep = {all_backups[-1]}
+        to_delete = [p for p in all_backups if p not in keep]
 
         if not to_delete:
             return await ctx.reply("Only one backup exists — nothing to prune.")
@@ -673,6 +652,31 @@ class AdminCommandsMixin:
         await self.config.guild(ctx.guild).turn_delay.set(float(delay))
         await ctx.reply(f"Turn delay set to {float(delay)}s")
 
+    @cbadmin.command(name="setbattleframes")
+    async def cbadmin_setbattleframes(self, ctx: commands.Context, frames: int = DEFAULT_MAX_FRAMES):
+        """Max embed edits per battle animation (0 = show the result straight away)."""
+        frames = max(0, min(20, int(frames)))
+        await self.config.guild(ctx.guild).battle_frames.set(frames)
+        await ctx.reply(f"Battle animation frames set to {frames}" + (" (animation off)" if not frames else ""))
+
+    @cbadmin.command(name="replaystats")
+    async def cbadmin_replaystats(self, ctx: commands.Context):
+        """Edit counts and durations of the most recent battle animations."""
+        recent = list(self.replays.recent)[-10:]
+        headroom = self.replays.budget.headroom()
+        if not recent:
+            return await ctx.reply(f"No battles replayed since load. Edit budget headroom: `{headroom:.0%}`")
+        lines = [
+            f"`{r['turns']:>2}` turns • `{r['edits']}/{r['frames']}` edits"
+            + (f" ({r['failed_edits']} failed)" if r["failed_edits"] else "")
+            + f" • `{r['duration']:.1f}s`"
+            + (" • skipped" if r["skipped"] else "")
+            for r in reversed(recent)
+        ]
+        e = discord.Embed(title="🎞️ Battle Replays", description="\n".join(lines), color=discord.Color.blurple())
+        e.set_footer(text=f"Edit budget headroom: {headroom:.0%}")
+        await ctx.reply(embed=e)
+
     @cbadmin.command(name="setbattlecooldown", aliases=["setbattlecd", "setbattlecooldownseconds"])
     async def cbadmin_setbattlecooldown(self, ctx: commands.Context, seconds: int):
         seconds = int(seconds)
@@ -763,7 +767,7 @@ class AdminCommandsMixin:
 
     @cbadmin.command(name="fixlevels", aliases=["recalclevels", "recalcexp"])
     async def cbadmin_fixlevels(self, ctx: commands.Context):
-        all_users = await self.config.all_members(ctx.guild)
+        all_users = await self.players.all(ctx.guild)
         total = 0
         changed = 0
 
@@ -805,6 +809,7 @@ class AdminCommandsMixin:
                     pdata["exp"] = new_xp
                     await self.config.member_from_ids(ctx.guild.id, uid_int).set(pdata)
                     changed += 1
+            self.players.invalidate(ctx.guild)
 
         await ctx.reply(f"Recalculated levels. Updated {changed} / {total} records.")
 
@@ -822,6 +827,7 @@ class AdminCommandsMixin:
             return await ctx.reply("Run: `.cbadmin resetuser @member confirm`")
         async with ctx.typing():
             await self.config.member(member).set(copy.deepcopy(DEFAULT_USER))
+            self.players.invalidate(ctx.guild, member)
         await ctx.reply(f"✅ Reset Crew Battles data for **{member.display_name}**.")
 
     @cbadmin.command(name="sethaki")
@@ -865,6 +871,33 @@ class AdminCommandsMixin:
             extra = " (unlock enabled)"
         await ctx.reply(f"✅ Set **{member.display_name}** {haki_type} to `{level}`{extra}.")
 
+    @cbadmin.command(name="simulate", aliases=["sim"])
+    async def cbadmin_simulate(self, ctx: commands.Context, member1: discord.Member, member2: discord.Member, battles: int = 5000):
+        """
+        Run many simulated fights between two players' current builds.
+        Usage: .cbadmin simulate @user1 @user2 [battles]
+        """
+        if not numpy_available():
+            return await ctx.reply("Batch simulation needs NumPy installed in the bot's environment (`pip install numpy`).")
+        battles = max(100, min(200_000, int(battles)))
+
+        p1 = await self.players.get(member1)
+        p2 = await self.players.get(member2)
+        async with ctx.typing():
+            # NumPy releases the GIL for most of the work; keep it off the event loop anyway
+            result = await asyncio.to_thread(simulate_batch, p1, p2, self.fruits, battles)
+
+        turns = result["turns"]
+        dmg1, dmg2 = result["damage"]["p1"], result["damage"]["p2"]
+        await ctx.reply(
+            f"**{battles:,} simulated fights**\n"
+            f"**{member1.display_name}** wins `{result['p1_win_rate']:.1%}` · "
+            f"**{member2.display_name}** wins `{result['p2_win_rate']:.1%}` (timeouts: {result['timeouts']})\n"
+            f"Turns: mean `{turns['mean']:.1f}` · p10/p50/p90 `{turns['p10']:.0f}/{turns['p50']:.0f}/{turns['p90']:.0f}`\n"
+            f"Damage dealt (mean / p90): {member1.display_name} `{dmg1['mean']:.0f} / {dmg1['p90']:.0f}` · "
+            f"{member2.display_name} `{dmg2['mean']:.0f} / {dmg2['p90']:.0f}`"
+        )
+
     # =========================================================
     # Admin: Fruits (pool + shop)
     # =========================================================
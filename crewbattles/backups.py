@@ -0,0 +1,187 @@
+"""
+Streaming gzip'd JSONL backups for CrewBattles member data.
+
+File layout (``*.jsonl.gz``), one JSON object per line:
+  {"meta": {...}}                                   always first
+  {"guild": gid, "uid": uid, "data": {...}}         one per member record
+  {"legacy": uid, "data": {...}}                    legacy user-scope records (full backups only, for rollback)
+  {"removed": [[gid, uid], ...]}                    incremental only: members gone since the parent
+
+Incremental snapshots only hold members whose record changed since the previous
+backup in the same folder (tracked by digest in BACKUP_STATE_FILE) and name that
+backup as ``meta.parent``; restoring one replays the chain from the last full.
+Old pretty-printed ``*.json`` backups are still readable.
+
+Everything here is blocking file IO; call it through asyncio.to_thread.
+"""
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+BACKUP_SUFFIX = ".jsonl.gz"
+BACKUP_GLOBS = ("*.json", "*" + BACKUP_SUFFIX)
+BACKUP_STATE_FILE = ".backup_state.json"
+# Periodic incrementals between full snapshots (keeps restore chains short).
+FULL_EVERY = 4
+
+
+def _digest(data) -> str:
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def list_backups(*dirs: Path) -> list[Path]:
+    out = []
+    for d in dirs:
+        for pattern in BACKUP_GLOBS:
+            out.extend(p for p in Path(d).glob(pattern) if p.is_file() and p.name != BACKUP_STATE_FILE)
+    return out
+
+
+def _load_state(state_path: Path) -> dict:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except Exception:
+        return {}
+
+
+def write_snapshot(path: Path, meta: dict, guilds: dict, legacy: dict | None = None, *, incremental: bool = False) -> dict:
+    """
+    Stream ``guilds`` ({gid: {uid: record}}) to ``path``.
+    With incremental=True, only changed records are written when a usable parent
+    exists in the same folder and fewer than FULL_EVERY incrementals follow the
+    last full; otherwise a full snapshot is written. Returns the final meta.
+    """
+    path = Path(path)
+    state_path = path.parent / BACKUP_STATE_FILE
+    state = _load_state(state_path)
+    previous = state.get("digests") if isinstance(state.get("digests"), dict) else {}
+    parent = state.get("last")
+    since_full = int(state.get("since_full", 0) or 0)
+
+    if not (incremental and parent and (path.parent / parent).exists() and since_full < FULL_EVERY):
+        incremental = False
+        previous = {}
+
+    digests = {}
+    written = 0
+    total = 0
+    tmp = path.with_name(path.name + ".tmp")
+    meta = dict(meta)
+    meta["kind"] = "incremental" if incremental else "full"
+    if incremental:
+        meta["parent"] = parent
+
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        f.write(_dumps({"meta": meta}))
+        for gid, members in (guilds or {}).items():
+            for uid, data in (members or {}).items():
+                key = f"{int(gid)}:{int(uid)}"
+                digest = _digest(data)
+                digests[key] = digest
+                total += 1
+                if previous.get(key) == digest:
+                    continue
+                f.write(_dumps({"guild": int(gid), "uid": int(uid), "data": data}))
+                written += 1
+        if incremental:
+            removed = [[int(x) for x in key.split(":")] for key in previous if key not in digests]
+            if removed:
+                f.write(_dumps({"removed": removed}))
+        else:
+            for uid, data in (legacy or {}).items():
+                f.write(_dumps({"legacy": int(uid), "data": data}))
+    os.replace(tmp, path)
+
+    new_state = {"last": path.name, "since_full": since_full + 1 if incremental else 0, "digests": digests}
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(new_state, f)
+
+    meta.update(count=written, members=total)
+    return meta
+
+
+def read_meta(path: Path) -> dict:
+    """Meta block of a backup (either format); {} if unreadable."""
+    path = Path(path)
+    try:
+        if path.name.endswith(BACKUP_SUFFIX):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                meta = json.loads(f.readline()).get("meta")
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                meta = (json.load(f) or {}).get("meta")
+        return meta if isinstance(meta, dict) else {}
+    except Exception:
+        return {}
+
+
+def chain(path: Path) -> list[Path]:
+    """Backups needed to restore ``path``, oldest (the full) first."""
+    path = Path(path)
+    out = [path]
+    seen = {path.name}
+    while True:
+        parent = read_meta(out[-1]).get("parent")
+        if not parent:
+            break
+        if parent in seen:
+            raise ValueError(f"Backup chain loops at {parent}")
+        p = path.parent / parent
+        if not p.exists():
+            raise ValueError(f"Backup {out[-1].name} needs missing parent {parent}")
+        seen.add(parent)
+        out.append(p)
+    return out[::-1]
+
+
+def _iter_lines(path: Path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _legacy_json_bucket(path: Path, guild_id: int) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    members = (data or {}).get("members")
+    guilds_map = (data or {}).get("guilds")
+    legacy_users = (data or {}).get("users") or (data or {}).get("users_legacy")
+    if isinstance(members, dict):
+        return members
+    if isinstance(guilds_map, dict):
+        return guilds_map.get(str(int(guild_id))) or {}
+    if isinstance(legacy_users, dict):
+        # legacy backups (global) restored into THIS guild
+        return legacy_users
+    raise ValueError("Backup file format invalid")
+
+
+def load_members(path: Path, guild_id: int) -> dict:
+    """{uid_str: record} to restore into ``guild_id``, replaying an incremental chain if needed."""
+    path = Path(path)
+    if not path.name.endswith(BACKUP_SUFFIX):
+        return _legacy_json_bucket(path, guild_id)
+
+    gid = int(guild_id)
+    members: dict[str, dict] = {}
+    for part in chain(path):
+        for row in _iter_lines(part):
+            if "guild" in row:
+                if int(row["guild"]) == gid and isinstance(row.get("data"), dict):
+                    members[str(int(row["uid"]))] = row["data"]
+            elif "removed" in row:
+                for g, uid in row["removed"]:
+                    if int(g) == gid:
+                        members.pop(str(int(uid)), None)
+    return members
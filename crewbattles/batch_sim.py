@@ -0,0 +1,218 @@
+"""
+Vectorized Monte Carlo version of battle_engine.simulate.
+
+Runs N independent battles between the same two profiles at once, keeping HP,
+shields and status timers in NumPy arrays. The combat rules and tuning are the
+same as simulate(); move names and the turn log are skipped because only the
+outcome distributions matter here.
+
+NumPy is optional for the cog: this module imports without it, and
+simulate_batch raises RuntimeError if it is missing.
+"""
+from .battle_engine import MAX_TURNS, TUNING, _fruit_stats, _haki
+from .constants import BASE_HP
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _side_table(p: dict, fruits_mgr, t: dict) -> dict:
+    """Precompute every per-turn probability and constant for one fighter."""
+    stats = _fruit_stats(fruits_mgr, (p or {}).get("fruit"))
+    bonus, prof = stats.bonus, stats.profile
+    arm, obs, conq, conq_lvl = _haki(p)
+
+    soak = prof.get("soak") or (0.0, 0.0)
+    ohb = prof.get("on_hit_bonus") or (0.0, 0)
+    ohw = prof.get("on_hit_weaken") or (0.0, 1.0)
+    ohd = prof.get("on_hit_dodge_down") or (0.0, 0.0, 1)
+    ac = prof.get("anti_counter") or (0.0, 1)
+    ds = prof.get("double_strike") or (0.0, 0.0)
+
+    return {
+        "bonus": int(bonus),
+        "arm_flat": max(0, min(10, arm // 10)),
+        # dodge before any dodge-down penalty; clamped after the penalty is applied
+        "dodge": float(t["base_dodge"]) + obs * float(t["dodge_per_obs"]) + float(prof.get("dodge_bonus", 0.0) or 0.0),
+        "crit": min(float(t["max_crit"]), max(0.0, float(t["base_crit"]) + arm * float(t["crit_per_arm"]) + float(prof.get("crit_bonus", 0.0) or 0.0))),
+        "tech": stats.tech_chance,
+        "counter": min(float(t["max_counter"]), float(t["counter_base"]) + conq_lvl * float(t["counter_per_lvl"])) if conq else 0.0,
+        "arm_reduction": min(0.20, max(0.0, arm * 0.002)),
+        "soak_chance": float(soak[0]),
+        "soak_keep": 1.0 - max(0.0, min(0.9, float(soak[1]))),
+        "shield": int(prof.get("shield_start", 0) or 0),
+        "room": float(prof.get("room_cancel_dodge", 0.0) or 0.0),
+        "bonus_chance": float(ohb[0]),
+        "bonus_extra": int(ohb[1]),
+        "weaken_chance": float(ohw[0]),
+        "weaken_mult": max(0.3, min(1.0, float(ohw[1]))),
+        "dodge_down_chance": float(ohd[0]),
+        "dodge_down": max(0.0, min(0.2, float(ohd[1]))),
+        "dodge_down_turns": max(1, min(5, int(ohd[2]))),
+        "anti_counter_chance": float(ac[0]),
+        "anti_counter_turns": max(1, min(5, int(ac[1]))),
+        "double_chance": float(ds[0]),
+        "double_mult": float(ds[1]),
+    }
+
+
+def _distribution(values) -> dict:
+    if not len(values):
+        return {"mean": 0.0, "p10": 0.0, "p50": 0.0, "p90": 0.0, "max": 0.0}
+    p10, p50, p90 = np.percentile(values, (10, 50, 90))
+    return {
+        "mean": float(values.mean()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+        "max": float(values.max()),
+    }
+
+
+def simulate_batch(p1: dict, p2: dict, fruits_mgr, battles: int = 1000, *, tuning: dict = None, seed=None) -> dict:
+    """
+    Run `battles` independent fights between p1 and p2 with the simulate() rules.
+    Returns:
+      battles, p1_win_rate, p2_win_rate, timeouts
+      turns: distribution of battle-log entries per fight (same count as len(turns) from simulate)
+      turn_histogram: list where index i is how many fights lasted i entries
+      damage: {"p1": distribution, "p2": distribution} of total damage dealt per fight
+    """
+    if np is None:
+        raise RuntimeError("simulate_batch needs NumPy. Install it with `pip install numpy`.")
+
+    n = max(1, int(battles))
+    t = {**TUNING, **(tuning or {})}
+    rng = np.random.default_rng(seed)
+    crit_mult = float(t["crit_mult"])
+    max_dodge = float(t["max_dodge"])
+
+    sides = (_side_table(p1, fruits_mgr, t), _side_table(p2, fruits_mgr, t))
+    # per-side lookup arrays, indexed by a (N,) array of side numbers
+    tbl = {key: np.array([sides[0][key], sides[1][key]]) for key in sides[0]}
+
+    hp = np.full((2, n), int(BASE_HP), dtype=np.int64)
+    shield = np.repeat(tbl["shield"][:, None], n, axis=1).astype(np.int64)
+    weaken = np.ones((2, n))
+    dodge_pen = np.zeros((2, n))
+    dodge_pen_turns = np.zeros((2, n), dtype=np.int64)
+    anti_counter_turns = np.zeros((2, n), dtype=np.int64)
+    dealt = np.zeros((2, n), dtype=np.int64)
+    entries = np.zeros(n, dtype=np.int64)
+    attacker = rng.integers(0, 2, size=n)
+
+    def base_damage(side, idx):
+        roll = rng.integers(12, 21, size=len(idx))
+        return np.maximum(1, roll + tbl["bonus"][side] + tbl["arm_flat"][side])
+
+    def defend(side, idx, dmg):
+        """Armament reduction, soak roll and shield for the defending side."""
+        dmg = (dmg * (1.0 - tbl["arm_reduction"][side])).astype(np.int64)
+        soaked = rng.random(len(idx)) < tbl["soak_chance"][side]
+        dmg = np.where(soaked, (dmg * tbl["soak_keep"][side]).astype(np.int64), dmg)
+        dmg = np.maximum(0, dmg)
+        absorbed = np.minimum(shield[side, idx], dmg)
+        shield[side, idx] -= absorbed
+        return dmg - absorbed
+
+    for _ in range(MAX_TURNS):
+        idx = np.flatnonzero((hp[0] > 0) & (hp[1] > 0))
+        if not len(idx):
+            break
+
+        # decay timers
+        dodge_pen_turns[:, idx] = np.maximum(0, dodge_pen_turns[:, idx] - 1)
+        anti_counter_turns[:, idx] = np.maximum(0, anti_counter_turns[:, idx] - 1)
+
+        att = attacker[idx]
+        dfn = 1 - att
+
+        # dodge check (with Room cancel-dodge); a dodge or a hit is one log entry either way
+        pen = np.where(dodge_pen_turns[dfn, idx] > 0, dodge_pen[dfn, idx], 0.0)
+        dodge_p = np.minimum(max_dodge, np.maximum(0.0, tbl["dodge"][dfn] - pen))
+        dodged = rng.random(len(idx)) < dodge_p
+        dodged &= ~(rng.random(len(idx)) < tbl["room"][att])
+        entries[idx] += 1
+        attacker[idx] = dfn
+
+        hit = ~dodged
+        idx, att, dfn = idx[hit], att[hit], dfn[hit]
+        if not len(idx):
+            continue
+
+        dmg = (base_damage(att, idx) * weaken[att, idx]).astype(np.int64)
+        weaken[att, idx] = 1.0
+
+        # Devil Fruit technique does not stack with crit
+        tech = rng.random(len(idx)) < tbl["tech"][att]
+        crit = ~tech & (rng.random(len(idx)) < tbl["crit"][att])
+        dmg = np.where(tech | crit, (dmg * crit_mult).astype(np.int64), dmg)
+
+        dmg = defend(dfn, idx, dmg)
+
+        # attacker on-hit effects: only the first one that procs applies
+        pending = np.ones(len(idx), dtype=bool)
+        proc = pending & (rng.random(len(idx)) < tbl["bonus_chance"][att])
+        dmg = dmg + np.where(proc, tbl["bonus_extra"][att], 0)
+        pending &= ~proc
+
+        proc = pending & (rng.random(len(idx)) < tbl["weaken_chance"][att])
+        weaken[dfn[proc], idx[proc]] = tbl["weaken_mult"][att[proc]]
+        pending &= ~proc
+
+        proc = pending & (rng.random(len(idx)) < tbl["dodge_down_chance"][att])
+        dodge_pen[dfn[proc], idx[proc]] = tbl["dodge_down"][att[proc]]
+        dodge_pen_turns[dfn[proc], idx[proc]] = tbl["dodge_down_turns"][att[proc]]
+        pending &= ~proc
+
+        proc = pending & (rng.random(len(idx)) < tbl["anti_counter_chance"][att])
+        anti_counter_turns[dfn[proc], idx[proc]] = np.maximum(
+            anti_counter_turns[dfn[proc], idx[proc]], tbl["anti_counter_turns"][att[proc]]
+        )
+
+        dmg = np.maximum(0, dmg)
+        hp[dfn, idx] = np.maximum(0, hp[dfn, idx] - dmg)
+        dealt[att, idx] += dmg
+
+        # optional double strike
+        alive = hp[dfn, idx] > 0
+        double = alive & (rng.random(len(idx)) < tbl["double_chance"][att])
+        if double.any():
+            d_idx, d_att, d_dfn = idx[double], att[double], dfn[double]
+            extra = (np.maximum(1, dmg[double]) * tbl["double_mult"][d_att]).astype(np.int64)
+            extra = defend(d_dfn, d_idx, extra)
+            hp[d_dfn, d_idx] = np.maximum(0, hp[d_dfn, d_idx] - extra)
+            dealt[d_att, d_idx] += extra
+            entries[d_idx] += 1
+
+        # conqueror counter from the defender
+        alive = hp[dfn, idx] > 0
+        counter_p = np.where(anti_counter_turns[dfn, idx] > 0, 0.0, tbl["counter"][dfn])
+        counter = alive & (rng.random(len(idx)) < counter_p)
+        if counter.any():
+            c_idx, c_att, c_dfn = idx[counter], att[counter], dfn[counter]
+            cdmg = (base_damage(c_dfn, c_idx) * crit_mult).astype(np.int64)
+            cdmg = defend(c_att, c_idx, cdmg)
+            hp[c_att, c_idx] = np.maximum(0, hp[c_att, c_idx] - cdmg)
+            dealt[c_dfn, c_idx] += cdmg
+            entries[c_idx] += 1
+
+    # same rule as simulate(): p1 only wins by knocking p2 out
+    p1_wins = (hp[1] <= 0) & (hp[0] > 0)
+    timeouts = (hp[0] > 0) & (hp[1] > 0)
+
+    return {
+        "battles": n,
+        "p1_win_rate": float(p1_wins.mean()),
+        "p2_win_rate": float(1.0 - p1_wins.mean()),
+        "timeouts": int(timeouts.sum()),
+        "turns": _distribution(entries),
+        "turn_histogram": np.bincount(entries).tolist(),
+        "damage": {"p1": _distribution(dealt[0]), "p2": _distribution(dealt[1])},
+    }
@@ -1,4 +1,6 @@
 import random
+from dataclasses import dataclass
+
 from .constants import BASE_HP
 
 ATTACKS = [
@@ -9,6 +11,23 @@ ATTACKS = [
 ARMAMENT_ATTACKS = ["Armament Punch", "Armament Kick", "Armament Strike"]
 CONQUEROR_COUNTER = "Conqueror Counter"
 
+# Combat tuning shared by simulate() and the batch simulator in batch_sim.py.
+# Pass a dict of overrides as ``tuning`` to either engine to try new values.
+TUNING = {
+    "base_dodge": 0.06,
+    "dodge_per_obs": 0.003,  # was 0.002
+    "max_dodge": 0.45,  # was 0.35
+    "base_crit": 0.08,
+    "crit_per_arm": 0.003,  # was 0.002
+    "max_crit": 0.50,  # was 0.40
+    "crit_mult": 1.5,
+    "counter_base": 0.05,
+    "counter_per_lvl": 0.002,
+    "max_counter": 0.30,
+}
+
+MAX_TURNS = 250
+
 
 def _haki(p: dict):
     h = (p or {}).get("haki", {}) or {}
@@ -36,79 +55,61 @@ def _fruit_data(fruits_mgr, fruit_name: str):
     return f if isinstance(f, dict) else None
 
 
-def _fruit_bonus(fruits_mgr, fruit_name):
-    f = _fruit_data(fruits_mgr, fruit_name)
-    if not f:
-        return 0
-    try:
-        return int(f.get("bonus", 0) or 0)
-    except Exception:
-        return 0
-
-
-def _fruit_ability(fruits_mgr, fruit_name: str) -> str:
-    f = _fruit_data(fruits_mgr, fruit_name)
-    if not f:
-        return ""
-    return str(f.get("ability", "") or "").strip()
+# Ability effects are intentionally small and readable.
+# All of these ONLY apply if the player owns the fruit (equipped fruit provides the ability string).
+#
+# Common knobs:
+# - dodge_bonus: adds directly to dodge chance
+# - crit_bonus: adds directly to crit chance
+# - shield_start: absorb damage before HP
+# - on_hit_bonus: (chance, extra_damage)
+# - on_hit_weaken: (chance, weaken_mult_for_target_next_attack)  e.g. 0.75 means target's next dmg * 0.75
+# - on_hit_dodge_down: (chance, dodge_penalty, turns)
+# - room_cancel_dodge: chance to cancel a successful dodge
+# - anti_counter: (chance, turns) disables conqueror counter while active
+# - double_strike: (chance, extra_hit_mult) extra hit damage multiplier of base hit
+ABILITY_PROFILES = {
+    "rubber resilience": {"soak": (0.15, 0.40)},  # 15% reduce incoming dmg by 40%
+    "flame burst": {"on_hit_bonus": (0.20, 6)},
+    "ice prison": {"on_hit_weaken": (0.15, 0.75)},
+    "thunderclap": {"on_hit_bonus": (0.12, 8)},
+    "smoke screen": {"dodge_bonus": 0.04},
+    "sand coffin": {"on_hit_dodge_down": (0.15, 0.05, 2)},
+    "magma fist": {"on_hit_bonus": (0.15, 10)},
+    "dragon's breath": {"double_strike": (0.10, 0.50)},
+    "phoenix flames": {"shield_start": 10},
+    "kitsune mirage": {"dodge_bonus": 0.05},
+    "jurassic rampage": {"crit_bonus": 0.05},
+    "mammoth guard": {"soak": (0.10, 0.50)},
+    "venom coating": {"on_hit_bonus": (0.15, 5)},
+    "gravity well": {"on_hit_dodge_down": (0.12, 0.06, 1), "on_hit_bonus": (0.10, 4)},
+    "room": {"room_cancel_dodge": 0.20},
+    "split body": {"dodge_bonus": 0.03},
+    "slipstream": {"dodge_bonus": 0.03},
+    "dark vortex": {"anti_counter": (0.15, 2)},
+    "light speed": {"crit_bonus": 0.04},
+    "gas chamber": {"on_hit_bonus": (0.10, 6)},
+    "forest bind": {"on_hit_weaken": (0.10, 0.80)},
+    "quake shockwave": {"on_hit_bonus": (0.08, 12)},
+    "string snare": {"on_hit_weaken": (0.10, 0.80)},
+    "soul pledge": {"on_hit_bonus": (0.10, 7)},
+    "barrier wall": {"shield_start": 15},
+    "mochi trap": {"on_hit_weaken": (0.12, 0.70)},
+    "dice blade": {"on_hit_bonus": (0.12, 6)},
+    "mythic howl": {"crit_bonus": 0.06},
+    "golden impact": {"shield_start": 12},
+    "griffin talon": {"double_strike": (0.10, 0.40)},
+    "saber pounce": {"on_hit_bonus": (0.12, 7)},
+    "trike gore": {"on_hit_bonus": (0.12, 7)},
+    "giraffe whip": {"on_hit_bonus": (0.10, 5)},
+    "bubble prison": {"on_hit_weaken": (0.12, 0.75)},
+    "weight smash": {"on_hit_bonus": (0.10, 9)},
+}
 
 
 def _ability_profile(ability: str) -> dict:
-    """
-    Ability effects are intentionally small and readable.
-    All of these ONLY apply if the player owns the fruit (equipped fruit provides the ability string).
-    """
-    a = (ability or "").strip().lower()
-
-    # Common knobs:
-    # - dodge_bonus: adds directly to dodge chance
-    # - crit_bonus: adds directly to crit chance
-    # - shield_start: absorb damage before HP
-    # - on_hit_bonus: (chance, extra_damage)
-    # - on_hit_weaken: (chance, weaken_mult_for_target_next_attack)  e.g. 0.75 means target's next dmg * 0.75
-    # - on_hit_dodge_down: (chance, dodge_penalty, turns)
-    # - room_cancel_dodge: chance to cancel a successful dodge
-    # - anti_counter: (chance, turns) disables conqueror counter while active
-    # - double_strike: (chance, extra_hit_mult) extra hit damage multiplier of base hit
-
-    profiles = {
-        "rubber resilience": {"soak": (0.15, 0.40)},  # 15% reduce incoming dmg by 40%
-        "flame burst": {"on_hit_bonus": (0.20, 6)},
-        "ice prison": {"on_hit_weaken": (0.15, 0.75)},
-        "thunderclap": {"on_hit_bonus": (0.12, 8)},
-        "smoke screen": {"dodge_bonus": 0.04},
-        "sand coffin": {"on_hit_dodge_down": (0.15, 0.05, 2)},
-        "magma fist": {"on_hit_bonus": (0.15, 10)},
-        "dragon's breath": {"double_strike": (0.10, 0.50)},
-        "phoenix flames": {"shield_start": 10},
-        "kitsune mirage": {"dodge_bonus": 0.05},
-        "jurassic rampage": {"crit_bonus": 0.05},
-        "mammoth guard": {"soak": (0.10, 0.50)},
-        "venom coating": {"on_hit_bonus": (0.15, 5)},
-        "gravity well": {"on_hit_dodge_down": (0.12, 0.06, 1), "on_hit_bonus": (0.10, 4)},
-        "room": {"room_cancel_dodge": 0.20},
-        "split body": {"dodge_bonus": 0.03},
-        "slipstream": {"dodge_bonus": 0.03},
-        "dark vortex": {"anti_counter": (0.15, 2)},
-        "light speed": {"crit_bonus": 0.04},
-        "gas chamber": {"on_hit_bonus": (0.10, 6)},
-        "forest bind": {"on_hit_weaken": (0.10, 0.80)},
-        "quake shockwave": {"on_hit_bonus": (0.08, 12)},
-        "string snare": {"on_hit_weaken": (0.10, 0.80)},
-        "soul pledge": {"on_hit_bonus": (0.10, 7)},
-        "barrier wall": {"shield_start": 15},
-        "mochi trap": {"on_hit_weaken": (0.12, 0.70)},
-        "dice blade": {"on_hit_bonus": (0.12, 6)},
-        "mythic howl": {"crit_bonus": 0.06},
-        "golden impact": {"shield_start": 12},
-        "griffin talon": {"double_strike": (0.10, 0.40)},
-        "saber pounce": {"on_hit_bonus": (0.12, 7)},
-        "trike gore": {"on_hit_bonus": (0.12, 7)},
-        "giraffe whip": {"on_hit_bonus": (0.10, 5)},
-        "bubble prison": {"on_hit_weaken": (0.12, 0.75)},
-        "weight smash": {"on_hit_bonus": (0.10, 9)},
-    }
-    return profiles.get(a, {})
+    """Look up the effect knobs for an ability name (shared dict: read only)."""
+    return ABILITY_PROFILES.get((ability or "").strip().lower(), {})
 
 
 def _fruit_tech_chance(ability: str, fruit_bonus: int) -> float:
@@ -124,7 +125,43 @@ def _fruit_tech_chance(ability: str, fruit_bonus: int) -> float:
     return min(0.08, 0.06 + (max(0, min(10, b)) * 0.002))
 
 
-def simulate(p1: dict, p2: dict, fruits_mgr):
+@dataclass(frozen=True)
+class FruitStats:
+    """
+    Battle-ready stats for one fruit, compiled once when FruitManager loads or
+    changes its pool so simulate() doesn't re-resolve and re-parse per battle.
+    """
+    __slots__ = ("bonus", "ability", "profile", "tech_chance")
+    bonus: int
+    ability: str
+    profile: dict
+    tech_chance: float
+
+
+NO_FRUIT = FruitStats(0, "", {}, 0.0)
+
+
+def compile_fruit_stats(fruit: dict) -> FruitStats:
+    try:
+        bonus = int(fruit.get("bonus", 0) or 0)
+    except Exception:
+        bonus = 0
+    ability = str(fruit.get("ability", "") or "").strip()
+    return FruitStats(bonus, ability, _ability_profile(ability), _fruit_tech_chance(ability, bonus))
+
+
+def _fruit_stats(fruits_mgr, fruit_name: str) -> FruitStats:
+    """Compiled stats from FruitManager.stats(); other managers fall back to compiling on the fly."""
+    if not fruit_name:
+        return NO_FRUIT
+    stats = getattr(fruits_mgr, "stats", None)
+    if callable(stats):
+        return stats(fruit_name) or NO_FRUIT
+    f = _fruit_data(fruits_mgr, fruit_name)
+    return compile_fruit_stats(f) if f else NO_FRUIT
+
+
+def simulate(p1: dict, p2: dict, fruits_mgr, tuning: dict = None):
     """
     Flat HP: BASE_HP for both players.
     Haki effects:
@@ -134,6 +171,8 @@ def simulate(p1: dict, p2: dict, fruits_mgr):
     Fruit effects:
       - bonus damage (existing 'bonus')
       - + ability procs/passives (NEW) only if user owns the fruit
+    Tuning:
+      - optional `tuning` dict overrides values in TUNING (used by batch_sim for balance runs)
     Returns:
       winner: "p1" or "p2"
       turns: list[(side, dmg, defender_hp_after, attack_name, crit)]
@@ -145,14 +184,11 @@ def simulate(p1: dict, p2: dict, fruits_mgr):
     fruit1 = (p1 or {}).get("fruit")
     fruit2 = (p2 or {}).get("fruit")
 
-    bonus1 = _fruit_bonus(fruits_mgr, fruit1)
-    bonus2 = _fruit_bonus(fruits_mgr, fruit2)
-
-    ability1 = _fruit_ability(fruits_mgr, fruit1)
-    ability2 = _fruit_ability(fruits_mgr, fruit2)
+    stats1 = _fruit_stats(fruits_mgr, fruit1)
+    stats2 = _fruit_stats(fruits_mgr, fruit2)
 
-    a1 = _ability_profile(ability1)
-    a2 = _ability_profile(ability2)
+    bonus1, ability1, a1 = stats1.bonus, stats1.ability, stats1.profile
+    bonus2, ability2, a2 = stats2.bonus, stats2.ability, stats2.profile
 
     state = {
         "p1": {
@@ -174,19 +210,20 @@ def simulate(p1: dict, p2: dict, fruits_mgr):
     arm1, obs1, conq1, conq_lvl1 = _haki(p1)
     arm2, obs2, conq2, conq_lvl2 = _haki(p2)
 
-    # tuning (UPDATED)
-    base_dodge = 0.06
-    dodge_per_obs = 0.003   # was 0.002
-    max_dodge = 0.45        # was 0.35
+    # tuning (UPDATED; defaults live in TUNING)
+    t = {**TUNING, **(tuning or {})}
+    base_dodge = float(t["base_dodge"])
+    dodge_per_obs = float(t["dodge_per_obs"])
+    max_dodge = float(t["max_dodge"])
 
-    base_crit = 0.08
-    crit_per_arm = 0.003    # was 0.002
-    max_crit = 0.50         # was 0.40
-    crit_mult = 1.5
+    base_crit = float(t["base_crit"])
+    crit_per_arm = float(t["crit_per_arm"])
+    max_crit = float(t["max_crit"])
+    crit_mult = float(t["crit_mult"])
 
-    counter_base = 0.05
-    counter_per_lvl = 0.002
-    max_counter = 0.30
+    counter_base = float(t["counter_base"])
+    counter_per_lvl = float(t["counter_per_lvl"])
+    max_counter = float(t["max_counter"])
 
     def roll(p: float) -> bool:
         return random.random() < max(0.0, min(1.0, p))
@@ -296,7 +333,7 @@ def simulate(p1: dict, p2: dict, fruits_mgr):
     turns = []
     attacker = random.choice(("p1", "p2"))  # was: attacker = "p1"
 
-    for _ in range(250):
+    for _ in range(MAX_TURNS):
         if hp1 <= 0 or hp2 <= 0:
             break
 
@@ -325,7 +362,7 @@ def simulate(p1: dict, p2: dict, fruits_mgr):
             state["p1"]["weaken_mult"] = 1.0
 
             # NEW: Devil Fruit Technique (does NOT stack with crit)
-            fruit_tech = roll(_fruit_tech_chance(ability1, bonus1))
+            fruit_tech = roll(stats1.tech_chance)
             if fruit_tech:
                 crit = False
                 atk_name = f"🍈 {ability1}"
@@ -390,7 +427,7 @@ def simulate(p1: dict, p2: dict, fruits_mgr):
         state["p2"]["weaken_mult"] = 1.0
 
         # NEW: Devil Fruit Technique (does NOT stack with crit)
-        fruit_tech = roll(_fruit_tech_chance(ability2, bonus2))
+        fruit_tech = roll(stats2.tech_chance)
         if fruit_tech:
             crit = False
             atk_name = f"🍈 {ability2}"
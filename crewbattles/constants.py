@@ -17,6 +17,7 @@ DEFAULT_USER = {
 
 DEFAULT_GUILD = {
     "turn_delay": 1.0,
+    "battle_frames": 8,  # max embed edits per battle animation (0 = result only)
     "beri_win": 0,
     "beri_loss": 0,
     "crew_points_win": 1,
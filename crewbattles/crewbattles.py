@@ -15,11 +15,12 @@ from redbot.core import commands, Config, bank
 from redbot.core.data_manager import cog_data_path
 
 from .constants import BASE_HP, DEFAULT_USER, DEFAULT_PRICE_RULES, MAX_LEVEL
+from . import backups
 from .player_manager import PlayerManager
 from .fruits import FruitManager
 from .battle_engine import simulate
 from .teams_bridge import TeamsBridge
-from .embeds import battle_embed
+from .replay import DEFAULT_MAX_FRAMES, ReplayTracker
 from .utils import exp_to_next, format_duration
 from .admin_commands import AdminCommandsMixin
 from .player_commands import PlayerCommandsMixin  # already present in your file
@@ -45,6 +46,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
             beri_win=0,
             beri_loss=0,
             turn_delay=1.0,
+            battle_frames=DEFAULT_MAX_FRAMES,
             battle_cooldown=DEFAULT_BATTLE_COOLDOWN,
             haki_cost=HAKI_TRAIN_COST,
             haki_cost_armament=HAKI_TRAIN_COST,
@@ -67,17 +69,20 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
         self.players = PlayerManager(self)
         data_dir = cog_data_path(self) / "data"
         data_dir.mkdir(parents=True, exist_ok=True)
-        self.fruits = FruitManager(data_dir)
+        self.fruits = FruitManager(data_dir, journal=True)
         self.teams = TeamsBridge(bot)
 
         self._active_battles = set()
+        self.replays = ReplayTracker()
         self._backup_task = self.bot.loop.create_task(self._periodic_backup())
 
-    def cog_unload(self):
+    async def cog_unload(self):
         try:
             self._backup_task.cancel()
         except Exception:
             pass
+        await self.players.close()
+        await self.fruits.close()
 
     # -----------------------------
     # Backups
@@ -213,54 +218,47 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
             return rp
         return None
 
-    async def _write_backup(self, *, note: str = "", guild: discord.Guild = None) -> Path:
-        """Write a backup of member-scoped data (per guild). If no guild provided, backs up all guilds."""
+    async def _write_backup(self, *, note: str = "", guild: discord.Guild = None, incremental: bool = False) -> Path:
+        """
+        Stream member-scoped data (per guild) to a gzip'd JSONL backup. If no guild provided, backs up all guilds.
+        incremental=True stores only members changed since the previous backup in the same folder (see backups.py).
+        """
         ts = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
         note = " ".join((note or "").strip().split())
 
-        payload = {
-            "meta": {
-                "cog": "crewbattles",
-                "ts": datetime.now(timezone.utc).isoformat(),
-                "note": note,
-                "scope": "guild" if guild else "all_guilds",
-                "guild_id": int(getattr(guild, "id", 0) or 0) if guild else None,
-                "guild_name": str(getattr(guild, "name", "")) if guild else None,
-            }
+        meta = {
+            "cog": "crewbattles",
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "note": note,
+            "scope": "guild" if guild else "all_guilds",
+            "guild_id": int(getattr(guild, "id", 0) or 0) if guild else None,
+            "guild_name": str(getattr(guild, "name", "")) if guild else None,
         }
 
-        if guild:
-            members = await self.config.all_members(guild)
-            payload["meta"]["count"] = len(members or {})
-            payload["members"] = members or {}
-        else:
-            guilds_payload = {}
-            for g in list(getattr(self.bot, "guilds", []) or []):
-                try:
-                    guilds_payload[str(int(g.id))] = await self.config.all_members(g)
-                except Exception:
-                    guilds_payload[str(int(getattr(g, "id", 0) or 0))] = {}
-            payload["meta"]["count"] = sum(len(v or {}) for v in guilds_payload.values())
-            payload["guilds"] = guilds_payload
+        await self.players.flush(guild)
+        guilds_payload = {}
+        for g in ([guild] if guild else list(getattr(self.bot, "guilds", []) or [])):
+            try:
+                guilds_payload[int(g.id)] = await self.config.all_members(g)
+            except Exception:
+                if guild:
+                    raise
+                guilds_payload[int(getattr(g, "id", 0) or 0)] = {}
 
-        # Include legacy user-scope data for safety/rollback.
-        try:
-            payload["users_legacy"] = await self.config.all_users()
-        except Exception:
-            payload["users_legacy"] = {}
+        # Include legacy user-scope data for safety/rollback (full snapshots only).
+        legacy = {}
+        if not incremental:
+            try:
+                legacy = await self.config.all_users()
+            except Exception:
+                legacy = {}
 
         if guild:
-            fname = f"users_{ts}.json"
-            path = self._guild_backup_dir(guild) / fname
+            path = self._guild_backup_dir(guild) / f"users_{ts}{backups.BACKUP_SUFFIX}"
         else:
-            fname = f"users_allguilds_{ts}.json"
-            path = self._backup_dir() / fname
-
-        def _sync_write():
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(payload, f, indent=2, ensure_ascii=False)
+            path = self._backup_dir() / f"users_allguilds_{ts}{backups.BACKUP_SUFFIX}"
 
-        await asyncio.to_thread(_sync_write)
+        await asyncio.to_thread(backups.write_snapshot, path, meta, guilds_payload, legacy, incremental=incremental)
         return path
 
     async def _periodic_backup(self):
@@ -270,7 +268,9 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
                 # Prefer per-guild periodic backups for clarity and safety.
                 for g in list(getattr(self.bot, "guilds", []) or []):
                     try:
-                        await self._write_backup(note=f"periodic guild={int(getattr(g, 'id', 0) or 0)}", guild=g)
+                        await self._write_backup(
+                            note=f"periodic guild={int(getattr(g, 'id', 0) or 0)}", guild=g, incremental=True
+                        )
                     except Exception:
                         pass
             except Exception as e:
@@ -278,67 +278,28 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
             await asyncio.sleep(6 * 60 * 60)
 
     async def _restore_backup(self, backup_path: Path, guild: discord.Guild = None) -> int:
-        def _sync_read():
-            with open(backup_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-
-        data = await asyncio.to_thread(_sync_read)
-        restored = 0
-
-        # Preferred: member-scoped restore
-        members = (data or {}).get("members")
-        guilds_map = (data or {}).get("guilds")
+        """Restore a backup (any format, incremental chains included) into this guild with one bulk write."""
+        if guild is None:
+            raise ValueError("Backup file format invalid or no guild provided for restore")
 
-        if guild and isinstance(members, dict):
-            for uid, pdata in members.items():
-                try:
-                    uid_int = int(uid)
-                except Exception:
-                    continue
-                if not isinstance(pdata, dict):
-                    continue
-                try:
-                    await self.config.member_from_ids(guild.id, uid_int).set(pdata)
-                    restored += 1
-                except Exception:
-                    pass
-            return restored
-
-        if guild and isinstance(guilds_map, dict):
-            bucket = guilds_map.get(str(int(guild.id)))
-            if isinstance(bucket, dict):
-                for uid, pdata in bucket.items():
-                    try:
-                        uid_int = int(uid)
-                    except Exception:
-                        continue
-                    if not isinstance(pdata, dict):
-                        continue
-                    try:
-                        await self.config.member_from_ids(guild.id, uid_int).set(pdata)
-                        restored += 1
-                    except Exception:
-                        pass
-                return restored
-
-        # Legacy: restore user-scope backups into THIS guild's member scope
-        legacy_users = (data or {}).get("users") or (data or {}).get("users_legacy") or {}
-        if guild and isinstance(legacy_users, dict):
-            for uid, pdata in legacy_users.items():
-                try:
-                    uid_int = int(uid)
-                except Exception:
-                    continue
-                if not isinstance(pdata, dict):
-                    continue
-                try:
-                    await self.config.member_from_ids(guild.id, uid_int).set(pdata)
-                    restored += 1
-                except Exception:
-                    pass
-            return restored
+        bucket = await asyncio.to_thread(backups.load_members, backup_path, guild.id)
+        records = {}
+        for uid, pdata in (bucket or {}).items():
+            try:
+                uid_int = int(uid)
+            except Exception:
+                continue
+            if isinstance(pdata, dict):
+                records[str(uid_int)] = pdata
 
-        raise ValueError("Backup file format invalid or no guild provided for restore")
+        try:
+            if records:
+                async with self.config._get_base_group(Config.MEMBER, str(int(guild.id)))() as members:
+                    members.update(records)
+        finally:
+            # restored records replace anything cached (including unsaved changes)
+            self.players.invalidate(guild)
+        return len(records)
 
     # -----------------------------
     # Economy helpers (BeriCore or bank)
@@ -637,7 +598,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
         if not filename:
             root = self._backup_dir()
             gdir = self._guild_backup_dir(ctx.guild)
-            paths = [p for p in (list(root.glob("*.json")) + list(gdir.glob("*.json"))) if p.exists() and p.is_file()]
+            paths = backups.list_backups(root, gdir)
             if not paths:
                 return await ctx.reply("No backup files found.")
 
@@ -659,16 +620,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
                     return tail or note
                 return note
 
-            def read_meta(p: Path) -> dict:
-                try:
-                    with open(p, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    meta = (data or {}).get("meta")
-                    return meta if isinstance(meta, dict) else {}
-                except Exception:
-                    return {}
-
-            metas = await asyncio.to_thread(lambda: [read_meta(p) for p in paths])
+            metas = await asyncio.to_thread(lambda: [backups.read_meta(p) for p in paths])
 
             e = discord.Embed(
                 title="CrewBattles Backups (latest 10)",
@@ -690,6 +642,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
                     [
                         f"**File:** `{rel}`",
                         f"**Time (UTC):** `{ts or '—'}`",
+                        f"**Type:** {(meta or {}).get('kind') or 'full'}",
                         f"**Description:** {note}",
                     ]
                 )
@@ -779,7 +732,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
     @cbadmin.command(name="storedcounts")
     async def cbadmin_storedcounts(self, ctx: commands.Context):
         try:
-            all_users = await self.config.all_members(ctx.guild)
+            all_users = await self.players.all(ctx.guild)
         except Exception as e:
             return await ctx.reply(f"Could not read storage: {e}")
         total = len(all_users or {})
@@ -813,6 +766,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
                     reset += 1
                 except Exception:
                     pass
+            self.players.invalidate(ctx.guild)
 
         await ctx.reply(f"Reset data for {reset} started player(s).")
 
@@ -842,6 +796,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
                     wiped += 1
                 except Exception:
                     pass
+            self.players.invalidate(ctx.guild)
 
         await ctx.reply(f"HARD WIPE complete. Cleared {wiped} stored user record(s).")
 
@@ -856,6 +811,31 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
         await self.config.guild(ctx.guild).turn_delay.set(float(delay))
         await ctx.reply(f"Turn delay set to {delay}s")
 
+    @cbadmin.command()
+    async def setbattleframes(self, ctx, frames: int):
+        """Max embed edits per battle animation (0 = show the result straight away)."""
+        frames = max(0, min(20, int(frames)))
+        await self.config.guild(ctx.guild).battle_frames.set(frames)
+        await ctx.reply(f"Battle animation frames set to {frames}" + (" (animation off)" if not frames else ""))
+
+    @cbadmin.command()
+    async def replaystats(self, ctx):
+        """Edit counts and durations of the most recent battle animations."""
+        recent = list(self.replays.recent)[-10:]
+        headroom = self.replays.budget.headroom()
+        if not recent:
+            return await ctx.reply(f"No battles replayed since load. Edit budget headroom: `{headroom:.0%}`")
+        lines = [
+            f"`{r['turns']:>2}` turns • `{r['edits']}/{r['frames']}` edits"
+            + (f" ({r['failed_edits']} failed)" if r["failed_edits"] else "")
+            + f" • `{r['duration']:.1f}s`"
+            + (" • skipped" if r["skipped"] else "")
+            for r in reversed(recent)
+        ]
+        e = discord.Embed(title="🎞️ Battle Replays", description="\n".join(lines), color=discord.Color.blurple())
+        e.set_footer(text=f"Edit budget headroom: {headroom:.0%}")
+        await ctx.reply(embed=e)
+
     @cbadmin.command()
     async def setbattlecooldown(self, ctx, seconds: int):
         seconds = int(seconds)
@@ -970,6 +950,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
                         changed += 1
                     except Exception:
                         pass
+            self.players.invalidate(ctx.guild)
         await ctx.reply(f"Recalculated levels. Updated {changed} / {total} records.")
 
     @cbadmin.command(name="setconquerorcost", aliases=["setconqcost", "setconquerorscost"])
@@ -992,6 +973,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
                 await self.config.member(member).set(copy.deepcopy(DEFAULT_USER))
             except Exception as e:
                 return await ctx.reply(f"Reset failed: {e}")
+            self.players.invalidate(ctx.guild, member)
 
         await ctx.reply(f"✅ Reset Crew Battles data for **{member.display_name}**.")
 
@@ -1455,86 +1437,13 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
             # simulate battle
             winner_key, turns, final_hp1, final_hp2 = simulate(p1, p2, self.fruits)
 
-            # animated embed
+            # animated embed: turns are batched into a few frames (see replay.py)
             turn_delay = float(g.get("turn_delay", 1.0) or 1.0)
             turn_delay = max(0.0, min(5.0, turn_delay))  # hard clamp so it doesn't freeze channels
+            max_frames = int(g.get("battle_frames", DEFAULT_MAX_FRAMES) or 0)
 
-            hp1 = int(BASE_HP)
-            hp2 = int(BASE_HP)
-
-            log_entries = []
-            turn_no = 0
-            msg = await ctx.send(embed=battle_embed(ctx.author, opponent, hp1, hp2, BASE_HP, BASE_HP, "—"))
-
-            def _yaml_safe(s: str) -> str:
-                s = str(s or "")
-                s = s.replace("\\", "\\\\").replace('"', "\\\"")
-                s = s.replace("\n", " ").replace("\r", " ").strip()
-                return s
-
-            def _yaml_quote(s: str) -> str:
-                return f'"{_yaml_safe(s)}"'
-
-            def _short(s: str, n: int) -> str:
-                s = str(s or "")
-                return (s[: n - 1] + "…") if n >= 2 and len(s) > n else s
-
-            # Play turns (cap log lines so embed stays readable)
-            for side, dmg, defender_hp_after, atk_name, crit in turns:
-                turn_no += 1
-                if side == "p1":
-                    hp2 = int(defender_hp_after)
-                    actor = ctx.author.display_name
-                    defender = opponent.display_name
-                else:
-                    hp1 = int(defender_hp_after)
-                    actor = opponent.display_name
-                    defender = ctx.author.display_name
-
-                actor_s = _short(actor, 18)
-                defender_s = _short(defender, 18)
-
-                is_counter = str(atk_name) == "Conqueror Counter"
-                is_fruit = isinstance(atk_name, str) and atk_name.startswith("🍈 ")
-
-                if int(dmg) <= 0 and str(atk_name).lower() == "dodged":
-                    # NOTE: In the turn tuple, `side` is the attacker. A "Dodged" entry means
-                    # the defender dodged the attacker's move.
-                    line_text = f"💨 {defender_s} dodged {actor_s}"
-                else:
-                    if is_counter:
-                        line_text = f"👑 {actor_s}: Counter - {int(dmg)} (COUNTER-CRIT)"
-                    else:
-                        move_display = str(atk_name)
-                        emoji = "🗡️"
-                        if is_fruit:
-                            emoji = "🍈"
-                            move_display = str(atk_name)[2:].strip() or "Fruit Technique"
-
-                        move_display = _short(move_display, 22)
-
-                        suffix = ""
-                        if crit:
-                            suffix = " (CRIT)"
-                        elif is_fruit:
-                            suffix = " (FRUIT)"
-
-                        line_text = f"{emoji} {actor_s}: {move_display} - {int(dmg)}{suffix}"
-
-                entry = f"- {_yaml_quote(line_text)}"
-
-                log_entries.append(entry)
-                # Keep more history since entries are now one-liners
-                log_entries = log_entries[-10:]
-                log_text = "```yaml\n" + "\n".join(log_entries) + "\n```"
-
-                try:
-                    await msg.edit(embed=battle_embed(ctx.author, opponent, hp1, hp2, BASE_HP, BASE_HP, log_text))
-                except Exception:
-                    pass
-
-                if turn_delay > 0:
-                    await asyncio.sleep(turn_delay)
+            replay = self.replays.replay(ctx.author, opponent, turns, max_frames=max_frames, turn_delay=turn_delay)
+            await replay.play(ctx)
 
             # determine winner/loser
             winner_user = ctx.author if winner_key == "p1" else opponent
@@ -1664,45 +1573,49 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
         return await self._run_battle(ctx, opponent)
 
     @battle.command(name="random")
-    async def battle_random(self, ctx: commands.Context):
-        """Battle a random started player in this server."""
+    async def battle_random(self, ctx: commands.Context, match: str = None):
+        """Battle a random started player in this server. Add `near` to pick someone close to your level."""
         if not ctx.guild:
             return await ctx.reply("This command can only be used in a server.")
 
-        author_team = await self._team_of(ctx.guild, ctx.author)
+        # one member -> team lookup table for the whole candidate pass
+        try:
+            team_index = self.teams.team_index(ctx.guild)
+        except Exception:
+            team_index = {}
+        author_team = team_index.get(ctx.author.id)
 
-        all_users = await self.players.all(ctx.guild)
-        candidates: list[discord.Member] = []
-        for uid, pdata in (all_users or {}).items():
-            if not isinstance(pdata, dict) or not pdata.get("started"):
-                continue
-            try:
-                uid_int = int(uid)
-            except Exception:
-                continue
-            if uid_int == ctx.author.id:
-                continue
+        # started, non-tempbanned players are pre-filtered; only per-caller checks remain
+        pool = await self.players.matchmaking(ctx.guild)
 
-            m = ctx.guild.get_member(uid_int)
+        def eligible(uid: int) -> bool:
+            if uid == ctx.author.id:
+                return False
+            m = ctx.guild.get_member(uid)
             if not m or m.bot:
-                continue
-
+                return False
             # Enforce the existing rule: you cannot battle crewmates/teammates.
-            if author_team is not None:
-                try:
-                    m_team = await self._team_of(ctx.guild, m)
-                except Exception:
-                    m_team = None
-                if m_team is not None and m_team == author_team:
-                    continue
-            candidates.append(m)
+            return author_team is None or team_index.get(uid) != author_team
+
+        level = None
+        if (match or "").strip().lower() in ("near", "level", "matched"):
+            level = pool.level_of(ctx.author.id) or (await self.players.get(ctx.author)).get("level", 1)
 
-        if not candidates:
+        uid = pool.pick(eligible, level=level)
+        if uid is None:
             return await ctx.reply("No eligible players found in the player pool (excluding bots, yourself, and teammates).")
 
-        opponent = random.choice(candidates)
+        opponent = ctx.guild.get_member(uid)
         return await self._run_battle(ctx, opponent)
 
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.players.member_left(member.guild, member)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.players.member_joined(member.guild, member)
+
     # NOTE: Do NOT define a method named `cbleaderboard` on the Cog class unless it is the
     # actual decorated command. A plain method with that name will override the Command
     # object defined in PlayerCommandsMixin and cause the leaderboard command to disappear.
@@ -1824,7 +1737,7 @@ class CrewBattles(AdminCommandsMixin, PlayerCommandsMixin, commands.Cog):
 
     @cbadmin_fruits.command(name="shop")
     async def cbadmin_fruits_shop(self, ctx: commands.Context, page: int = 1):
-        items = self.fruits.shop_list() or []
+        items = self.fruits.shop_view()
         if not items:
             return await ctx.reply("Shop is empty.")
 
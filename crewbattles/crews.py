@@ -10,6 +10,94 @@ import aiohttp
 import json
 import os
 
+# --- Persistence ---
+# Seconds to wait for more edits before writing a guild's file.
+SAVE_DEBOUNCE = 1.0
+
+
+class CrewDataStore:
+    """
+    Debounced, atomic writer for the per-guild Crews/<guild>.json files.
+
+    schedule() only records that a guild is dirty; one task per guild waits
+    SAVE_DEBOUNCE seconds, then serialises and writes the latest data in a
+    worker thread (temp file + fsync + rename), so a burst of crew edits is a
+    single write and a crash never leaves a half-written file.
+    """
+
+    def __init__(self, directory, delay: float = SAVE_DEBOUNCE):
+        self.directory = pathlib.Path(directory)
+        self.delay = delay
+        self._pending = {}  # guild_id -> (label, snapshot callable)
+        self._tasks = {}  # guild_id -> debounce task
+        self._locks = {}  # guild_id -> Lock, so writes for one file never overlap
+        self._writing = set()  # guild_ids whose debounce task is past its sleep
+
+    def path_for(self, guild_id) -> pathlib.Path:
+        return self.directory / f"{guild_id}.json"
+
+    def schedule(self, guild_id, snapshot, label: str = ""):
+        """Mark a guild dirty. snapshot() is called at write time and returns the data to save."""
+        guild_id = str(guild_id)
+        self._pending[guild_id] = (label, snapshot)
+        task = self._tasks.get(guild_id)
+        if task is None or task.done():
+            self._tasks[guild_id] = asyncio.create_task(self._debounced(guild_id))
+
+    async def _debounced(self, guild_id: str):
+        await asyncio.sleep(self.delay)
+        self._writing.add(guild_id)
+        try:
+            await self._write(guild_id)
+        finally:
+            self._writing.discard(guild_id)
+
+    def _write_file(self, path: pathlib.Path, data: dict):
+        # No indent so json uses its C encoder: the whole dump runs without
+        # releasing the GIL, so the event loop can't mutate the dicts mid-dump.
+        raw = json.dumps(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    async def _write(self, guild_id: str):
+        lock = self._locks.setdefault(guild_id, Lock())
+        async with lock:
+            entry = self._pending.pop(guild_id, None)
+            if entry is None:
+                return
+            label, snapshot = entry
+            path = self.path_for(guild_id)
+            try:
+                await asyncio.to_thread(self._write_file, path, snapshot())
+                print(f"Saved crew data for guild {label} ({guild_id}) to {path}")
+            except Exception as e:
+                print(f"Error saving crew data for guild {label}: {e}")
+
+    async def flush(self, guild_id=None):
+        """Write pending data now (one guild or all) instead of waiting out the debounce."""
+        # _tasks too: a task that is mid-write has already popped its _pending entry
+        guild_ids = [str(guild_id)] if guild_id is not None else list(set(self._pending) | set(self._tasks))
+        for gid in guild_ids:
+            task = self._tasks.pop(gid, None)
+            if task is not None and not task.done():
+                if gid in self._writing:
+                    # Cancelling now would free the lock while its worker thread
+                    # is still writing the tmp file; let that write finish.
+                    await task
+                else:
+                    task.cancel()
+            await self._write(gid)
+
+    async def close(self):
+        """Flush everything; used on cog unload."""
+        await self.flush()
+
+
 # --- Helper Classes for UI Elements ---
 # Helper UI element classes (CrewButton, CrewView) removed —
 # original inline examples/commented code caused parsing/indentation issues.
@@ -125,6 +213,11 @@ class CrewTournament(commands.Cog):
         self.tournaments = {}
         self.active_channels = set()
         self.guild_locks = {}  # Add this line: Dict to store locks for each guild
+        self.store = CrewDataStore(cog_data_path(self) / "Crews")
+        # Reverse lookups per guild: member id -> crew name, crew role id -> crew name.
+        # Built from self.crews on demand and kept in step by the crew edit paths.
+        self._member_crews = {}
+        self._role_crews = {}
         
         # Define battle moves
         self.MOVES = [
@@ -141,6 +234,10 @@ class CrewTournament(commands.Cog):
         # Task to load data on bot startup 
         self.bot.loop.create_task(self.initialize())
     
+    async def cog_unload(self):
+        # write any debounced crew/tournament edits before the cog goes away
+        await self.store.close()
+
     # Add a method to get a lock for a specific guild
     def get_guild_lock(self, guild_id):
         """Get a lock for a specific guild, creating it if it doesn't exist."""
@@ -155,33 +252,21 @@ class CrewTournament(commands.Cog):
             await self.load_data(guild)
 
     async def save_data(self, guild):
-        """Save both crew and tournament data for a specific guild."""
+        """Queue a save of both crew and tournament data for a specific guild (see CrewDataStore)."""
         finished_setup = await self.config.guild(guild).finished_setup()
         if not finished_setup:
             return
-    
-        # Use Red-Bot's data path structure
-        data_path = cog_data_path(self)
-        # Create 'Crews' directory if it doesn't exist
-        crews_dir = data_path / "Crews"
-        if not os.path.exists(crews_dir):
-            os.makedirs(crews_dir, exist_ok=True)
-        
-        # Save to Crews.json in the proper directory
-        file_path = crews_dir / f"{guild.id}.json"
-        
-        try:
-            data = {
-                "crews": self.crews.get(str(guild.id), {}),
-                "tournaments": self.tournaments.get(str(guild.id), {})
-            }
-            
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=4)
-            
-            print(f"Saved crew data for guild {guild.name} ({guild.id}) to {file_path}")
-        except Exception as e:
-            print(f"Error saving crew data for guild {guild.name}: {e}")
+
+        guild_id = str(guild.id)
+        # Read at write time so the newest state of the burst is what lands on disk.
+        self.store.schedule(
+            guild_id,
+            lambda: {
+                "crews": self.crews.get(guild_id, {}),
+                "tournaments": self.tournaments.get(guild_id, {}),
+            },
+            label=guild.name,
+        )
     
     async def load_data(self, guild):
         """Load crew and tournament data for a specific guild."""
@@ -211,6 +296,7 @@ class CrewTournament(commands.Cog):
                     # Load the data into memory
                     self.crews[str(guild.id)] = data.get("crews", {})
                     self.tournaments[str(guild.id)] = data.get("tournaments", {})
+                    self._rebuild_crew_index(str(guild.id))
                     
                     print(f"Loaded crew data for guild {guild.name} ({guild.id}) from {file_path}")
             else:
@@ -231,25 +317,90 @@ class CrewTournament(commands.Cog):
         async with lock:
             await self.save_data(guild)
 
-    def _find_crew_name_by_role_id(self, guild_id: str, role_id: int) -> Optional[str]:
-        crews = self.crews.get(guild_id, {})
-        for crew_name, crew in crews.items():
+    def _rebuild_crew_index(self, guild_id: str):
+        """Rebuild the member/role -> crew indexes for one guild from self.crews."""
+        members = {}
+        roles = {}
+        for crew_name, crew in self.crews.get(guild_id, {}).items():
             try:
-                if int(crew.get("crew_role") or 0) == int(role_id):
-                    return crew_name
+                role_id = int(crew.get("crew_role") or 0)
             except Exception:
-                continue
-        return None
+                role_id = 0
+            if role_id:
+                roles.setdefault(role_id, crew_name)
+            for mid in crew.get("members") or []:
+                try:
+                    # first crew wins, same as the old linear scan
+                    members.setdefault(int(mid), crew_name)
+                except Exception:
+                    continue
+        self._member_crews[guild_id] = members
+        self._role_crews[guild_id] = roles
+
+    def _invalidate_crew_index(self, guild_id: str):
+        """Drop a guild's indexes after a bulk edit (rename, clean-up, resync); rebuilt on next lookup."""
+        self._member_crews.pop(guild_id, None)
+        self._role_crews.pop(guild_id, None)
+
+    def _crew_index(self, guild_id: str):
+        if guild_id not in self._member_crews or guild_id not in self._role_crews:
+            self._rebuild_crew_index(guild_id)
+        return self._member_crews[guild_id], self._role_crews[guild_id]
+
+    def _index_member(self, guild_id: str, member_id: int, crew_name: Optional[str]):
+        """Record that a member joined crew_name (or left their crew, with None)."""
+        members, _ = self._crew_index(guild_id)
+        if crew_name is None:
+            members.pop(int(member_id), None)
+        else:
+            members[int(member_id)] = crew_name
 
-    def _find_member_crew(self, guild_id: str, member_id: int) -> Optional[str]:
-        crews = self.crews.get(guild_id, {})
-        for crew_name, crew in crews.items():
+    def _index_crew(self, guild_id: str, crew_name: str):
+        """Add a newly created crew (its role and members) to the indexes."""
+        members, roles = self._crew_index(guild_id)
+        crew = self.crews.get(guild_id, {}).get(crew_name) or {}
+        try:
+            role_id = int(crew.get("crew_role") or 0)
+        except Exception:
+            role_id = 0
+        if role_id:
+            roles.setdefault(role_id, crew_name)
+        for mid in crew.get("members") or []:
             try:
-                if int(member_id) in (crew.get("members") or []):
-                    return crew_name
+                members.setdefault(int(mid), crew_name)
             except Exception:
                 continue
-        return None
+
+    def _unindex_crew(self, guild_id: str, crew_name: str):
+        """Remove a crew that is being deleted from the indexes."""
+        members, roles = self._crew_index(guild_id)
+        for mid in [m for m, name in members.items() if name == crew_name]:
+            del members[mid]
+        for rid in [r for r, name in roles.items() if name == crew_name]:
+            del roles[rid]
+
+    def _find_crew_name_by_role_id(self, guild_id: str, role_id: int) -> Optional[str]:
+        try:
+            role_id = int(role_id)
+        except Exception:
+            return None
+        crew_name = self._crew_index(guild_id)[1].get(role_id)
+        if crew_name is not None and crew_name not in self.crews.get(guild_id, {}):
+            # stale entry from an edit path that didn't update the index
+            self._rebuild_crew_index(guild_id)
+            crew_name = self._role_crews[guild_id].get(role_id)
+        return crew_name
+
+    def _find_member_crew(self, guild_id: str, member_id: int) -> Optional[str]:
+        try:
+            member_id = int(member_id)
+        except Exception:
+            return None
+        crew_name = self._crew_index(guild_id)[0].get(member_id)
+        if crew_name is not None and crew_name not in self.crews.get(guild_id, {}):
+            self._rebuild_crew_index(guild_id)
+            crew_name = self._member_crews[guild_id].get(member_id)
+        return crew_name
 
     async def ensure_member_for_crew_role(
         self,
@@ -297,6 +448,7 @@ class CrewTournament(commands.Cog):
             crew.setdefault("members", []).append(member.id)
         except Exception:
             return True, "not_setup", crew_name
+        self._index_member(guild_id, member.id, crew_name)
 
         crew_role = guild.get_role(int(crew.get("crew_role") or 0))
         if crew_role and crew_role not in member.roles:
@@ -483,6 +635,7 @@ class CrewTournament(commands.Cog):
             self.crews[guild_id] = {}
         if guild_id in self.tournaments:
             self.tournaments[guild_id] = {}
+        self._invalidate_crew_index(guild_id)
         
         await self.save_data(ctx.guild)
         await ctx.send("✅ All crew and tournament data has been reset for this server.")
@@ -644,6 +797,7 @@ class CrewTournament(commands.Cog):
         
         # Save the changes
         if fixed_crews > 0:
+            self._invalidate_crew_index(str(ctx.guild.id))
             await self.save_crews(ctx.guild)
             await ctx.send(f"✅ Fixed {fixed_crews} crew emojis/names.")
         else:
@@ -808,6 +962,7 @@ class CrewTournament(commands.Cog):
             },
             "created_at": ctx.message.created_at.isoformat()
         }
+        self._index_crew(guild_id, crew_name)
         
         # Give only captain role to captain (not member role)
         await captain.add_roles(captain_role)
@@ -851,13 +1006,13 @@ class CrewTournament(commands.Cog):
             return
     
         # Check if already in another crew
-        for other_crew_name, other_crew in crews.items():
-            if member.id in other_crew["members"]:
-                await ctx.send("❌ You cannot switch crews once you join one.")
-                return
+        if self._find_member_crew(guild_id, member.id) is not None:
+            await ctx.send("❌ You cannot switch crews once you join one.")
+            return
     
         # Add to crew
         crew["members"].append(member.id)
+        self._index_member(guild_id, member.id, crew_name)
         
         # Assign crew role
         crew_role = ctx.guild.get_role(crew["crew_role"])
@@ -916,6 +1071,7 @@ class CrewTournament(commands.Cog):
             
         # Remove from crew
         crew["members"].remove(member.id)
+        self._index_member(guild_id, member.id, None)
         
         # Remove crew roles
         for role_key in ["vice_captain_role", "crew_role"]:
@@ -977,6 +1133,7 @@ class CrewTournament(commands.Cog):
                 tournament["crews"].remove(crew_name)
 
         # Delete crew
+        self._unindex_crew(guild_id, crew_name)
         del self.crews[guild_id][crew_name]
         await self.save_data(ctx.guild)
         await ctx.send(f"✅ Crew `{crew_name}` has been deleted.")
@@ -1072,6 +1229,7 @@ class CrewTournament(commands.Cog):
                     
                 # Add to crew
                 crew["members"].append(member.id)
+                self.cog._index_member(guild_id, member.id, self.crew_name)
                 
                 # Assign crew role
                 crew_role = interaction.guild.get_role(crew["crew_role"])
@@ -1183,6 +1341,7 @@ class CrewTournament(commands.Cog):
             # Update the crew name in the crews dictionary
             crews[new_value] = crews.pop(crew_name)
             crews[new_value]["name"] = new_value
+            self._invalidate_crew_index(str(ctx.guild.id))
             
             await self.save_data(ctx.guild)
             await ctx.send(f"✅ Crew `{crew_name}` has been renamed to `{new_value}`.")
@@ -1516,6 +1675,7 @@ class CrewTournament(commands.Cog):
         
         # Replace the crews dictionary with the clean one
         self.crews[guild_id] = clean_crews
+        self._invalidate_crew_index(guild_id)
         
         # Save the changes
         await self.save_data(ctx.guild)
@@ -1756,6 +1916,7 @@ class CrewTournament(commands.Cog):
             
             # Update the crew with clean member IDs
             crew_data["members"] = clean_members
+        self._invalidate_crew_index(str(ctx.guild.id))
         
         # Save the changes
         await self.save_crews(ctx.guild)
@@ -1817,6 +1978,7 @@ class CrewTournament(commands.Cog):
             
         # Remove from crew
         crew["members"].remove(member.id)
+        self._index_member(guild_id, member.id, None)
         
         # Remove crew roles
         for role_key in ["captain_role", "vice_captain_role", "crew_role"]:
@@ -2214,6 +2376,7 @@ class CrewTournament(commands.Cog):
         old_count = len(crew["members"])
         crew["members"] = new_members
         new_count = len(new_members)
+        self._invalidate_crew_index(str(ctx.guild.id))
         
         await self.save_crews(ctx.guild)
         await ctx.send(f"✅ Crew `{crew_name}` members list synced with role members. Updated from {old_count} to {new_count} members.")
@@ -2248,6 +2411,7 @@ class CrewTournament(commands.Cog):
             old_count = len(crew["members"])
             crew["members"] = new_members
             new_count = len(new_members)
+            self._invalidate_crew_index(str(ctx.guild.id))
             
             results.append(f"✅ `{crew_name}`: Updated from {old_count} to {new_count} members")
             
@@ -2764,11 +2928,12 @@ class CrewTournament(commands.Cog):
         if guild_id not in self.crews:
             return
             
-        for crew_name, crew in self.crews[guild_id].items():
-            if member.id in crew["members"]:
-                crew["members"].remove(member.id)
-                await self.save_crews(guild)
-                break
+        crew_name = self._find_member_crew(guild_id, member.id)
+        crew = self.crews[guild_id].get(crew_name) if crew_name else None
+        if crew and member.id in crew["members"]:
+            crew["members"].remove(member.id)
+            self._index_member(guild_id, member.id, None)
+            await self.save_crews(guild)
             
             
             
@@ -2844,12 +3009,12 @@ async def on_raw_reaction_add(self, payload):
         return
 
     # Already in any other crew
-    for other_crew_name, other_crew in guild_crews.items():
-        if member.id in other_crew["members"]:
-            return
+    if self._find_member_crew(str(guild.id), member.id) is not None:
+        return
 
     # Add to crew
     selected_crew["members"].append(member.id)
+    self._index_member(str(guild.id), member.id, selected_crew_name)
 
     # Assign role
     role = guild.get_role(selected_crew["crew_role"])
@@ -1,7 +1,27 @@
 from dataclasses import dataclass
+import asyncio
 import json
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .battle_engine import FruitStats, compile_fruit_stats
+
+# Seconds to wait for more shop/pool changes before writing the files.
+SAVE_DEBOUNCE = 2.0
+
+# Shop type filter aliases (cbshop); fruits of any other type are listed as paramecia.
+SHOP_TYPES = {
+    "paramecia": "paramecia",
+    "zoan": "zoan",
+    "ancient": "ancient zoan",
+    "ancient zoan": "ancient zoan",
+    "logia": "logia",
+    "mythical": "mythical zoan",
+    "mythic zoan": "mythical zoan",
+    "mythical zoan": "mythical zoan",
+}
 
 
 def _norm(name: str) -> str:
@@ -49,6 +69,11 @@ class Fruit:
         return Fruit(name=name, type=ftype, bonus=bonus, price=price, ability=ability, price_locked=price_locked)
 
 
+def shop_type(t) -> str:
+    """cbshop type bucket for a fruit type string."""
+    return SHOP_TYPES.get(_norm(str(t or ""))) or "paramecia"
+
+
 class FruitManager:
     """
     Two stores:
@@ -57,17 +82,46 @@ class FruitManager:
 
     Back-compat:
       - all() / get() / update() operate on SHOP items (so cbshop/cbbuy keep working)
+
+    Memory is authoritative: changes mark a store dirty and one debounced task
+    writes it SAVE_DEBOUNCE seconds later (worker thread, temp file + rename).
+    With journal=True every stock change is also appended to fruits_shop.journal
+    (one short line, no rewrite), so a crash before the next write loses nothing;
+    the journal is replayed on load and dropped once a snapshot covers it.
+    Outside an event loop (scripts), changes are written straight away.
+
+    Reads are served from cached read-only views (view(), shop_view(),
+    shop_by_type()); a shop or pool change only drops the views it affects.
+    get()/shop_get()/shop_list() still hand out plain dicts the caller may edit.
     """
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, *, journal: bool = False, delay: float = SAVE_DEBOUNCE):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         self._pool_path = self.data_dir / "fruits_pool.json"
         self._shop_path = self.data_dir / "fruits_shop.json"
+        self._journal_path = self.data_dir / "fruits_shop.journal"
+        # journal rotated out when a shop snapshot started; deleted once it is written
+        self._journal_old = self.data_dir / "fruits_shop.journal.old"
 
         self._pool: Dict[str, Fruit] = {}
         self._shop: Dict[str, Optional[int]] = {}  # key -> stock (None = unlimited)
+        self._stats: Dict[str, FruitStats] = {}  # key -> compiled battle stats (pool only)
+
+        # read-only views, rebuilt lazily after a change
+        self._pool_views: Dict[str, Mapping] = {}
+        self._shop_views: Dict[str, Mapping] = {}  # pool entry + stock
+        self._shop_sorted: Optional[Tuple[Mapping, ...]] = None  # by name
+        self._shop_types: Optional[Dict[str, Tuple[Mapping, ...]]] = None  # type -> by price, name
+
+        self.journal = bool(journal)
+        self.delay = delay
+        self._journal_file = None
+        self._dirty: set = set()  # "pool" / "shop"
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_writing = False  # the debounce task is past its sleep and inside flush()
+        self._write_lock = asyncio.Lock()
         self._load()
 
     # -------------------------
@@ -76,6 +130,7 @@ class FruitManager:
     def _load(self):
         self._pool = {}
         self._shop = {}
+        self._invalidate()
 
         if self._pool_path.exists():
             data = json.loads(self._pool_path.read_text(encoding="utf-8"))
@@ -90,6 +145,7 @@ class FruitManager:
                         self._pool[_norm(f.name)] = f
                     except Exception:
                         continue
+        self._stats = {key: compile_fruit_stats(f.to_dict()) for key, f in self._pool.items()}
 
         if self._shop_path.exists():
             data = json.loads(self._shop_path.read_text(encoding="utf-8"))
@@ -103,14 +159,163 @@ class FruitManager:
                     else:
                         self._shop[key] = max(0, _as_int(stock, 0))
 
-    def _save_pool(self):
-        payload = {"fruits": [f.to_dict() for f in sorted(self._pool.values(), key=lambda x: _norm(x.name))]}
-        self._pool_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        # stock changes made after the last snapshot (oldest journal first)
+        replayed = 0
+        for path in (self._journal_old, self._journal_path):
+            replayed += self._replay_journal(path)
+        if replayed:
+            self._save_shop()
+
+    def _replay_journal(self, path: Path) -> int:
+        if not path.exists():
+            return 0
+        n = 0
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+                key = _norm(entry["k"])
+            except Exception:
+                continue  # torn last line after a crash
+            if entry.get("rm"):
+                self._shop.pop(key, None)
+            else:
+                stock = entry.get("s")
+                self._shop[key] = None if stock is None else max(0, _as_int(stock, 0))
+            n += 1
+        return n
+
+    def _pool_payload(self) -> dict:
+        return {"fruits": [f.to_dict() for f in sorted(self._pool.values(), key=lambda x: _norm(x.name))]}
 
-    def _save_shop(self):
+    def _shop_payload(self) -> dict:
         # store original names? we only store normalized keys; that’s fine because we join with pool for display
-        payload = {"shop": {k: v for k, v in sorted(self._shop.items(), key=lambda kv: kv[0])}}
-        self._shop_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        return {"shop": {k: v for k, v in sorted(self._shop.items(), key=lambda kv: kv[0])}}
+
+    def _save_pool(self):
+        self._mark_dirty("pool")
+
+    def _invalidate(self, key: Optional[str] = None):
+        """Drop cached views after a change to one fruit (or all of them)."""
+        if key is None:
+            self._pool_views.clear()
+            self._shop_views.clear()
+        else:
+            self._pool_views.pop(key, None)
+            self._shop_views.pop(key, None)
+        self._shop_sorted = None
+        self._shop_types = None
+
+    def _save_shop(self, key: Optional[str] = None):
+        """Mark the shop dirty; with a key, also journal that item's new stock (or its removal)."""
+        self._invalidate(key)
+        if key is not None and self.journal:
+            entry = {"k": key, "s": self._shop[key]} if key in self._shop else {"k": key, "rm": 1}
+            try:
+                if self._journal_file is None:
+                    self._journal_file = open(self._journal_path, "a", encoding="utf-8")
+                self._journal_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._journal_file.flush()
+            except Exception as e:
+                print(f"[CrewBattles] fruit journal write failed: {e}")
+        self._mark_dirty("shop")
+
+    def _mark_dirty(self, store: str):
+        self._dirty.add(store)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # no event loop (scripts): write straight away
+            self._write_files(self._take_snapshot())
+            self._finish_snapshot()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def _take_snapshot(self) -> list:
+        """Copy dirty stores for writing (on the loop, so they can't change mid-dump)."""
+        stores, self._dirty = self._dirty, set()
+        jobs = []
+        if "pool" in stores:
+            jobs.append((self._pool_path, self._pool_payload()))
+        if "shop" in stores:
+            jobs.append((self._shop_path, self._shop_payload()))
+            self._rotate_journal()
+        return jobs
+
+    def _rotate_journal(self):
+        """Start a fresh journal; entries so far are covered by the snapshot being written."""
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        if not self._journal_path.exists():
+            return
+        if self._journal_old.exists():
+            # previous write failed: keep its entries ahead of the newer ones
+            with open(self._journal_old, "a", encoding="utf-8") as f:
+                f.write(self._journal_path.read_text(encoding="utf-8"))
+            self._journal_path.unlink()
+        else:
+            os.replace(self._journal_path, self._journal_old)
+
+    def _finish_snapshot(self):
+        try:
+            self._journal_old.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _write_files(jobs: list):
+        for path, payload in jobs:
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps(payload, indent=2, ensure_ascii=False))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.delay)
+        self._flush_writing = True
+        try:
+            await self.flush()
+        finally:
+            self._flush_writing = False
+        if self._dirty:
+            # changes that arrived mid-write (or a failed write) go in the next batch
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Write dirty stores now."""
+        async with self._write_lock:
+            if not self._dirty:
+                return
+            stores = set(self._dirty)
+            jobs = self._take_snapshot()
+            try:
+                await asyncio.to_thread(self._write_files, jobs)
+            except Exception as e:
+                print(f"[CrewBattles] fruit data save failed: {e}")
+                self._dirty |= stores
+                return
+            if "shop" in stores:
+                self._finish_snapshot()
+
+    async def close(self):
+        """Flush pending changes and close the journal (cog unload)."""
+        task = self._flush_task
+        while task is not None and not task.done():
+            if not self._flush_writing:
+                task.cancel()
+                break
+            # Cancelling now would free the write lock while its worker thread
+            # is still writing; let that write finish (it may queue a follow-up).
+            await task
+            task = self._flush_task
+        self._flush_task = None
+        await self.flush()
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
 
     # -------------------------
     # Pool (catalog)
@@ -118,13 +323,28 @@ class FruitManager:
     def pool_all(self) -> List[dict]:
         return [f.to_dict() for f in sorted(self._pool.values(), key=lambda x: _norm(x.name))]
 
+    def _pool_view(self, key: str) -> Optional[Mapping]:
+        view = self._pool_views.get(key)
+        if view is None:
+            f = self._pool.get(key)
+            if not f:
+                return None
+            view = self._pool_views[key] = MappingProxyType(f.to_dict())
+        return view
+
     def pool_get(self, name: str) -> Optional[dict]:
-        f = self._pool.get(_norm(name))
-        return f.to_dict() if f else None
+        view = self._pool_view(_norm(name))
+        return dict(view) if view is not None else None
+
+    def stats(self, name: str) -> Optional[FruitStats]:
+        """Compiled battle stats for a pool fruit (what simulate() uses per battle)."""
+        return self._stats.get(_norm(name))
 
     def pool_upsert(self, fruit_dict: dict) -> dict:
         f = Fruit.from_any(fruit_dict)
         self._pool[_norm(f.name)] = f
+        self._stats[_norm(f.name)] = compile_fruit_stats(f.to_dict())
+        self._invalidate(_norm(f.name))
         self._save_pool()
         return f.to_dict()
 
@@ -152,34 +372,55 @@ class FruitManager:
     # -------------------------
     # Shop (inventory)
     # -------------------------
-    def shop_list(self) -> List[dict]:
-        """
-        Returns list of fruit dicts (merged from pool) with 'stock' included.
-        Only fruits present in shop are listed.
-        """
-        out = []
-        for key, stock in self._shop.items():
+    def _shop_view(self, key: str) -> Optional[Mapping]:
+        view = self._shop_views.get(key)
+        if view is None:
+            if key not in self._shop:
+                return None
             f = self._pool.get(key)
             if not f:
                 # allow “dangling” shop entries, but show minimal
-                out.append({"name": key, "type": "unknown", "bonus": 0, "price": 0, "ability": "", "stock": stock})
+                d = {"name": key, "type": "unknown", "bonus": 0, "price": 0, "ability": ""}
             else:
                 d = f.to_dict()
-                d["stock"] = stock
-                out.append(d)
-        out.sort(key=lambda x: _norm(x.get("name", "")))
-        return out
+            d["stock"] = self._shop[key]
+            view = self._shop_views[key] = MappingProxyType(d)
+        return view
 
-    def shop_get(self, name: str) -> Optional[dict]:
+    def view(self, name: str) -> Optional[Mapping]:
+        """Read-only shop entry (with stock), else pool entry, else None. No copy is made."""
         key = _norm(name)
-        if key not in self._shop:
-            return None
-        f = self._pool.get(key)
-        if not f:
-            return {"name": name, "type": "unknown", "bonus": 0, "price": 0, "ability": "", "stock": self._shop.get(key)}
-        d = f.to_dict()
-        d["stock"] = self._shop.get(key)
-        return d
+        view = self._shop_view(key)
+        return view if view is not None else self._pool_view(key)
+
+    def shop_view(self) -> Tuple[Mapping, ...]:
+        """Read-only shop entries sorted by name; cached until the shop or pool changes."""
+        if self._shop_sorted is None:
+            self._shop_sorted = tuple(self._shop_view(key) for key in sorted(self._shop))
+        return self._shop_sorted
+
+    def shop_by_type(self, type_key: str = "all") -> Tuple[Mapping, ...]:
+        """Read-only shop entries of one SHOP_TYPES type ("all" for every type), by price then name."""
+        if self._shop_types is None:
+            by_price = tuple(
+                sorted(self.shop_view(), key=lambda f: (int(f.get("price", 0) or 0), (f.get("name") or "").lower()))
+            )
+            types: Dict[str, Tuple[Mapping, ...]] = {"all": by_price}
+            for t in set(SHOP_TYPES.values()):
+                types[t] = tuple(f for f in by_price if shop_type(f.get("type")) == t)
+            self._shop_types = types
+        return self._shop_types.get(type_key or "all", ())
+
+    def shop_list(self) -> List[dict]:
+        """
+        Returns list of fruit dicts (merged from pool) with 'stock' included.
+        Only fruits present in shop are listed.
+        """
+        return [dict(view) for view in self.shop_view()]
+
+    def shop_get(self, name: str) -> Optional[dict]:
+        view = self._shop_view(_norm(name))
+        return dict(view) if view is not None else None
 
     def shop_add(self, name: str, stock: Optional[int] = 1):
         key = _norm(name)
@@ -190,7 +431,7 @@ class FruitManager:
         else:
             stock_i = max(0, _as_int(stock, 0))
             self._shop[key] = stock_i
-        self._save_shop()
+        self._save_shop(key)
 
     def shop_set_stock(self, name: str, stock: Optional[int]):
         key = _norm(name)
@@ -200,13 +441,13 @@ class FruitManager:
             self._shop[key] = None
         else:
             self._shop[key] = max(0, _as_int(stock, 0))
-        self._save_shop()
+        self._save_shop(key)
 
     def shop_remove(self, name: str):
         key = _norm(name)
         if key in self._shop:
             del self._shop[key]
-            self._save_shop()
+            self._save_shop(key)
 
     # -------------------------
     # Back-compat API used by your cog
@@ -237,4 +478,4 @@ class FruitManager:
             self._shop[key] = None
         else:
             self._shop[key] = max(0, _as_int(stock, 0))
-        self._save_shop()
+        self._save_shop(key)
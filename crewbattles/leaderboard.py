@@ -0,0 +1,92 @@
+from bisect import bisect_left, insort
+
+MODES = ("wins", "level", "winrate")
+
+
+def _row(uid: int, pdata: dict) -> dict | None:
+    """Leaderboard row for a started player (None if they haven't started)."""
+    if not isinstance(pdata, dict) or not pdata.get("started"):
+        return None
+    wins = int(pdata.get("wins", 0) or 0)
+    losses = int(pdata.get("losses", 0) or 0)
+    total = wins + losses
+    return {
+        "uid": int(uid),
+        "wins": wins,
+        "losses": losses,
+        "level": int(pdata.get("level", 1) or 1),
+        "exp": int(pdata.get("exp", 0) or 0),
+        "winrate": (wins / total * 100.0) if total else 0.0,
+        "total": total,
+    }
+
+
+def _sort_key(mode: str, row: dict) -> tuple:
+    # Negated so ascending lists read best-first; uid breaks ties so keys are unique.
+    if mode == "level":
+        return (-row["level"], -row["exp"], -row["wins"], row["uid"])
+    if mode == "winrate":
+        return (-(row["total"] > 0), -row["winrate"], -row["wins"], -row["level"], row["uid"])
+    return (-row["wins"], -row["winrate"], -row["level"], row["uid"])
+
+
+class LeaderboardIndex:
+    """
+    Sorted wins/level/winrate views of one guild's started players.
+    PlayerManager updates it on every save, so pages are slices by rank offset
+    and rank lookups are a bisect instead of a full sort.
+    """
+
+    def __init__(self, records: dict | None = None):
+        self._rows: dict[int, dict] = {}
+        self._keys: dict[str, list] = {mode: [] for mode in MODES}
+        for uid, pdata in (records or {}).items():
+            row = _row(uid, pdata)
+            if row is not None:
+                self._rows[row["uid"]] = row
+        for mode, keys in self._keys.items():
+            keys.extend(sorted(_sort_key(mode, row) for row in self._rows.values()))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def update(self, uid: int, pdata: dict):
+        """Re-rank one player from their saved data (drops them if not started)."""
+        uid = int(uid)
+        row = _row(uid, pdata)
+        old = self._rows.get(uid)
+        if old is not None and row is not None and all(
+            _sort_key(mode, old) == _sort_key(mode, row) for mode in MODES
+        ):
+            self._rows[uid] = row
+            return
+        self.remove(uid)
+        if row is None:
+            return
+        self._rows[uid] = row
+        for mode, keys in self._keys.items():
+            insort(keys, _sort_key(mode, row))
+
+    def remove(self, uid: int):
+        row = self._rows.pop(int(uid), None)
+        if row is None:
+            return
+        for mode, keys in self._keys.items():
+            key = _sort_key(mode, row)
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+
+    def page(self, mode: str, offset: int, limit: int) -> list[dict]:
+        """Rows ranked offset+1 .. offset+limit for the given sort mode."""
+        keys = self._keys.get(mode) or self._keys["wins"]
+        offset = max(0, int(offset))
+        return [self._rows[key[-1]] for key in keys[offset : offset + max(0, int(limit))]]
+
+    def rank(self, mode: str, uid: int) -> int | None:
+        """1-based rank of a player, or None if they aren't on the board."""
+        row = self._rows.get(int(uid))
+        if row is None:
+            return None
+        keys = self._keys.get(mode) or self._keys["wins"]
+        return bisect_left(keys, _sort_key(mode if mode in self._keys else "wins", row)) + 1
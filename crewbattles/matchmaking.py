@@ -0,0 +1,118 @@
+import random
+import time
+from typing import Callable
+
+# Levels per matchmaking bucket (1-10, 11-20, ...).
+LEVEL_BUCKET = 10
+
+
+def _bucket_of(level: int) -> int:
+    return max(0, int(level or 1) - 1) // LEVEL_BUCKET
+
+
+class MatchmakingPool:
+    """
+    Started, non-tempbanned players of one guild, bucketed by level.
+    PlayerManager keeps it in sync with saves; random picks are O(1) per try
+    (swap-remove lists + slot map), with a scan only if every try is rejected.
+    """
+
+    def __init__(self, records: dict | None = None, *, now: int | None = None):
+        self._buckets: dict[int, list[int]] = {}
+        self._slots: dict[int, tuple[int, int]] = {}  # uid -> (bucket, index)
+        self._levels: dict[int, int] = {}  # uid -> level, for everyone tracked (pooled or banned)
+        self._banned: dict[int, int] = {}  # uid -> tempban_until, re-pooled once it passes
+        now = int(time.time()) if now is None else now
+        for uid, pdata in (records or {}).items():
+            self.update(uid, pdata, now=now)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, uid) -> bool:
+        return int(uid) in self._slots
+
+    def level_of(self, uid: int) -> int | None:
+        return self._levels.get(int(uid))
+
+    def _add(self, uid: int, level: int):
+        bucket = self._buckets.setdefault(_bucket_of(level), [])
+        self._slots[uid] = (_bucket_of(level), len(bucket))
+        bucket.append(uid)
+
+    def _discard(self, uid: int):
+        slot = self._slots.pop(uid, None)
+        if slot is None:
+            return
+        b, i = slot
+        bucket = self._buckets[b]
+        last = bucket.pop()
+        if last != uid:
+            bucket[i] = last
+            self._slots[last] = (b, i)
+        if not bucket:
+            del self._buckets[b]
+
+    def update(self, uid: int, pdata: dict, *, now: int | None = None):
+        """Re-file one player from their saved data."""
+        uid = int(uid)
+        self.remove(uid)
+        if not isinstance(pdata, dict) or not pdata.get("started"):
+            return
+        level = int(pdata.get("level", 1) or 1)
+        self._levels[uid] = level
+        until = int(pdata.get("tempban_until", 0) or 0)
+        if until > (int(time.time()) if now is None else now):
+            self._banned[uid] = until
+        else:
+            self._add(uid, level)
+
+    def remove(self, uid: int):
+        """Take a player out entirely (not started any more, left the guild, ...)."""
+        uid = int(uid)
+        self._discard(uid)
+        self._banned.pop(uid, None)
+        self._levels.pop(uid, None)
+
+    def _release_expired(self, now: int):
+        for uid, until in list(self._banned.items()):
+            if until <= now:
+                del self._banned[uid]
+                self._add(uid, self._levels.get(uid, 1))
+
+    def pick(self, accept: Callable[[int], bool], *, level: int | None = None, attempts: int = 20) -> int | None:
+        """
+        Random pooled uid that passes accept(uid), or None.
+        With level, the player's own bucket is tried first, then neighbouring buckets outwards.
+        """
+        self._release_expired(int(time.time()))
+        if not self._slots:
+            return None
+
+        if level is None:
+            groups = [list(self._buckets)]
+        else:
+            home = _bucket_of(level)
+            reach = max(abs(b - home) for b in self._buckets)
+            groups = [[b for b in (home - d, home + d) if b in self._buckets] for d in range(reach + 1)]
+            groups = [g for g in groups if g]
+
+        for group in groups:
+            sizes = [len(self._buckets[b]) for b in group]
+            total = sum(sizes)
+            for _ in range(attempts):
+                r = random.randrange(total)
+                for b, size in zip(group, sizes):
+                    if r < size:
+                        uid = self._buckets[b][r]
+                        break
+                    r -= size
+                if accept(uid):
+                    return uid
+            # every try was rejected (small or mostly-ineligible group): scan it once
+            candidates = [uid for b in group for uid in self._buckets[b]]
+            random.shuffle(candidates)
+            for uid in candidates:
+                if accept(uid):
+                    return uid
+        return None
@@ -8,6 +8,7 @@ import discord
 from redbot.core import commands
 
 from .constants import BASE_HP, DEFAULT_USER
+from .fruits import SHOP_TYPES
 from .utils import format_duration
 
 
@@ -100,16 +101,7 @@ class PlayerCommandsMixin:
         e.set_footer(text="Tip: Train Haki to improve crit/dodge/counter chances.")
         return await ctx.reply(embed=e)
 
-    _SHOP_TYPES = {
-        "paramecia": "paramecia",
-        "zoan": "zoan",
-        "ancient": "ancient zoan",
-        "ancient zoan": "ancient zoan",
-        "logia": "logia",
-        "mythical": "mythical zoan",
-        "mythic zoan": "mythical zoan",
-        "mythical zoan": "mythical zoan",
-    }
+    _SHOP_TYPES = SHOP_TYPES
 
     def _norm_shop_type(self, t: str) -> str | None:
         key = " ".join((t or "").strip().lower().split())
@@ -139,16 +131,9 @@ class PlayerCommandsMixin:
             ("mythical zoan", "Mythical Zoan"),
         ]
 
-        def norm_item_type(x: dict) -> str:
-            return self._norm_shop_type(x.get("type", "")) or "paramecia"
-
-        def get_items(type_key: str) -> list[dict]:
-            items = self.fruits.all() or []
-            if type_key and type_key != "all":
-                items = [f for f in items if norm_item_type(f) == type_key]
-            # ascending order by price, then name
-            items.sort(key=lambda f: (int(f.get("price", 0) or 0), (f.get("name") or "").lower()))
-            return items
+        def get_items(type_key: str):
+            # cached per type, ascending by price then name; rebuilt only after stock/pool changes
+            return self.fruits.shop_by_type(type_key or "all")
 
         # If the user passed an invalid type string, fall back to all.
         valid_type_keys = {k for k, _ in TYPE_OPTIONS}
@@ -156,7 +141,7 @@ class PlayerCommandsMixin:
             initial_type = "all"
 
         # Empty shop guard
-        if not (self.fruits.all() or []):
+        if not self.fruits.shop_view():
             return await ctx.send("Shop is empty.")
 
         per = 10
@@ -237,7 +222,7 @@ class PlayerCommandsMixin:
                 items = get_items(self.type_key)
                 return max(1, math.ceil(len(items) / per))
 
-            def _page_items(self) -> list[dict]:
+            def _page_items(self):
                 items = get_items(self.type_key)
                 pages = max(1, math.ceil(len(items) / per))
                 self.page = max(1, min(int(self.page), pages))
@@ -855,50 +840,13 @@ class PlayerCommandsMixin:
         if sort_by not in ("wins", "level", "winrate"):
             sort_by = "wins"
 
-        all_users = await self.players.all(ctx.guild)
-        entries = []
-        for uid, pdata in (all_users or {}).items():
-            if not isinstance(pdata, dict) or not pdata.get("started"):
-                continue
-            try:
-                uid_int = int(uid)
-            except Exception:
-                continue
-
-            wins = int(pdata.get("wins", 0) or 0)
-            losses = int(pdata.get("losses", 0) or 0)
-            lvl = int(pdata.get("level", 1) or 1)
-            exp = int(pdata.get("exp", 0) or 0)
-            total = wins + losses
-            winrate = (wins / total * 100.0) if total else 0.0
-
-            entries.append(
-                {
-                    "uid": uid_int,
-                    "wins": wins,
-                    "losses": losses,
-                    "level": lvl,
-                    "exp": exp,
-                    "winrate": winrate,
-                    "total": total,
-                }
-            )
-
-        if not entries:
+        # Ranked indexes are kept up to date by PlayerManager.save(); pages are slices by rank.
+        board = await self.players.leaderboard(ctx.guild)
+        if not len(board):
             return await ctx.reply("No players found yet. Use `.startcb` to begin.")
 
-        def sort_entries(mode: str):
-            if mode == "level":
-                entries.sort(key=lambda x: (x["level"], x["exp"], x["wins"]), reverse=True)
-            elif mode == "winrate":
-                entries.sort(key=lambda x: (x["total"] > 0, x["winrate"], x["wins"], x["level"]), reverse=True)
-            else:
-                entries.sort(key=lambda x: (x["wins"], x["winrate"], x["level"]), reverse=True)
-
-        sort_entries(sort_by)
-
         per = 10
-        pages = max(1, math.ceil(len(entries) / per))
+        pages = max(1, math.ceil(len(board) / per))
         start_page = max(1, min(start_page, pages))
 
         def disp_name(uid: int) -> str:
@@ -916,7 +864,7 @@ class PlayerCommandsMixin:
         def build_embed(page: int, mode: str) -> discord.Embed:
             page = max(1, min(int(page), pages))
             start = (page - 1) * per
-            chunk = entries[start : start + per]
+            chunk = board.page(mode, start, per)
 
             def _rank_icon(rank: int) -> str:
                 if rank == 1:
@@ -944,7 +892,11 @@ class PlayerCommandsMixin:
             )
 
             sort_label = {"wins": "Wins", "level": "Level", "winrate": "Winrate"}.get(mode, str(mode))
-            e.set_footer(text=f"Sorted by {sort_label} • Page {page}/{pages} • Players: {len(entries)}")
+            footer = f"Sorted by {sort_label} • Page {page}/{pages} • Players: {len(board)}"
+            my_rank = board.rank(mode, ctx.author.id)
+            if my_rank is not None:
+                footer += f" • Your rank: #{my_rank}"
+            e.set_footer(text=footer)
             return e
 
         if pages == 1:
@@ -986,7 +938,6 @@ class PlayerCommandsMixin:
             )
             async def sort_select(self, interaction: discord.Interaction, select: discord.ui.Select):
                 self.mode = select.values[0]
-                sort_entries(self.mode)
                 self.current = 1
                 self._sync()
                 await interaction.response.edit_message(embed=build_embed(self.current, self.mode), view=self)
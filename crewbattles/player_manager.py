@@ -1,15 +1,33 @@
+import asyncio
 import copy
 import discord
+from redbot.core import Config
 
 from .constants import DEFAULT_USER
+from .leaderboard import LeaderboardIndex
+from .matchmaking import MatchmakingPool
+
+# Dirty records are written back at most this long after the first change...
+FLUSH_INTERVAL = 30
+# ...or straight away once this many records are waiting.
+FLUSH_THRESHOLD = 50
+
+# Member keys written straight to Config elsewhere (beri logs); the cache never
+# holds them, and flushes keep whatever is stored.
+UNCACHED_KEYS = ("beri_logs",)
+
 
 class PlayerManager:
     """
-        Lightweight wrapper around Red's Config for per-guild CrewBattles data.
+        Per-guild player cache in front of Red's Config for CrewBattles data.
     Methods:
             - get(member, guild=None) -> dict (always returns a dict copy)
-            - save(member, data, guild=None) -> saves dict
+            - save(member, data, guild=None) -> updates the cache, written back by flush()
             - all(guild) -> returns mapping of user_id -> dict for that guild
+            - flush(guild=None) -> write dirty records now
+            - invalidate(guild, user=None) -> drop cached records after a direct Config write
+            - leaderboard(guild) -> LeaderboardIndex kept in sync with saves
+            - matchmaking(guild) -> MatchmakingPool of battle-eligible players, kept in sync with saves
     """
     def __init__(self, cog):
         self.cog = cog
@@ -17,6 +35,18 @@ class PlayerManager:
         # If you already have _conf, keep it; otherwise set it like below:
         self._conf = cog.config
 
+        self._cache: dict[int, dict[int, dict]] = {}  # gid -> uid -> merged record
+        self._dirty: dict[int, set[int]] = {}
+        self._stale: dict[int, set[int]] = {}  # invalidated members to re-read from Config
+        self._boards: dict[int, LeaderboardIndex] = {}
+        self._pools: dict[int, MatchmakingPool] = {}
+        self._departed: dict[int, set[int]] = {}  # members who left; kept out of the pool
+        self._legacy: dict[int, dict] | None = None  # started legacy user-scope records, read once
+        self._load_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._flush_now = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+
     def _uid(self, user) -> int:
         """Return an int user id from Member/User/int/str safely."""
         if hasattr(user, "id"):
@@ -30,54 +60,107 @@ class PlayerManager:
         except Exception:
             return None
 
-    async def get(self, user: discord.abc.User, guild=None) -> dict:
-        """Get player data scoped to the given guild (defaults if none stored)."""
-        uid = self._uid(user)
-        if guild is None:
-            guild = getattr(user, "guild", None)
+    @staticmethod
+    def _merge(stored: dict) -> dict:
+        """Merge stored onto defaults safely (preserves existing values, nested haki too)."""
+        merged = copy.deepcopy(DEFAULT_USER)
+        merged.update(stored)
 
-        gid = self._guild_id(guild)
-        stored = None
-        if gid is not None:
-            try:
-                stored = await self._conf.member_from_ids(gid, uid).all()
-            except Exception:
-                stored = None
+        base_haki = copy.deepcopy(DEFAULT_USER.get("haki", {}))
+        if isinstance(stored.get("haki"), dict):
+            base_haki.update(stored["haki"])
+        merged["haki"] = base_haki
+
+        for key in UNCACHED_KEYS:
+            merged.pop(key, None)
+        return merged
+
+    async def _guild(self, gid: int) -> dict[int, dict]:
+        """Load a guild's stored records (and the legacy records, once) into the cache."""
+        cached = self._cache.get(gid)
+        if cached is not None:
+            return cached
+        async with self._load_lock:
+            if gid in self._cache:
+                return self._cache[gid]
+
+            if self._legacy is None:
+                # Best-effort migration source from legacy global user-scope storage.
+                # Only records that look like they were used are kept.
+                try:
+                    users = await self._conf.all_users()
+                except Exception:
+                    users = {}
+                self._legacy = {
+                    int(uid): data
+                    for uid, data in (users or {}).items()
+                    if isinstance(data, dict) and data.get("started")
+                }
 
-        # Best-effort migration from legacy global user-scope storage.
-        if (not isinstance(stored, dict) or not stored) and gid is not None:
             try:
-                legacy = await self._conf.user_from_id(uid).all()
+                stored = await self._conf._get_base_group(Config.MEMBER, str(gid)).all()
             except Exception:
-                legacy = None
+                stored = {}
 
-            if isinstance(legacy, dict) and legacy:
-                # Only migrate if the legacy record looks like it was used.
-                if bool(legacy.get("started")):
-                    stored = copy.deepcopy(legacy)
+            records = {}
+            for uid, data in (stored or {}).items():
+                if isinstance(data, dict) and data:
                     try:
-                        await self._conf.member_from_ids(gid, uid).set(copy.deepcopy(stored))
+                        records[int(uid)] = self._merge(data)
                     except Exception:
-                        pass
+                        continue
+            self._cache[gid] = records
+            return records
 
-        # If nothing stored, return defaults (do NOT save here)
-        if not isinstance(stored, dict) or not stored:
-            return copy.deepcopy(DEFAULT_USER)
+    def _put(self, gid: int, uid: int, record: dict):
+        self._cache[gid][uid] = record
+        board = self._boards.get(gid)
+        if board is not None:
+            board.update(uid, record)
+        pool = self._pools.get(gid)
+        if pool is not None and uid not in self._departed.get(gid, ()):
+            pool.update(uid, record)
 
-        # Merge stored onto defaults safely (preserves existing values)
-        merged = copy.deepcopy(DEFAULT_USER)
-        merged.update(stored)
+    async def _record(self, gid: int, uid: int) -> dict:
+        records = await self._guild(gid)
+        stale = self._stale.get(gid)
+        if stale and uid in stale:
+            stale.discard(uid)
+            try:
+                stored = await self._conf.member_from_ids(gid, uid).all()
+            except Exception:
+                stored = None
+            if isinstance(stored, dict) and stored:
+                self._put(gid, uid, self._merge(stored))
 
-        # merge nested haki safely
-        base_haki = copy.deepcopy(DEFAULT_USER.get("haki", {}))
-        if isinstance(stored.get("haki"), dict):
-            base_haki.update(stored["haki"])
-        merged["haki"] = base_haki
+        record = records.get(uid)
+        if record is None:
+            legacy = (self._legacy or {}).get(uid)
+            if legacy:
+                # migrate into this guild's member scope on the next flush
+                record = self._merge(legacy)
+                self._put(gid, uid, record)
+                self._mark_dirty(gid, uid)
+            else:
+                # defaults are cached but not saved
+                record = self._merge({})
+                records[uid] = record
+        return record
 
-        return merged
+    async def get(self, user: discord.abc.User, guild=None) -> dict:
+        """Get player data scoped to the given guild (defaults if none stored)."""
+        uid = self._uid(user)
+        if guild is None:
+            guild = getattr(user, "guild", None)
+
+        gid = self._guild_id(guild)
+        if gid is None:
+            return copy.deepcopy(DEFAULT_USER)
+
+        return copy.deepcopy(await self._record(gid, uid))
 
     async def save(self, user: discord.abc.User, data: dict, guild=None):
-        """Persist player data scoped to the given guild (deepcopy to avoid shared references)."""
+        """Store player data scoped to the given guild (deepcopy to avoid shared references)."""
         uid = self._uid(user)
         if guild is None:
             guild = getattr(user, "guild", None)
@@ -90,10 +173,156 @@ class PlayerManager:
             # No guild context; avoid writing global user-scope data.
             return
 
-        await self._conf.member_from_ids(gid, uid).set(copy.deepcopy(data))
+        await self._guild(gid)
+        record = copy.deepcopy(data)
+        for key in UNCACHED_KEYS:
+            record.pop(key, None)
+        self._stale.get(gid, set()).discard(uid)
+        self._put(gid, uid, record)
+        self._mark_dirty(gid, uid)
+
+    def _mark_dirty(self, gid: int, uid: int):
+        self._dirty.setdefault(gid, set()).add(uid)
+        if sum(len(uids) for uids in self._dirty.values()) >= FLUSH_THRESHOLD:
+            self._flush_now.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        try:
+            await asyncio.wait_for(self._flush_now.wait(), FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        self._flush_now.clear()
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"[CrewBattles] player flush failed: {e}")
+        if any(self._dirty.values()):
+            # changes that arrived mid-flush (or a failed write) go in the next batch
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self, guild=None):
+        """Write dirty records back to Config, one batched write per guild."""
+        async with self._flush_lock:
+            if guild is None:
+                gids = list(self._dirty)
+            else:
+                gid = self._guild_id(guild)
+                gids = [gid] if gid is not None else []
+
+            for gid in gids:
+                uids = self._dirty.pop(gid, None)
+                records = self._cache.get(gid) or {}
+                batch = {str(uid): copy.deepcopy(records[uid]) for uid in (uids or ()) if uid in records}
+                if not batch:
+                    continue
+                try:
+                    async with self._conf._get_base_group(Config.MEMBER, str(gid))() as members:
+                        for key, record in batch.items():
+                            stored = members.get(key) or {}
+                            kept = {k: stored[k] for k in UNCACHED_KEYS if k in stored}
+                            members[key] = {**kept, **record}
+                except Exception:
+                    self._dirty.setdefault(gid, set()).update(uids)
+                    raise
+
+    def invalidate(self, guild, user=None):
+        """
+        Forget cached records (and unsaved changes) for a guild or one member.
+        Call after writing member data to Config directly; flush first if the
+        write is based on what all() returned.
+        """
+        gid = self._guild_id(guild)
+        if gid is None:
+            return
+        if user is None:
+            self._cache.pop(gid, None)
+            self._dirty.pop(gid, None)
+            self._stale.pop(gid, None)
+            self._boards.pop(gid, None)
+            self._pools.pop(gid, None)
+            return
+        uid = self._uid(user)
+        if gid not in self._cache:
+            return
+        self._cache[gid].pop(uid, None)
+        self._dirty.get(gid, set()).discard(uid)
+        self._stale.setdefault(gid, set()).add(uid)
+        board = self._boards.get(gid)
+        if board is not None:
+            board.remove(uid)
+        pool = self._pools.get(gid)
+        if pool is not None:
+            pool.remove(uid)
+
+    async def leaderboard(self, guild) -> LeaderboardIndex:
+        """Ranked view of this guild's started players, built once and updated by save()."""
+        gid = self._guild_id(guild)
+        if gid is None:
+            return LeaderboardIndex()
+        records = await self._guild(gid)
+        for uid in list(self._stale.get(gid) or ()):
+            await self._record(gid, uid)
+        board = self._boards.get(gid)
+        if board is None:
+            board = self._boards[gid] = LeaderboardIndex(records)
+        return board
+
+    async def matchmaking(self, guild) -> MatchmakingPool:
+        """Started, non-banned players still in the guild, built once and updated by save()."""
+        gid = self._guild_id(guild)
+        if gid is None:
+            return MatchmakingPool()
+        records = await self._guild(gid)
+        for uid in list(self._stale.get(gid) or ()):
+            await self._record(gid, uid)
+        pool = self._pools.get(gid)
+        if pool is None:
+            departed = self._departed.get(gid, ())
+            pool = self._pools[gid] = MatchmakingPool(
+                {uid: record for uid, record in records.items() if uid not in departed}
+            )
+        return pool
+
+    def member_left(self, guild, user):
+        """Keep a member who left the guild out of matchmaking (their data is kept)."""
+        gid = self._guild_id(guild)
+        if gid is None:
+            return
+        uid = self._uid(user)
+        self._departed.setdefault(gid, set()).add(uid)
+        pool = self._pools.get(gid)
+        if pool is not None:
+            pool.remove(uid)
+
+    def member_joined(self, guild, user):
+        gid = self._guild_id(guild)
+        if gid is None:
+            return
+        uid = self._uid(user)
+        self._departed.get(gid, set()).discard(uid)
+        pool = self._pools.get(gid)
+        record = self._cache.get(gid, {}).get(uid)
+        if pool is not None and record is not None:
+            pool.update(uid, record)
+
+    async def close(self):
+        """Stop the background flush and write everything still pending (cog unload)."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"[CrewBattles] player flush failed: {e}")
 
     async def all(self, guild) -> dict:
-        """Return raw mapping (uid -> dict) for this guild."""
+        """Return raw mapping (uid -> dict) for this guild, including unsaved changes."""
+        try:
+            await self.flush(guild)
+        except Exception:
+            pass
         try:
             return await self._conf.all_members(guild)
         except Exception:
@@ -0,0 +1,205 @@
+"""
+Batched replay of a simulated battle onto the animated battle embed.
+
+simulate() resolves the whole fight up front, so the animation is only a replay:
+turns are grouped into a few frames (one message edit each) instead of one edit
+per turn. The frame count grows with the battle length up to the guild's
+``battle_frames`` and shrinks as the shared EditBudget (edits made by every
+battle in the last EDIT_WINDOW seconds) runs low. With battle_frames = 0, or no
+headroom left, the replay goes straight to the final state.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+
+from .constants import BASE_HP
+from .embeds import battle_embed
+
+# Turns shown per frame before a battle earns another frame.
+TURNS_PER_FRAME = 3
+DEFAULT_MAX_FRAMES = 8
+# Battle-embed edits allowed across every running battle per window.
+EDIT_BUDGET = 40
+EDIT_WINDOW = 60.0
+# An edit slower than this was most likely held back by a rate limit; it costs extra budget.
+SLOW_EDIT = 1.5
+SLOW_EDIT_COST = 3
+# Same hard clamp as turn_delay, applied to a whole frame.
+MAX_FRAME_DELAY = 5.0
+LOG_LINES = 10
+REPLAY_HISTORY = 20
+
+
+def _short(s: str, n: int) -> str:
+    s = str(s or "")
+    return (s[: n - 1] + "…") if n >= 2 and len(s) > n else s
+
+
+def _yaml_quote(s: str) -> str:
+    s = str(s or "")
+    s = s.replace("\\", "\\\\").replace('"', "\\\"")
+    s = s.replace("\n", " ").replace("\r", " ").strip()
+    return f'"{s}"'
+
+
+def turn_line(turn, p1_name: str, p2_name: str) -> str:
+    """Combat-log line for one simulate() turn tuple."""
+    side, dmg, _hp_after, atk_name, crit = turn
+    # NOTE: In the turn tuple, `side` is the attacker.
+    actor, defender = (p1_name, p2_name) if side == "p1" else (p2_name, p1_name)
+    actor_s = _short(actor, 18)
+    defender_s = _short(defender, 18)
+
+    is_counter = str(atk_name) == "Conqueror Counter"
+    is_fruit = isinstance(atk_name, str) and atk_name.startswith("🍈 ")
+
+    if int(dmg) <= 0 and str(atk_name).lower() == "dodged":
+        # A "Dodged" entry means the defender dodged the attacker's move.
+        return f"💨 {defender_s} dodged {actor_s}"
+    if is_counter:
+        return f"👑 {actor_s}: Counter - {int(dmg)} (COUNTER-CRIT)"
+
+    move_display = str(atk_name)
+    emoji = "🗡️"
+    if is_fruit:
+        emoji = "🍈"
+        move_display = str(atk_name)[2:].strip() or "Fruit Technique"
+    move_display = _short(move_display, 22)
+
+    suffix = ""
+    if crit:
+        suffix = " (CRIT)"
+    elif is_fruit:
+        suffix = " (FRUIT)"
+    return f"{emoji} {actor_s}: {move_display} - {int(dmg)}{suffix}"
+
+
+def plan_frames(turn_count: int, max_frames: int, headroom: float) -> int:
+    """Edits to spend on a battle: scales with its length, capped by max_frames and budget headroom."""
+    if turn_count <= 0 or max_frames <= 0 or headroom <= 0:
+        return 0
+    wanted = min(int(max_frames), math.ceil(turn_count / TURNS_PER_FRAME))
+    return max(1, math.floor(wanted * min(1.0, headroom)))
+
+
+class EditBudget:
+    """Rolling count of battle-embed edits made by every battle of the cog."""
+
+    def __init__(self, limit: int = EDIT_BUDGET, window: float = EDIT_WINDOW):
+        self.limit = max(1, int(limit))
+        self.window = float(window)
+        self._stamps: deque[float] = deque()
+
+    def _trim(self, now: float):
+        while self._stamps and now - self._stamps[0] > self.window:
+            self._stamps.popleft()
+
+    def headroom(self) -> float:
+        """Share of the budget still free (0.0 - 1.0)."""
+        self._trim(time.monotonic())
+        return max(0.0, 1.0 - len(self._stamps) / self.limit)
+
+    def spend(self, cost: int = 1):
+        now = time.monotonic()
+        self._trim(now)
+        self._stamps.extend([now] * max(1, int(cost)))
+
+
+class ReplayTracker:
+    """Shared edit budget plus stats of the most recent replays."""
+
+    def __init__(self, history: int = REPLAY_HISTORY):
+        self.budget = EditBudget()
+        self.recent: deque[dict] = deque(maxlen=history)
+
+    def replay(self, p1, p2, turns, **kwargs) -> "BattleReplay":
+        return BattleReplay(p1, p2, turns, tracker=self, **kwargs)
+
+
+class BattleReplay:
+    """
+    Plays one battle's turns onto a single message.
+    After play(): edits / failed_edits / frames / skipped / duration (seconds), see stats().
+    """
+
+    def __init__(self, p1, p2, turns, *, tracker: ReplayTracker, max_frames: int = DEFAULT_MAX_FRAMES, turn_delay: float = 1.0):
+        self.p1 = p1
+        self.p2 = p2
+        self.turns = list(turns or [])
+        self.tracker = tracker
+        self.turn_delay = max(0.0, float(turn_delay or 0.0))
+        self.frames = plan_frames(len(self.turns), max_frames, tracker.budget.headroom())
+        self.skipped = self.frames == 0
+        self.edits = 0
+        self.failed_edits = 0
+        self.duration = 0.0
+
+        self.hp1 = int(BASE_HP)
+        self.hp2 = int(BASE_HP)
+        self._played = 0
+        self._log: list[str] = []
+        self._names = (getattr(p1, "display_name", "Player 1"), getattr(p2, "display_name", "Player 2"))
+
+    def _advance(self, upto: int):
+        for turn in self.turns[self._played : upto]:
+            if turn[0] == "p1":
+                self.hp2 = int(turn[2])
+            else:
+                self.hp1 = int(turn[2])
+            self._log.append(f"- {_yaml_quote(turn_line(turn, *self._names))}")
+        self._log = self._log[-LOG_LINES:]
+        self._played = max(self._played, upto)
+
+    def embed(self):
+        log_text = "```yaml\n" + "\n".join(self._log) + "\n```" if self._log else "—"
+        return battle_embed(self.p1, self.p2, self.hp1, self.hp2, BASE_HP, BASE_HP, log_text)
+
+    async def _edit(self, msg):
+        started = time.monotonic()
+        try:
+            await msg.edit(embed=self.embed())
+            self.edits += 1
+        except Exception:
+            self.failed_edits += 1
+        slow = time.monotonic() - started > SLOW_EDIT
+        self.tracker.budget.spend(SLOW_EDIT_COST if slow else 1)
+
+    async def play(self, channel):
+        """Send the battle message to `channel` and animate it; returns the message."""
+        started = time.monotonic()
+        try:
+            if self.skipped:
+                self._advance(len(self.turns))
+                return await channel.send(embed=self.embed())
+
+            msg = await channel.send(embed=self.embed())
+            total = len(self.turns)
+            for frame in range(1, self.frames + 1):
+                upto = math.ceil(total * frame / self.frames)
+                if frame < self.frames and self.tracker.budget.headroom() <= 0:
+                    # other battles used up the budget: show the outcome now
+                    upto = total
+                    self.skipped = True
+                shown = upto - self._played
+                self._advance(upto)
+                await self._edit(msg)
+                if self.turn_delay > 0:
+                    await asyncio.sleep(min(MAX_FRAME_DELAY, self.turn_delay * shown))
+                if upto >= total:
+                    break
+            return msg
+        finally:
+            self.duration = time.monotonic() - started
+            self.tracker.recent.append(self.stats())
+
+    def stats(self) -> dict:
+        return {
+            "at": int(time.time()),
+            "turns": len(self.turns),
+            "frames": self.frames,
+            "edits": self.edits,
+            "failed_edits": self.failed_edits,
+            "skipped": self.skipped,
+            "duration": round(self.duration, 2),
+        }
@@ -1,3 +1,9 @@
+import time
+
+# Member -> team index lifetime. Rebuilt sooner when team_of() sees it is out of date.
+TEAM_INDEX_TTL = 60
+
+
 class TeamsBridge:
     """
     Adapter for a Teams cog that stores teams like:
@@ -10,6 +16,8 @@ class TeamsBridge:
 
     def __init__(self, bot):
         self.bot = bot
+        # guild_id -> (built_at, {member_id: team}); teams are kept so hits can be re-checked
+        self._index: dict[int, tuple[float, dict[int, object]]] = {}
 
     def _teams_cog(self):
         # Try common cog names
@@ -65,14 +73,60 @@ class TeamsBridge:
                 return str(v)
         return str(team)
 
+    def _member_teams(self, guild_id: int) -> dict[int, object]:
+        """{member_id: team} for the guild, rebuilt after TEAM_INDEX_TTL."""
+        now = time.monotonic()
+        cached = self._index.get(guild_id)
+        if cached and now - cached[0] < TEAM_INDEX_TTL:
+            return cached[1]
+
+        index: dict[int, object] = {}
+        for team in self._iter_guild_teams(guild_id):
+            try:
+                mids = list(getattr(team, "members", None) or ())
+            except Exception:
+                continue
+            for m in mids:
+                mid = getattr(m, "id", m)
+                try:
+                    # first team wins, same as the old linear scan
+                    index.setdefault(int(mid), team)
+                except Exception:
+                    continue
+        self._index[guild_id] = (now, index)
+        return index
+
+    def team_index(self, guild) -> dict[int, str]:
+        """
+        Return {member_id: team_key} for the guild, for bulk filtering.
+        May be up to TEAM_INDEX_TTL old; team_of() is always current.
+        """
+        if not guild:
+            return {}
+        return {mid: self._team_key(team) for mid, team in self._member_teams(guild.id).items()}
+
     async def team_of(self, guild, member):
         """Return a stable team key, or None if not in a team / Teams cog missing."""
         if not guild or not member:
             return None
-        for team in self._iter_guild_teams(guild.id):
-            if self._member_in_team(team, member):
+        try:
+            mid = int(getattr(member, "id", member))
+            team = self._member_teams(guild.id).get(mid)
+            if team is not None and self._member_in_team(team, member):
                 return self._team_key(team)
-        return None
+
+            # Not indexed, or no longer in the indexed team (left / switched / swapped):
+            # answer from the live teams and drop the index so the next lookup rebuilds it.
+            current = None
+            for t in self._iter_guild_teams(guild.id):
+                if self._member_in_team(t, member):
+                    current = t
+                    break
+            if current is not team:
+                self._index.pop(guild.id, None)
+            return self._team_key(current) if current is not None else None
+        except Exception:
+            return None
 
     async def award_win(self, ctx, member, points: int) -> bool:
         """Award points to member's team. Returns False if no Teams cog or member not in a team."""
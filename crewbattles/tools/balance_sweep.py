@@ -0,0 +1,262 @@
+"""
+Offline balance sweep for the CrewBattles battle engine.
+
+Builds a grid of (fruit, armament, observation, conqueror) profiles, fights
+every matchup many times across a process pool, and writes a matchup matrix
+(win probability + mean turns) plus a per-profile summary. Run it from the
+repo root:
+
+    python crewbattles/tools/balance_sweep.py --battles 2000 --out sweep/
+
+Uses the NumPy batch simulator when NumPy is installed and falls back to the
+scalar simulate() otherwise (much slower). Also doubles as a throughput
+benchmark: the final line reports fights per second.
+"""
+import argparse
+import csv
+import importlib
+import itertools
+import json
+import os
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+COG_DIR = HERE.parents[1]
+FRUITS_PATH = (HERE.parents[2] / "fruits.json")  # same default as reprice_fruits.py
+
+DEFAULT_HAKI_LEVELS = (0, 50, 100)
+DEFAULT_CONQUEROR_LEVELS = (None, 50, 100)  # None = conqueror not unlocked
+
+
+def _load_engine():
+    """Import the engine modules without running the cog's __init__ (which needs Red)."""
+    name = "_crewbattles_engine"
+    if name not in sys.modules:
+        pkg = types.ModuleType(name)
+        pkg.__path__ = [str(COG_DIR)]
+        sys.modules[name] = pkg
+    return (
+        importlib.import_module(f"{name}.battle_engine"),
+        importlib.import_module(f"{name}.batch_sim"),
+    )
+
+
+battle_engine, batch_sim = _load_engine()
+
+
+def _norm(name: str) -> str:
+    return " ".join((name or "").strip().lower().split())
+
+
+class FruitPool:
+    """Read-only stand-in for FruitManager: just the get/pool_get/stats the engine calls."""
+
+    def __init__(self, fruits: list):
+        self._fruits = {_norm(f.get("name", "")): f for f in fruits if isinstance(f, dict) and f.get("name")}
+        self._stats = {key: battle_engine.compile_fruit_stats(f) for key, f in self._fruits.items()}
+
+    def get(self, name):
+        return self._fruits.get(_norm(name))
+
+    def pool_get(self, name):
+        return self._fruits.get(_norm(name))
+
+    def stats(self, name):
+        return self._stats.get(_norm(name))
+
+    def names(self) -> list:
+        return [f["name"] for f in self._fruits.values()]
+
+
+def load_fruits(path: Path) -> list:
+    """Accept fruits.json / fruits_pool.json: list[fruit], {"fruits": [...]} or a dict keyed by name."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    fruits = data.get("fruits") if isinstance(data, dict) else data
+    if isinstance(fruits, dict):
+        fruits = list(fruits.values())
+    if not isinstance(fruits, list):
+        raise SystemExit(f"Invalid fruits file: {path}")
+    return fruits
+
+
+def make_profile(fruit, arm: int, obs: int, conq) -> dict:
+    return {
+        "fruit": fruit,
+        "haki": {
+            "armament": arm,
+            "observation": obs,
+            "conquerors": conq is not None,
+            "conqueror": conq or 0,
+        },
+    }
+
+
+def profile_key(profile: dict) -> tuple:
+    h = profile["haki"]
+    return (profile["fruit"] or "", h["armament"], h["observation"], h["conqueror"] if h["conquerors"] else None)
+
+
+# Worker state, set once per process by _init_worker.
+_POOL = None
+
+
+def _init_worker(fruits: list):
+    global _POOL
+    _POOL = FruitPool(fruits)
+
+
+def _run_matchup(task):
+    """Fight one matchup `battles` times; returns (i, j, win_rate, mean_turns)."""
+    i, j, p1, p2, battles, tuning, seed = task
+    if batch_sim.numpy_available():
+        result = batch_sim.simulate_batch(p1, p2, _POOL, battles, tuning=tuning, seed=seed)
+        return i, j, result["p1_win_rate"], result["turns"]["mean"]
+
+    wins = 0
+    turns = 0
+    for _ in range(battles):
+        winner, log, _, _ = battle_engine.simulate(p1, p2, _POOL, tuning)
+        wins += winner == "p1"
+        turns += len(log)
+    return i, j, wins / battles, turns / battles
+
+
+def build_profiles(fruit_names: list, arm_levels, obs_levels, conq_levels) -> list:
+    return [
+        make_profile(fruit, arm, obs, conq)
+        for fruit, arm, obs, conq in itertools.product(fruit_names, arm_levels, obs_levels, conq_levels)
+    ]
+
+
+def build_tasks(profiles: list, *, cross: bool, battles: int, tuning, seed) -> list:
+    """
+    By default only profiles on the same haki tier fight each other, so the matrix
+    isolates fruit strength. --cross fights every profile against every other.
+    """
+    tasks = []
+    for i, p1 in enumerate(profiles):
+        for j, p2 in enumerate(profiles):
+            if i == j:
+                continue
+            if not cross and profile_key(p1)[1:] != profile_key(p2)[1:]:
+                continue
+            tasks.append((i, j, p1, p2, battles, tuning, None if seed is None else seed + len(tasks)))
+    return tasks
+
+
+def write_results(out_dir: Path, profiles: list, results: list):
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with (out_dir / "matchups.csv").open("w", newline="", encoding="utf-8") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(["p1_fruit", "p1_arm", "p1_obs", "p1_conq", "p2_fruit", "p2_arm", "p2_obs", "p2_conq", "p1_win_rate", "mean_turns"])
+        for i, j, win_rate, mean_turns in sorted(results):
+            writer.writerow([*profile_key(profiles[i]), *profile_key(profiles[j]), f"{win_rate:.4f}", f"{mean_turns:.2f}"])
+
+    # per-profile average win rate over every matchup it fought (as p1 and as p2)
+    totals = {}
+    for i, j, win_rate, _ in results:
+        for idx, rate in ((i, win_rate), (j, 1.0 - win_rate)):
+            s = totals.setdefault(idx, [0.0, 0])
+            s[0] += rate
+            s[1] += 1
+    summary = sorted(
+        (
+            {
+                "fruit": profile_key(profiles[idx])[0] or None,
+                "armament": profile_key(profiles[idx])[1],
+                "observation": profile_key(profiles[idx])[2],
+                "conqueror": profile_key(profiles[idx])[3],
+                "avg_win_rate": round(total / count, 4),
+                "matchups": count,
+            }
+            for idx, (total, count) in totals.items()
+        ),
+        key=lambda row: -row["avg_win_rate"],
+    )
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _levels(text: str, *, allow_locked: bool = False):
+    out = []
+    for part in text.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if allow_locked and part in ("none", "off", "locked"):
+            out.append(None)
+        else:
+            out.append(max(0, min(100, int(part))))
+    return tuple(out)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Sweep fruit/haki profiles through the CrewBattles engine.")
+    ap.add_argument("--fruits", type=Path, default=FRUITS_PATH, help="fruits.json or fruits_pool.json")
+    ap.add_argument("--only", default="", help="comma-separated fruit names to include (default: all)")
+    ap.add_argument("--no-fruit", action="store_true", help="also include a profile with no fruit")
+    ap.add_argument("--armament", default=",".join(map(str, DEFAULT_HAKI_LEVELS)))
+    ap.add_argument("--observation", default=",".join(map(str, DEFAULT_HAKI_LEVELS)))
+    ap.add_argument(
+        "--conqueror",
+        default=",".join("none" if lvl is None else str(lvl) for lvl in DEFAULT_CONQUEROR_LEVELS),
+        help="levels; 'none' = not unlocked",
+    )
+    ap.add_argument("--battles", type=int, default=1000, help="fights per matchup")
+    ap.add_argument("--cross", action="store_true", help="fight across haki tiers too (grows quadratically)")
+    ap.add_argument("--tuning", default="", help='JSON overrides for battle_engine.TUNING, e.g. \'{"dodge_per_obs": 0.004}\'')
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--out", type=Path, default=Path("balance_sweep"))
+    args = ap.parse_args()
+
+    if not args.fruits.exists():
+        raise SystemExit(f"fruits file not found at: {args.fruits}")
+
+    fruits = load_fruits(args.fruits)
+    pool = FruitPool(fruits)
+    fruit_names = pool.names()
+    if args.only:
+        wanted = {_norm(n) for n in args.only.split(",")}
+        fruit_names = [n for n in fruit_names if _norm(n) in wanted]
+    if args.no_fruit:
+        fruit_names = [None] + fruit_names
+    if not fruit_names:
+        raise SystemExit("No fruits selected.")
+
+    tuning = json.loads(args.tuning) if args.tuning else None
+    unknown = set(tuning or {}) - set(battle_engine.TUNING)
+    if unknown:
+        raise SystemExit(f"Unknown tuning key(s): {', '.join(sorted(unknown))}")
+
+    profiles = build_profiles(
+        fruit_names,
+        _levels(args.armament),
+        _levels(args.observation),
+        _levels(args.conqueror, allow_locked=True),
+    )
+    battles = max(1, args.battles)
+    tasks = build_tasks(profiles, cross=args.cross, battles=battles, tuning=tuning, seed=args.seed)
+    if not tasks:
+        raise SystemExit("Nothing to simulate: need at least two profiles per tier (or --cross).")
+
+    engine = "numpy batch" if batch_sim.numpy_available() else "scalar (install numpy for a large speedup)"
+    print(f"{len(profiles)} profile(s), {len(tasks)} matchup(s) x {battles} fights, {args.workers} worker(s), engine: {engine}")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=_init_worker, initargs=(fruits,)) as executor:
+        chunksize = max(1, len(tasks) // (max(1, args.workers) * 8))
+        results = list(executor.map(_run_matchup, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - started
+
+    write_results(args.out, profiles, results)
+    fights = len(tasks) * battles
+    print(f"Simulated {fights:,} fights in {elapsed:.1f}s ({fights / max(elapsed, 1e-9):,.0f} fights/s). Wrote: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import logging
-import random
 import re
+import time
 import uuid
 from typing import Any
 from urllib.parse import quote
@@ -20,17 +21,23 @@ from .constants import (
     BID_COOLDOWN,
     DEFAULT_AUCTION_DURATION,
     DEFAULT_AUCTION_INTERVAL,
+    EMBED_UPDATE_INTERVAL,
     GOING_ONCE_SECONDS,
     GOING_THREE_SECONDS,
     GOING_TWICE_SECONDS,
     INVALID_BID_LIMIT,
+    LOAN_GRACE_PERIOD_SECONDS,
     MAX_ANTI_SNIPE,
     MINIMUM_BID_INCREMENT,
     NO_BID_CLOSE_SECONDS,
     OFFER_TIMEOUT_SECONDS,
     POOL_STARTING_BIDS,
-    RARITY_WEIGHTS,
+    SCHEDULER_HEARTBEAT_SECONDS,
+    SCHEDULER_RETRY_SECONDS,
+    TAX_INTERVAL_SECONDS,
 )
+from .renderer import EmbedRenderer
+from .tasks import DeadlineScheduler
 from .utils import clean_name, format_berries, format_duration, utc_timestamp
 from .views import AuctionEmbeds
 
@@ -40,6 +47,7 @@ log = logging.getLogger("red.opauction")
 # A reload may briefly leave an old background task alive while a new cog loads.
 _AUCTION_START_LOCK = asyncio.Lock()
 _AUCTION_STATE_LOCK = asyncio.Lock()
+_TAX_COLLECTION_LOCK = asyncio.Lock()
 
 
 class AuctionManager:
@@ -53,6 +61,16 @@ class AuctionManager:
         self._last_start_error: str | None = None
         self._start_lock = _AUCTION_START_LOCK
         self._state_lock = _AUCTION_STATE_LOCK
+        self._tax_lock = _TAX_COLLECTION_LOCK
+        self.scheduler = DeadlineScheduler()
+        # In-memory mirror of ``current_auction`` and ``auction_running`` so the
+        # bid path never waits on Config; both are refreshed on every write.
+        self._live: dict[str, Any] | None = None
+        self._live_loaded = False
+        self._running: bool | None = None
+        # bidder ID -> (blocking reply, owns the character, valid until)
+        self._eligibility: dict[int, tuple[str | None, bool, float]] = {}
+        self.renderer = EmbedRenderer(self.update_current_embed, EMBED_UPDATE_INTERVAL)
 
     async def start_failure_reason(self) -> str | None:
         """Return a user-facing reason an auction cannot be posted, if known."""
@@ -63,11 +81,7 @@ class AuctionManager:
             return "An auction is already active."
 
         queue = await self.config.queue()
-        available_pool = [
-            character_id
-            for character_id in self.cog.characters.all_ids()
-            if not self.cog.characters.owned(character_id)
-        ]
+        available_pool = self.cog.characters.unowned
         valid_queue_entries = [
             entry
             for entry in queue
@@ -118,35 +132,184 @@ class AuctionManager:
         if not await self.is_active_runner():
             return False
         await self.config.current_auction.set(state)
+        previous_key = self._auction_key(self._live)
+        self._live = copy.deepcopy(state) if state else None
+        self._live_loaded = True
+        if self._auction_key(self._live) != previous_key:
+            self._eligibility.clear()
+            if self._live:
+                self.renderer.reset()
+        await self.schedule_auction(state)
         return True
 
+    @staticmethod
+    def _auction_key(state: dict[str, Any] | None) -> tuple[Any, Any] | None:
+        """Identify one auction instance by its character and start time."""
+        if not state:
+            return None
+        return state.get("character_id"), state.get("started_at")
+
+    async def live_state(self) -> dict[str, Any] | None:
+        """Return the in-memory auction snapshot; callers must not modify it."""
+        if not self._live_loaded:
+            self._live = await self.config.current_auction() or None
+            self._live_loaded = True
+        return self._live
+
+    async def is_running(self) -> bool:
+        """Return whether automatic auctions are enabled, from memory after the first read."""
+        if self._running is None:
+            self._running = bool(await self.config.auction_running())
+        return self._running
+
     async def background_loop(self):
-        """Background loop that owns automatic auction scheduling."""
+        """Background loop that sleeps until the next scheduled auction, offer, debt, or tax deadline."""
         await self.cog.bot.wait_until_ready()
 
+        jobs = {
+            "recollection": (self.cog.notify_recollection_due, self.schedule_recollection),
+            "taxes": (self.cog.collect_daily_taxes, self.schedule_taxes),
+            "offers": (self._expire_offers, self.schedule_offers),
+            "auction": (self._tick, self.schedule_auction),
+        }
+        await self.refresh_schedule()
+        last_resync = utc_timestamp()
+
         while True:
-            await asyncio.sleep(1)
+            due = await self.scheduler.wait(SCHEDULER_HEARTBEAT_SECONDS)
 
             try:
                 if not await self.is_active_runner():
                     return
-                await self.cog.notify_recollection_due()
-                await self.cog.collect_daily_taxes()
-                await self._tick()
+                if utc_timestamp() - last_resync >= SCHEDULER_HEARTBEAT_SECONDS:
+                    # Heal any deadline a missed hook left stale.
+                    await self.refresh_schedule()
+                    last_resync = utc_timestamp()
             except asyncio.CancelledError:
                 raise
             except Exception:
-                # A single bad tick must never kill the whole scheduling loop.
-                log.exception("Unhandled error in OPAuction background loop tick")
+                log.exception("Unhandled error in OPAuction scheduler resync")
+
+            # Run due jobs in the same order the old polling tick used.
+            for key in sorted(due, key=list(jobs).index):
+                run, reschedule = jobs[key]
+                try:
+                    await run()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # A single bad job must never kill the whole scheduling loop.
+                    log.exception("Unhandled error in OPAuction scheduled %s job", key)
+                finally:
+                    await self._reschedule_after_run(key, reschedule)
+
+    async def _reschedule_after_run(self, key: str, reschedule) -> None:
+        """Recompute a job's deadline, backing off when it is still already due."""
+        try:
+            await reschedule()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Unable to reschedule OPAuction %s job", key)
+            self.scheduler.schedule(key, utc_timestamp() + SCHEDULER_RETRY_SECONDS)
+            return
+
+        deadline = self.scheduler.deadline(key)
+        if deadline is not None and deadline <= utc_timestamp():
+            self.scheduler.schedule(key, utc_timestamp() + SCHEDULER_RETRY_SECONDS)
+
+    async def refresh_schedule(self) -> None:
+        """Rebuild every scheduler deadline from stored state."""
+        await self.schedule_auction()
+        await self.schedule_offers()
+        await self.schedule_taxes()
+        await self.schedule_recollection()
+
+    async def schedule_auction(self, state: dict[str, Any] | None = None) -> None:
+        """Point the scheduler at the next countdown stage, close, or automatic start.
+
+        A live ``state`` passed from a write needs no Config reads, which keeps
+        the bid path free of extra I/O; ``stop`` cancels the deadline instead.
+        """
+        if state is None:
+            if not await self.is_running():
+                self.scheduler.cancel("auction")
+                return
+            state = await self.get_current_auction()
+        elif not state and not await self.is_running():
+            self.scheduler.cancel("auction")
+            return
+
+        if state:
+            self.scheduler.schedule("auction", self._next_auction_event(state))
+            return
+
+        last_started = int(await self.config.last_auction_started() or 0)
+        if not last_started:
+            self.scheduler.schedule("auction", utc_timestamp())
+            return
+        interval = int(await self.config.auction_interval())
+        self.scheduler.schedule("auction", last_started + interval)
+
+    @staticmethod
+    def _next_auction_event(state: dict[str, Any]) -> int:
+        """Return the earliest timestamp at which ``_tick`` has work for a live auction."""
+        started_at = int(state.get("started_at", 0) or 0)
+        ends_at = int(state.get("ends_at", started_at + 1) or 0)
+        has_bid = bool(state.get("highest_bidder_id"))
+        base = int(state.get("last_bid_time", started_at) or started_at) if has_bid else started_at
+        close_after = GOING_THREE_SECONDS if has_bid else NO_BID_CLOSE_SECONDS
+
+        candidates = [ends_at, base + close_after]
+        stages = (
+            (GOING_ONCE_SECONDS, "going_once_issued"),
+            (GOING_TWICE_SECONDS, "going_twice_issued"),
+            (GOING_THREE_SECONDS, "going_three_issued"),
+        )
+        candidates.extend(base + threshold for threshold, flag in stages if not state.get(flag))
+        return min(candidates)
+
+    async def schedule_offers(self) -> None:
+        """Schedule the earliest pending trade or loan offer expiry."""
+        created = [
+            int(offer.get("created_at", 0) or 0)
+            for pending in (await self.config.pending_loans(), await self.config.pending_trades())
+            for offer in pending.values()
+        ]
+        if not created:
+            self.scheduler.cancel("offers")
+            return
+        self.scheduler.schedule("offers", min(created) + OFFER_TIMEOUT_SECONDS)
+
+    def schedule_offer_expiry(self, created_at: int) -> None:
+        """Make sure a newly posted offer expires on time."""
+        self.scheduler.schedule("offers", created_at + OFFER_TIMEOUT_SECONDS, keep_earlier=True)
+
+    async def schedule_recollection(self) -> None:
+        """Schedule the earliest unnotified debt grace-period expiry from the debt index."""
+        due_at = self.cog.debts.next_due()
+        if due_at is None:
+            self.scheduler.cancel("recollection")
+            return
+        self.scheduler.schedule("recollection", due_at)
+
+    async def schedule_taxes(self) -> None:
+        """Schedule the next daily tax collection while taxes are enabled."""
+        if not await self.config.tax_running() or float(await self.config.tax_rate() or 0) <= 0:
+            self.scheduler.cancel("taxes")
+            return
+        last_collected = int(await self.config.tax_last_collected() or 0)
+        self.scheduler.schedule("taxes", last_collected + TAX_INTERVAL_SECONDS)
+
+    async def _expire_offers(self) -> None:
+        await self.cog.expire_pending_offers(OFFER_TIMEOUT_SECONDS)
 
     async def _tick(self) -> None:
         """Run one iteration of the auction scheduling/countdown logic."""
         if not await self.is_active_runner():
             return
 
-        await self.cog.expire_pending_offers(OFFER_TIMEOUT_SECONDS)
-
-        if not await self.config.auction_running():
+        if not await self.is_running():
             return
 
         current = await self.get_current_auction()
@@ -212,18 +375,18 @@ class AuctionManager:
                 stored_current[flag] = True
                 if not await self._write_current_auction(stored_current):
                     return
-                await self.update_current_embed(stored_current)
+                self.renderer.request()
 
     async def bump_current_embed(self) -> None:
         """Repost the active auction display after a new human channel message."""
-        async with self._state_lock:
-            state = await self.get_current_auction()
-            if state:
-                await self.update_current_embed(state)
+        if await self.live_state():
+            self.renderer.request()
 
     async def begin(self) -> bool:
         """Start the automatic auction loop and immediately post a live auction when possible."""
         await self.config.auction_running.set(True)
+        self._running = True
+        await self.schedule_auction()
 
         current = await self.get_current_auction()
         if current:
@@ -262,12 +425,14 @@ class AuctionManager:
     async def stop(self) -> None:
         """Stop the automatic loop and leave any active auction intact."""
         await self.config.auction_running.set(False)
+        self._running = False
+        self.scheduler.cancel("auction")
 
     async def status(self) -> dict[str, Any]:
         """Return a small status snapshot for command use."""
         current = await self.get_current_auction()
         return {
-            "running": await self.config.auction_running(),
+            "running": await self.is_running(),
             "channel": await self.config.auction_channel(),
             "duration": await self.config.auction_duration(),
             "interval": await self.config.auction_interval(),
@@ -315,7 +480,7 @@ class AuctionManager:
         character: dict[str, Any] | None = None
         from_queue = False
         queue_entry = queue[0] if queue else None
-        available_pool = [cid for cid in self.cog.characters.all_ids() if not self.cog.characters.owned(cid)]
+        available_pool = self.cog.characters.unowned
 
         if forced_source == "pool" and forced_character_id:
             forced_character_id = int(forced_character_id)
@@ -323,7 +488,7 @@ class AuctionManager:
                 character = self.cog.characters.get(forced_character_id)
 
         if forced_source == "pool" and not character and available_pool:
-            character = self._choose_pool_character(available_pool)
+            character = self._choose_pool_character()
 
         if not character and last_source != "queue" and queue_entry:
             queued_character_id = int(queue[0]["character_id"])
@@ -331,10 +496,10 @@ class AuctionManager:
             from_queue = character is not None
 
         if not character and last_source != "pool" and available_pool:
-            character = self._choose_pool_character(available_pool)
+            character = self._choose_pool_character()
 
         if not character and available_pool:
-            character = self._choose_pool_character(available_pool)
+            character = self._choose_pool_character()
 
         if not character and queue_entry:
             queued_character_id = int(queue[0]["character_id"])
@@ -437,22 +602,19 @@ class AuctionManager:
         await self.config.last_auction_started.set(utc_timestamp())
         return True
 
-    def _choose_pool_character(self, character_ids: list[int]) -> dict[str, Any] | None:
+    def _choose_pool_character(self) -> dict[str, Any] | None:
         """Choose an unowned character using rarity-weighted odds."""
-        characters = [self.cog.characters.get(character_id) for character_id in character_ids]
-        characters = [character for character in characters if character]
-        if not characters:
+        character_id = self.cog.characters.unowned.weighted_choice()
+        if character_id is None:
             return None
-
-        weights = [RARITY_WEIGHTS.get(str(character.get("rarity", "normal")).lower(), 60) for character in characters]
-        return random.choices(characters, weights=weights, k=1)[0]
+        return self.cog.characters.get(character_id)
 
     async def get_current_auction(self) -> dict[str, Any] | None:
-        """Return the active auction configuration dictionary."""
-        current = await self.config.current_auction()
+        """Return a private copy of the active auction configuration dictionary."""
+        current = await self.live_state()
         if not current:
             return None
-        return current
+        return copy.deepcopy(current)
 
     async def resolve_channel(self, channel_id: int) -> discord.TextChannel | None:
         """Resolve a configured channel from cache or fetch it from Discord when needed."""
@@ -493,84 +655,133 @@ class AuctionManager:
             return None
         return await self.resolve_channel(int(channel_id))
 
+    def invalidate_bidder(self, user_id: int | None = None) -> None:
+        """Forget precomputed bid eligibility after an account, debt, or collection change."""
+        if user_id is None:
+            self._eligibility.clear()
+        else:
+            self._eligibility.pop(user_id, None)
+
+    async def _bidder_eligibility(self, bidder_id: int, character_id: int) -> tuple[str | None, bool]:
+        """Return ``(blocking reply, owns character)`` for a bidder in the live auction.
+
+        Results are kept for the rest of the auction until the bidder's account
+        or debt changes, or until an outstanding loan's grace period runs out.
+        """
+        now = utc_timestamp()
+        cached = self._eligibility.get(bidder_id)
+        if cached and now < cached[2]:
+            return cached[0], cached[1]
+
+        reason = None
+        valid_until = float("inf")
+        if not await self.cog.economy.exists(bidder_id):
+            reason = "Use `.auction start` before bidding."
+        elif await self.cog.debt_is_overdue(bidder_id):
+            reason = "Your loan is overdue. Repay it before bidding again."
+        elif self.cog.debts.started_at(bidder_id):
+            valid_until = self.cog.debts.started_at(bidder_id) + LOAN_GRACE_PERIOD_SECONDS
+        owns = character_id in await self.cog.economy.get_characters(bidder_id)
+
+        self._eligibility[bidder_id] = (reason, owns, valid_until)
+        return reason, owns
+
     async def handle_bid(self, message: discord.Message) -> bool:
-        """Handle a numeric bid sent in the configured auction channel."""
+        """Handle a numeric bid sent in the configured auction channel.
+
+        Checks that only depend on the message, the bidder, and the in-memory
+        auction snapshot run without the state lock. The lock is held only to
+        re-check the contested fields and commit the bid.
+        """
+        received = time.perf_counter()
+        prevalidated = await self._prevalidate_bid(message)
+        if prevalidated is None:
+            return False
+
+        bid, auction_key = prevalidated
         async with self._state_lock:
             if not await self.is_active_runner():
                 return False
-            return await self._handle_bid(message)
+            accepted, rejection = await self._commit_bid(message, bid, auction_key)
+
+        if rejection:
+            await message.reply(rejection)
+        if accepted:
+            log.debug(
+                "Accepted bid of %s from %s in %.1f ms",
+                bid,
+                message.author.id,
+                (time.perf_counter() - received) * 1000,
+            )
+        return accepted
 
-    async def _handle_bid(self, message: discord.Message) -> bool:
-        """Validate and commit a bid while auction settlement is paused."""
+    async def _prevalidate_bid(self, message: discord.Message) -> tuple[int, tuple[Any, Any]] | None:
+        """Reject bids that no concurrent bid could make valid, without taking the state lock."""
         if message.author.bot:
-            return False
+            return None
 
-        if not await self.config.auction_running():
+        if not await self.is_running():
             await message.reply("Auctions are not currently running.")
-            return False
+            return None
 
-        state = await self.get_current_auction()
+        state = await self.live_state()
         if not state:
             await message.reply("There is no active auction to bid on.")
-            return False
+            return None
 
         if message.channel.id != state.get("channel_id"):
-            return False
+            return None
 
         if not message.content or not message.content.strip().isdigit():
-            return False
+            return None
 
         bid = int(message.content.strip())
         bidder_id = message.author.id
+        character_id = int(state.get("character_id", 0))
 
-        if not await self.cog.economy.exists(bidder_id):
-            await message.reply("Use `.auction start` before bidding.")
-            return False
-
-        if await self.cog.debt_is_overdue(bidder_id):
-            await message.reply("Your loan is overdue. Repay it before bidding again.")
-            return False
+        blocked, owns_character = await self._bidder_eligibility(bidder_id, character_id)
+        if blocked:
+            await message.reply(blocked)
+            return None
 
         if utc_timestamp() >= int(state.get("ends_at", 0)):
             await message.reply("This auction has already ended.")
-            return False
-
-        character_id = int(state.get("character_id", 0))
+            return None
 
+        rejection = None
         if bidder_id == state.get("seller_id"):
-            await self.count_invalid_bid(state, bidder_id)
-            await message.reply("You cannot bid on your own character.")
-            return False
+            rejection = "You cannot bid on your own character."
+        elif owns_character or self.cog.characters.owner_of(character_id) == bidder_id:
+            rejection = "You already own this character."
+        elif bid < 1:
+            rejection = "Bids must be at least ฿1."
+
+        if rejection:
+            async with self._state_lock:
+                live = self._live
+                if live and self._auction_key(live) == self._auction_key(state):
+                    await self.count_invalid_bid(copy.deepcopy(live), bidder_id)
+            await message.reply(rejection)
+            return None
 
-        owner = self.cog.characters.owner_of(character_id)
-        if owner == bidder_id:
-            await self.count_invalid_bid(state, bidder_id)
-            await message.reply("You already own this character.")
-            return False
+        return bid, self._auction_key(state)
 
-        if bidder_id == state.get("highest_bidder_id"):
-            await self.count_invalid_bid(state, bidder_id)
-            await message.reply("You are already the highest bidder.")
-            return False
-
-        if len(await self.cog.economy.get_characters(bidder_id)):
-            if character_id in await self.cog.economy.get_characters(bidder_id):
-                await self.count_invalid_bid(state, bidder_id)
-                await message.reply("You already own this character.")
-                return False
+    async def _commit_bid(
+        self, message: discord.Message, bid: int, auction_key: tuple[Any, Any]
+    ) -> tuple[bool, str | None]:
+        """Validate contested fields against the live state and commit the bid.
 
-        if not await self.cog.economy.available_balance(bidder_id) >= bid:
-            await self.count_invalid_bid(state, bidder_id)
-            available = await self.cog.economy.available_balance(bidder_id)
-            await message.reply(
-                f"You need {format_berries(bid)} but only have {format_berries(available)} available."
-            )
-            return False
+        Returns whether the bid was accepted and the reply to send once the
+        state lock has been released.
+        """
+        live = self._live
+        if not await self.is_running() or not live or self._auction_key(live) != auction_key:
+            return False, "This auction has already ended."
 
-        if bid < 1:
-            await self.count_invalid_bid(state, bidder_id)
-            await message.reply("Bids must be at least ฿1.")
-            return False
+        state = copy.deepcopy(live)
+        bidder_id = message.author.id
+        if utc_timestamp() >= int(state.get("ends_at", 0)):
+            return False, "This auction has already ended."
 
         current_bid = int(state.get("bid", 1))
         minimum_acceptable = (
@@ -578,24 +789,29 @@ class AuctionManager:
             if state.get("highest_bidder_id") is None
             else current_bid + MINIMUM_BID_INCREMENT
         )
-        if bid < minimum_acceptable:
-            await self.count_invalid_bid(state, bidder_id)
-            await message.reply(f"The minimum valid bid is {format_berries(minimum_acceptable)}.")
-            return False
-
-        last_bid_at = state.get("last_bid_at", {})
+        last_bid_at = state.setdefault("last_bid_at", {})
         last_bid_key = str(bidder_id)
-        if last_bid_key in last_bid_at:
-            elapsed = utc_timestamp() - int(last_bid_at.get(last_bid_key, 0))
-            if elapsed < BID_COOLDOWN:
-                await self.count_invalid_bid(state, bidder_id)
-                await message.reply("You are bidding too quickly. Please wait a moment.")
-                return False
 
-        if not await self.cog.economy.reserve(bidder_id, bid):
+        rejection = None
+        if bidder_id == state.get("highest_bidder_id"):
+            rejection = "You are already the highest bidder."
+        else:
+            available = await self.cog.economy.available_balance(bidder_id, state=state)
+            if available < bid:
+                rejection = f"You need {format_berries(bid)} but only have {format_berries(available)} available."
+            elif bid < minimum_acceptable:
+                rejection = f"The minimum valid bid is {format_berries(minimum_acceptable)}."
+            elif (
+                last_bid_key in last_bid_at
+                and utc_timestamp() - int(last_bid_at.get(last_bid_key, 0)) < BID_COOLDOWN
+            ):
+                rejection = "You are bidding too quickly. Please wait a moment."
+            elif not await self.cog.economy.reserve(bidder_id, bid, state=state):
+                rejection = "You do not have enough available beri for that bid."
+
+        if rejection:
             await self.count_invalid_bid(state, bidder_id)
-            await message.reply("You do not have enough available beri for that bid.")
-            return False
+            return False, rejection
 
         old_highest = state.get("highest_bidder_id")
         if old_highest and old_highest != bidder_id:
@@ -605,7 +821,7 @@ class AuctionManager:
         state["highest_bidder_id"] = bidder_id
         bid_time = utc_timestamp()
         state["last_bid_time"] = bid_time
-        state["last_bid_at"][last_bid_key] = bid_time
+        last_bid_at[last_bid_key] = bid_time
         state["going_once_issued"] = False
         state["going_twice_issued"] = False
         state["going_three_issued"] = False
@@ -615,10 +831,10 @@ class AuctionManager:
         state["ends_at"] = bid_time + GOING_THREE_SECONDS
 
         if not await self._write_current_auction(state):
-            return False
-        await self.update_current_embed(state)
+            return False, None
+        self.renderer.request()
 
-        return True
+        return True, None
 
     async def count_invalid_bid(self, state: dict[str, Any], user_id: int) -> None:
         """Track invalid bid attempts without locking the user out of the auction."""
@@ -626,10 +842,17 @@ class AuctionManager:
         invalids[str(user_id)] = int(invalids.get(str(user_id), 0)) + 1
         await self._write_current_auction(state)
 
-    async def update_current_embed(self, state: dict[str, Any]) -> None:
-        """Repost the live embed so the active auction remains channel-bottom."""
+    async def update_current_embed(self) -> None:
+        """Repost the live embed so the active auction remains channel-bottom.
+
+        Runs from the embed renderer. The Discord calls happen outside the
+        state lock, which is taken only to record the new message ID.
+        """
+        state = await self.get_current_auction()
+        if not state:
+            return
+
         channel_id = state.get("channel_id")
-        message_id = state.get("message_id")
         if not channel_id:
             return
 
@@ -664,10 +887,17 @@ class AuctionManager:
         except (discord.Forbidden, discord.HTTPException, discord.NotFound):
             return
 
-        previous_message_id = state.get("message_id")
-        state["message_id"] = replacement.id
-        if not await self._write_current_auction(state):
-            return
+        async with self._state_lock:
+            live = self._live
+            if live and self._auction_key(live) == self._auction_key(state):
+                previous_message_id = live.get("message_id")
+                updated = copy.deepcopy(live)
+                updated["message_id"] = replacement.id
+                if not await self._write_current_auction(updated):
+                    previous_message_id = replacement.id
+            else:
+                # The auction closed while this repost was in flight.
+                previous_message_id = replacement.id
 
         if not previous_message_id:
             return
@@ -679,6 +909,8 @@ class AuctionManager:
 
     async def finish_auction(self) -> None:
         """End the current auction, transfer money, and deliver any settlement embeds."""
+        # Draw the last accepted bid before settlement edits the live message.
+        await self.renderer.flush()
         async with self._state_lock:
             if not await self.is_active_runner():
                 return
@@ -798,6 +1030,15 @@ class AuctionManager:
             # Always clear, even on error: an uncleared auction would otherwise
             # re-run this settlement (and re-charge the winner) every tick forever.
             await self.clear_current_auction()
+            if self.renderer.requested:
+                log.info(
+                    "OPAuction live embed for character %s: %s update(s) drawn in %s edit(s), %s saved",
+                    character_id,
+                    self.renderer.requested,
+                    self.renderer.rendered,
+                    self.renderer.saved,
+                )
+            self.renderer.reset()
 
     async def _record_fee(self, amount: int) -> None:
         """Add to the running total of 5% fees skimmed from queue sales."""
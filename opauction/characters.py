@@ -1,8 +1,175 @@
 from __future__ import annotations
 
+import difflib
 import json
+import random
+from collections import Counter
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
+
+from .constants import RARITY_WEIGHTS
+
+# Weight used for characters whose rarity is missing from RARITY_WEIGHTS.
+DEFAULT_RARITY_WEIGHT = 60
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case a name and collapse its whitespace for lookups."""
+    return " ".join(str(name).lower().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+class NameIndex:
+    """Lookup tables over roster names, kept in step with the roster.
+
+    ``full`` maps a normalized name to its first character ID, ``tokens`` maps
+    each word to the IDs whose names contain it, and ``trigrams`` narrows
+    partial searches to names sharing every three-letter run of the query.
+    """
+
+    # Fuzzy suggestions below this difflib ratio are treated as unrelated names.
+    FUZZY_CUTOFF = 0.6
+
+    def __init__(self):
+        self.names: dict[int, str] = {}
+        self.order: dict[int, int] = {}
+        self.full: dict[str, int] = {}
+        self.tokens: dict[str, list[int]] = {}
+        self.trigrams: dict[str, set[int]] = {}
+
+    def rebuild(self, characters: Iterable[dict]) -> None:
+        self.names.clear()
+        self.order.clear()
+        self.full.clear()
+        self.tokens.clear()
+        self.trigrams.clear()
+        for character in characters:
+            self.add(int(character["id"]), character["name"])
+
+    def add(self, character_id: int, name: str) -> None:
+        key = normalize_name(name)
+        self.names[character_id] = key
+        self.order[character_id] = len(self.order)
+        self.full.setdefault(key, character_id)
+        for token in set(key.split()):
+            self.tokens.setdefault(token, []).append(character_id)
+        for gram in _trigrams(key):
+            self.trigrams.setdefault(gram, set()).add(character_id)
+
+    def exact(self, key: str) -> Optional[int]:
+        return self.full.get(key)
+
+    def with_token(self, key: str) -> list[int]:
+        return self.tokens.get(key, [])
+
+    def containing(self, key: str) -> list[int]:
+        """Return IDs whose normalized name contains ``key``, in roster order."""
+        grams = _trigrams(key)
+        if grams:
+            postings = sorted((self.trigrams.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            candidates = self.names.keys()
+        return sorted(
+            (character_id for character_id in candidates if key in self.names[character_id]),
+            key=self.order.__getitem__,
+        )
+
+    def similar(self, key: str, limit: int = 5) -> list[int]:
+        """Return up to ``limit`` IDs with names close to ``key``, best match first."""
+        grams = _trigrams(key)
+        if grams:
+            shared = Counter(
+                character_id for gram in grams for character_id in self.trigrams.get(gram, ())
+            )
+            candidates = [character_id for character_id, _ in shared.most_common(limit * 10)]
+        else:
+            candidates = list(self.names)
+
+        scored = []
+        for character_id in candidates:
+            # Score against each word as well, so a misspelt first or last name still ranks.
+            name = self.names[character_id]
+            ratio = max(
+                difflib.SequenceMatcher(None, key, part).ratio()
+                for part in [name, *name.split()]
+            )
+            if ratio >= self.FUZZY_CUTOFF:
+                scored.append((-ratio, self.order[character_id], character_id))
+        scored.sort()
+        return [character_id for _, _, character_id in scored[:limit]]
+
+
+class UnownedPool:
+    """Set of unowned character IDs with constant-time removal and sampling.
+
+    IDs live in an indexable list per rarity; ``_slots`` records each ID's
+    rarity and position so a removal swaps the last entry into the hole.
+    Weighted sampling picks a rarity bucket by ``weight * size`` and then an
+    ID uniformly within it, which matches per-character rarity weights.
+    """
+
+    def __init__(self):
+        self._buckets: dict[str, list[int]] = {}
+        self._slots: dict[int, tuple[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, character_id: object) -> bool:
+        return character_id in self._slots
+
+    def ids(self) -> list[int]:
+        return list(self._slots)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._slots.clear()
+
+    def add(self, character_id: int, rarity: str) -> None:
+        if character_id in self._slots:
+            return
+        bucket = self._buckets.setdefault(rarity, [])
+        self._slots[character_id] = (rarity, len(bucket))
+        bucket.append(character_id)
+
+    def discard(self, character_id: int) -> None:
+        slot = self._slots.pop(character_id, None)
+        if slot is None:
+            return
+        rarity, index = slot
+        bucket = self._buckets[rarity]
+        last = bucket.pop()
+        if last != character_id:
+            bucket[index] = last
+            self._slots[last] = (rarity, index)
+
+    def choice(self) -> Optional[int]:
+        """Return a uniformly random unowned ID."""
+        if not self._slots:
+            return None
+        index = random.randrange(len(self._slots))
+        for bucket in self._buckets.values():
+            if index < len(bucket):
+                return bucket[index]
+            index -= len(bucket)
+        return None
+
+    def weighted_choice(self) -> Optional[int]:
+        """Return a random unowned ID using rarity-weighted odds."""
+        buckets = [bucket for bucket in self._buckets.values() if bucket]
+        if not buckets:
+            return None
+        rarities = [rarity for rarity, bucket in self._buckets.items() if bucket]
+        weights = [
+            RARITY_WEIGHTS.get(rarity, DEFAULT_RARITY_WEIGHT) * len(bucket)
+            for rarity, bucket in zip(rarities, buckets)
+        ]
+        bucket = random.choices(buckets, weights=weights, k=1)[0]
+        return random.choice(bucket)
 
 
 class CharacterManager:
@@ -12,6 +179,8 @@ class CharacterManager:
         self.cog = cog
         self.characters: dict[int, dict] = {}
         self.owners: dict[int, int] = {}
+        self.names = NameIndex()
+        self.unowned = UnownedPool()
 
         self.load()
 
@@ -30,6 +199,8 @@ class CharacterManager:
 
         if not path.exists():
             self.characters = {}
+            self.names.rebuild([])
+            self.unowned.clear()
             path.parent.mkdir(parents=True, exist_ok=True)
             path.write_text("[]", encoding="utf-8")
             return
@@ -60,6 +231,8 @@ class CharacterManager:
             }
 
         self.characters = imported
+        self.names.rebuild(imported.values())
+        self._rebuild_unowned()
         return True
 
     def save(self):
@@ -94,7 +267,7 @@ class CharacterManager:
         if not normalized_name:
             return None
 
-        if any(entry.get("name", "").lower() == normalized_name.lower() for entry in self.characters.values()):
+        if self.names.exact(normalize_name(normalized_name)) is not None:
             return None
 
         next_id = 1
@@ -110,6 +283,8 @@ class CharacterManager:
         }
 
         self.characters[next_id] = character
+        self.names.add(next_id, normalized_name)
+        self._rebuild_unowned_entry(next_id)
         self.save()
         return character
 
@@ -119,6 +294,8 @@ class CharacterManager:
             return False
         removed = self.characters.pop(character_id)
         self.owners.pop(character_id, None)
+        self.unowned.discard(character_id)
+        self.names.rebuild(self.characters.values())
         self.save()
         return removed is not None
 
@@ -130,26 +307,21 @@ class CharacterManager:
         return self.characters.get(character_id)
 
     def get_by_name(self, name: str) -> Optional[dict]:
-        name = " ".join(name.lower().split())
+        """Resolve a full name, a unique word, or a unique partial name to a character."""
+        name = normalize_name(name)
+        if not name:
+            return None
 
-        for character in self.characters.values():
-            if character["name"].lower() == name:
-                return character
+        character_id = self.names.exact(name)
+        if character_id is not None:
+            return self.characters[character_id]
 
-        matches = [
-            character
-            for character in self.characters.values()
-            if name in character["name"].lower().split()
-        ]
+        matches = self.names.with_token(name)
         if len(matches) == 1:
-            return matches[0]
+            return self.characters[matches[0]]
 
-        matches = [
-            character
-            for character in self.characters.values()
-            if name in character["name"].lower()
-        ]
-        return matches[0] if len(matches) == 1 else None
+        matches = self.names.containing(name)
+        return self.characters[matches[0]] if len(matches) == 1 else None
 
     def exists(self, character_id: int) -> bool:
         return character_id in self.characters
@@ -177,6 +349,8 @@ class CharacterManager:
             for character_id in data.get("characters", []):
                 self.owners[int(character_id)] = int(user_id)
 
+        self._rebuild_unowned()
+
     def owner_of(self, character_id: int) -> Optional[int]:
         return self.owners.get(character_id)
 
@@ -185,9 +359,23 @@ class CharacterManager:
 
     def assign(self, character_id: int, user_id: int):
         self.owners[character_id] = user_id
+        self.unowned.discard(character_id)
 
     def unassign(self, character_id: int):
         self.owners.pop(character_id, None)
+        self._rebuild_unowned_entry(character_id)
+
+    def _rebuild_unowned(self):
+        self.unowned.clear()
+        for character_id in self.characters:
+            self._rebuild_unowned_entry(character_id)
+
+    def _rebuild_unowned_entry(self, character_id: int):
+        """Put one roster character in the pool if nobody owns it."""
+        character = self.characters.get(character_id)
+        if character is None or character_id in self.owners:
+            return
+        self.unowned.add(character_id, str(character.get("rarity", "normal")).lower())
 
     # -----------------------
     # Pool
@@ -196,40 +384,28 @@ class CharacterManager:
     async def available_pool(self) -> list[int]:
         """Return IDs of characters that have never been claimed."""
 
-        available = []
-
-        for character_id in self.characters:
-            if character_id not in self.owners:
-                available.append(character_id)
-
-        return available
-
-    async def random_pool_character(self) -> Optional[dict]:
-        """Return a random unowned character."""
+        return self.unowned.ids()
 
-        import random
+    async def random_pool_character(self, *, weighted: bool = False) -> Optional[dict]:
+        """Return a random unowned character, optionally using rarity-weighted odds."""
 
-        pool = await self.available_pool()
+        character_id = self.unowned.weighted_choice() if weighted else self.unowned.choice()
 
-        if not pool:
+        if character_id is None:
             return None
 
-        return self.characters[random.choice(pool)]
+        return self.characters[character_id]
 
     # -----------------------
     # Searching
     # -----------------------
 
     def search(self, text: str) -> list[dict]:
-        """Simple partial search."""
-
-        text = text.lower()
-
-        results = []
-
-        for character in self.characters.values():
+        """Partial search, falling back to the closest names when nothing contains the text."""
 
-            if text in character["name"].lower():
-                results.append(character)
+        text = normalize_name(text)
+        if not text:
+            return self.all()
 
-        return results
\ No newline at end of file
+        matches = self.names.containing(text) or self.names.similar(text)
+        return [self.characters[character_id] for character_id in matches]
\ No newline at end of file
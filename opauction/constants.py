@@ -24,6 +24,14 @@ GOING_ONCE_SECONDS = 5
 GOING_TWICE_SECONDS = 10
 GOING_THREE_SECONDS = 15
 NO_BID_CLOSE_SECONDS = 15
+EMBED_UPDATE_INTERVAL = 2  # minimum seconds between live embed reposts
+
+#
+# Background scheduler
+#
+
+SCHEDULER_RETRY_SECONDS = 5  # delay before retrying a job that is still due
+SCHEDULER_HEARTBEAT_SECONDS = 60  # lease check and deadline resync interval
 
 #
 # Anti Troll
@@ -47,6 +55,14 @@ AUCTION_TAX = 0.05  # 5%
 LOAN_INTEREST_RATE = 0.25  # 25%
 LOAN_GRACE_PERIOD_SECONDS = 48 * 60 * 60
 OFFER_TIMEOUT_SECONDS = 60
+TAX_INTERVAL_SECONDS = 24 * 60 * 60
+
+#
+# Transaction history
+#
+
+TRANSACTION_HISTORY_LIMIT = 1000  # entries kept in Config before archiving
+HISTORY_ARCHIVE_BATCH = 100  # overflow moved to disk in one write
 
 #
 # Minigames (pray / steal)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any
+
+from .constants import LOAN_GRACE_PERIOD_SECONDS
+
+
+class DebtIndex:
+    """In-memory index of outstanding loans keyed by grace-period expiry.
+
+    ``_loans`` mirrors each debtor's stored ``debt`` and ``debt_started_at``.
+    ``_due`` holds the expiry of every loan whose recollection notice has not
+    been sent yet, with ``_heap`` ordering those expiries; heap entries that no
+    longer match ``_due`` are stale and skipped lazily.
+    """
+
+    def __init__(self):
+        self._loans: dict[int, tuple[int, int]] = {}
+        self._due: dict[int, int] = {}
+        self._heap: list[tuple[int, int]] = []
+
+    def rebuild(self, users: dict[Any, dict]) -> None:
+        """Rebuild the index from a Config ``all_users`` snapshot."""
+        self._loans.clear()
+        self._due.clear()
+        self._heap.clear()
+        for user_id, data in users.items():
+            self.set(
+                int(user_id),
+                int(data.get("debt", 0) or 0),
+                int(data.get("debt_started_at", 0) or 0),
+                notified=bool(data.get("debt_recollection_notified", False)),
+            )
+
+    def set(self, user_id: int, debt: int, started_at: int, *, notified: bool = False) -> None:
+        """Record a member's current debt; a zero debt removes them from the index."""
+        self._due.pop(user_id, None)
+        if debt <= 0:
+            self._loans.pop(user_id, None)
+            return
+
+        self._loans[user_id] = (debt, started_at)
+        if started_at and not notified:
+            due_at = started_at + LOAN_GRACE_PERIOD_SECONDS
+            self._due[user_id] = due_at
+            heapq.heappush(self._heap, (due_at, user_id))
+
+    def update_debt(self, user_id: int, debt: int) -> None:
+        """Change the amount owed on an existing loan without touching its notice state."""
+        if debt <= 0:
+            self.discard(user_id)
+            return
+        self._loans[user_id] = (debt, self.started_at(user_id))
+
+    def discard(self, user_id: int) -> None:
+        self.set(user_id, 0, 0)
+
+    def debt_of(self, user_id: int) -> int:
+        return self._loans.get(user_id, (0, 0))[0]
+
+    def started_at(self, user_id: int) -> int:
+        return self._loans.get(user_id, (0, 0))[1]
+
+    def is_overdue(self, user_id: int, now: int) -> bool:
+        """Return whether a member's loan has passed its grace period."""
+        debt, started_at = self._loans.get(user_id, (0, 0))
+        return debt > 0 and started_at > 0 and now - started_at >= LOAN_GRACE_PERIOD_SECONDS
+
+    def overdue(self, now: int) -> list[tuple[int, int]]:
+        """Return ``(user_id, debt)`` for every loan past its grace period."""
+        return [
+            (user_id, debt)
+            for user_id, (debt, _) in self._loans.items()
+            if self.is_overdue(user_id, now)
+        ]
+
+    def next_due(self) -> int | None:
+        """Return the earliest grace-period expiry still awaiting a notice."""
+        while self._heap:
+            due_at, user_id = self._heap[0]
+            if self._due.get(user_id) == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: int) -> list[tuple[int, int]]:
+        """Remove and return ``(user_id, debt)`` for loans whose grace period has ended."""
+        entries = []
+        while True:
+            due_at = self.next_due()
+            if due_at is None or due_at > now:
+                return entries
+            _, user_id = heapq.heappop(self._heap)
+            del self._due[user_id]
+            entries.append((user_id, self._loans[user_id][0]))
+
+    def requeue(self, user_ids: list[int]) -> None:
+        """Return popped loans to the pending set after a notice failed to send."""
+        for user_id in user_ids:
+            debt, started_at = self._loans.get(user_id, (0, 0))
+            self.set(user_id, debt, started_at)
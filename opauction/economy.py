@@ -1,27 +1,91 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from redbot.core import Config
 
 from .utils import utc_timestamp
 
 
-_ACCOUNT_LOCK = asyncio.Lock()
+# Shared by every loaded Economy instance, like the auction locks, so a cog
+# reload cannot run two writers for one account at the same time.
+_ACCOUNT_LOCKS: dict[int, asyncio.Lock] = {}
+
+# Account fields served from the in-memory cache; everything else on the
+# user record is read from Config directly.
+_CACHED_FIELDS = ("started", "balance", "reserved", "characters", "last_daily")
 
 
 class Economy:
-    """Handles player economy."""
+    """Handles player economy.
+
+    Accounts are cached in memory on first use and every change is written
+    through to Config. Code that writes these fields without going through
+    this class must call ``invalidate`` afterwards.
+    """
 
     def __init__(self, config: Config):
         self.config = config
+        self._accounts: dict[int, dict] = {}
+        # Called with a user ID (or None for everyone) when registration or a
+        # collection changes, so precomputed bid eligibility can be dropped.
+        self.on_account_change: Optional[Callable[[Optional[int]], None]] = None
+
+    def _changed(self, user_id: Optional[int]) -> None:
+        if self.on_account_change is not None:
+            self.on_account_change(user_id)
+
+    def _lock_for(self, user_id: int) -> asyncio.Lock:
+        lock = _ACCOUNT_LOCKS.get(user_id)
+        if lock is None:
+            lock = _ACCOUNT_LOCKS[user_id] = asyncio.Lock()
+        return lock
+
+    async def _account(self, user_id: int) -> dict:
+        """Return the cached account for a user, loading it from Config once."""
+        account = self._accounts.get(user_id)
+        if account is not None:
+            return account
+
+        async with self._lock_for(user_id):
+            return await self._account_locked(user_id)
+
+    async def _account_locked(self, user_id: int) -> dict:
+        """Like ``_account`` for callers already holding the user's lock."""
+        account = self._accounts.get(user_id)
+        if account is None:
+            data = await self.config.user_from_id(user_id).all()
+            account = {field: data[field] for field in _CACHED_FIELDS}
+            account["characters"] = list(account["characters"])
+            self._accounts[user_id] = account
+        return account
+
+    async def _persist(self, user_id: int, account: dict, *fields: str) -> None:
+        """Write cached fields through to Config.
+
+        Writes for one user are serialised and always store the account's
+        latest values, so the last write to land matches the cache.
+        """
+        player = self.config.user_from_id(user_id)
+        async with self._lock_for(user_id):
+            for field in fields:
+                value = account[field]
+                await getattr(player, field).set(list(value) if isinstance(value, list) else value)
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop one cached account, or every cached account, after an external write."""
+        if user_id is None:
+            self._accounts.clear()
+        else:
+            self._accounts.pop(user_id, None)
+        self._changed(user_id)
 
     async def register_player(self, user_id: int) -> bool:
         """Register a player and repair partial account state without resetting progress."""
         player = self.config.user_from_id(user_id)
 
-        async with _ACCOUNT_LOCK:
+        async with self._lock_for(user_id):
             if await player.started():
                 return False
 
@@ -35,6 +99,9 @@ class Economy:
                 or data.get("cooldowns", {})
             )
 
+            # The account is rewritten below, so any cached copy is stale.
+            self._accounts.pop(user_id, None)
+            self._changed(user_id)
             await player.started.set(True)
             if not has_existing_data:
                 await player.balance.set(int(await self.config.starting_balance() or 0))
@@ -50,56 +117,58 @@ class Economy:
             return False
 
     async def exists(self, user_id: int) -> bool:
-        return await self.config.user_from_id(user_id).started()
+        return bool((await self._account(user_id))["started"])
 
     async def balance(self, user_id: int) -> int:
-        return await self.config.user_from_id(user_id).balance()
+        return (await self._account(user_id))["balance"]
 
     async def reserved(self, user_id: int) -> int:
-        return await self.config.user_from_id(user_id).reserved()
+        return (await self._account(user_id))["reserved"]
 
-    async def reconcile_reservation(self, user_id: int) -> int:
-        """Keep a user's held funds equal to their active highest bid, if any."""
-        state = await self.config.current_auction()
+    async def reconcile_reservation(self, user_id: int, state: Optional[dict[str, Any]] = None) -> int:
+        """Keep a user's held funds equal to their active highest bid, if any.
+
+        Pass the live auction ``state`` when the caller already holds it to skip
+        reading it back from Config.
+        """
+        if state is None:
+            state = await self.config.current_auction()
         highest_bidder_id = int(state.get("highest_bidder_id", 0) or 0) if state else 0
         expected = int(state.get("bid", 0) or 0) if highest_bidder_id == user_id else 0
 
-        player = self.config.user_from_id(user_id)
-        reserved = await player.reserved()
-        if reserved != expected:
-            await player.reserved.set(expected)
+        account = await self._account(user_id)
+        if account["reserved"] != expected:
+            account["reserved"] = expected
+            await self._persist(user_id, account, "reserved")
         return expected
 
-    async def available(self, user_id: int) -> int:
-        bal = await self.balance(user_id)
-        res = await self.reconcile_reservation(user_id)
+    async def available(self, user_id: int, state: Optional[dict[str, Any]] = None) -> int:
+        res = await self.reconcile_reservation(user_id, state)
+        bal = (await self._account(user_id))["balance"]
         return bal - res
 
-    async def available_balance(self, user_id: int) -> int:
+    async def available_balance(self, user_id: int, state: Optional[dict[str, Any]] = None) -> int:
         """Alias for the API contract used by the auction manager."""
-        return await self.available(user_id)
+        return await self.available(user_id, state)
 
     async def deposit(self, user_id: int, amount: int):
-        player = self.config.user_from_id(user_id)
-
-        bal = await player.balance()
-        await player.balance.set(bal + amount)
+        account = await self._account(user_id)
+        account["balance"] += amount
+        await self._persist(user_id, account, "balance")
 
     async def adjust_balance(self, user_id: int, delta: int) -> int:
         """Apply a positive or negative balance change and return the amount actually applied.
 
         Negative deltas are clamped so reserved (currently-bid) beri is never touched.
         """
-        player = self.config.user_from_id(user_id)
-
-        bal = await player.balance()
-        reserved = await player.reserved()
+        account = await self._account(user_id)
 
         if delta < 0:
-            available = max(bal - reserved, 0)
+            available = max(account["balance"] - account["reserved"], 0)
             delta = -min(-delta, available)
 
-        await player.balance.set(bal + delta)
+        account["balance"] += delta
+        await self._persist(user_id, account, "balance")
         return delta
 
     async def withdraw(self, user_id: int, amount: int) -> bool:
@@ -108,70 +177,124 @@ class Economy:
         if available < amount:
             return False
 
-        player = self.config.user_from_id(user_id)
-
-        bal = await player.balance()
-        await player.balance.set(bal - amount)
+        account = await self._account(user_id)
+        account["balance"] -= amount
+        await self._persist(user_id, account, "balance")
 
         return True
 
-    async def reserve(self, user_id: int, amount: int) -> bool:
-        available = await self.available(user_id)
+    async def reserve(self, user_id: int, amount: int, state: Optional[dict[str, Any]] = None) -> bool:
+        available = await self.available(user_id, state)
 
         if available < amount:
             return False
 
-        player = self.config.user_from_id(user_id)
-
-        await player.reserved.set(amount)
+        account = await self._account(user_id)
+        account["reserved"] = amount
+        await self._persist(user_id, account, "reserved")
 
         return True
 
     async def release(self, user_id: int):
-        await self.config.user_from_id(user_id).reserved.set(0)
+        account = await self._account(user_id)
+        account["reserved"] = 0
+        await self._persist(user_id, account, "reserved")
 
     async def finalize_purchase(self, user_id: int, price: int):
         """Charge the recorded winning price and release the bid reservation."""
-        player = self.config.user_from_id(user_id)
-
-        bal = await player.balance()
-        await player.balance.set(bal - price)
-        await player.reserved.set(0)
+        account = await self._account(user_id)
+        account["balance"] -= price
+        account["reserved"] = 0
+        await self._persist(user_id, account, "balance", "reserved")
 
     async def add_character(self, user_id: int, character_id: int):
-        player = self.config.user_from_id(user_id)
+        account = await self._account(user_id)
 
-        chars = await player.characters()
+        if character_id not in account["characters"]:
+            account["characters"].append(character_id)
+            self._changed(user_id)
 
-        if character_id not in chars:
-            chars.append(character_id)
-
-        await player.characters.set(chars)
+        await self._persist(user_id, account, "characters")
 
     async def remove_character(self, user_id: int, character_id: int):
-        player = self.config.user_from_id(user_id)
+        account = await self._account(user_id)
 
-        chars = await player.characters()
+        if character_id in account["characters"]:
+            account["characters"].remove(character_id)
+            self._changed(user_id)
 
-        if character_id in chars:
-            chars.remove(character_id)
-
-        await player.characters.set(chars)
+        await self._persist(user_id, account, "characters")
 
     async def get_characters(self, user_id: int):
-        return await self.config.user_from_id(user_id).characters()
+        return list((await self._account(user_id))["characters"])
+
+    def reconcile_reservations(self, user_ids: list[int], state: Optional[dict[str, Any]]) -> dict[int, int]:
+        """``reconcile_reservation`` for many users without awaiting anything.
+
+        Cached accounts get their hold set in memory; ``collect_tax`` stores it
+        with the account's next write. Returns the expected hold of every user
+        that is not cached yet, for ``collect_tax`` to apply when it loads them.
+        """
+        highest_bidder_id = int(state.get("highest_bidder_id", 0) or 0) if state else 0
+        highest_bid = int(state.get("bid", 0) or 0) if state else 0
+        holds = {}
+        for user_id in user_ids:
+            expected = highest_bid if user_id == highest_bidder_id else 0
+            account = self._accounts.get(user_id)
+            if account is None:
+                holds[user_id] = expected
+            else:
+                account["reserved"] = expected
+        return holds
+
+    async def collect_tax(self, user_id: int, rate: float, hold: Optional[int] = None) -> tuple[int, int]:
+        """Charge one daily tax payment and return ``(amount, deduction_used)``.
+
+        The charge is worked out from the cached balance and reservation under
+        the account lock, and balance, reserved, charitable_deductions and
+        taxes_paid are stored in one write. ``hold`` is the reservation from
+        ``reconcile_reservations``, used only if the account is still uncached.
+        """
+        player = self.config.user_from_id(user_id)
+        async with self._lock_for(user_id):
+            cached = user_id in self._accounts
+            account = await self._account_locked(user_id)
+            if not cached and hold is not None:
+                account["reserved"] = hold
+
+            async with player.all() as data:
+                available = max(account["balance"] - account["reserved"], 0)
+                deduction = int(data.get("charitable_deductions", 0) or 0)
+                deduction_used = min(available, deduction)
+                amount = int((available - deduction_used) * rate / 100)
+                if amount < 1:
+                    amount = 0
+                data["balance"] = account["balance"] - amount
+                data["reserved"] = account["reserved"]
+                data["charitable_deductions"] = deduction - deduction_used
+                data["taxes_paid"] = int(data.get("taxes_paid", 0) or 0) + amount
+            # Deduct rather than assign: a deposit made while the write was in
+            # flight has already been added to the cached balance.
+            account["balance"] -= amount
+        return amount, deduction_used
+
+    async def add_charitable_deduction(self, user_id: int, amount: int) -> None:
+        """Credit a vault donation, under the account lock that ``collect_tax`` also takes."""
+        player = self.config.user_from_id(user_id)
+        async with self._lock_for(user_id):
+            await player.charitable_deductions.set(int(await player.charitable_deductions() or 0) + amount)
 
     async def claim_daily(self, user_id: int, amount: int) -> int:
         """Grant one daily payment or return the seconds remaining to claim."""
-        player = self.config.user_from_id(user_id)
+        account = await self._account(user_id)
 
-        last = await player.last_daily()
+        last = account["last_daily"]
         now = utc_timestamp()
         remaining = 86400 - (now - last)
         if last and remaining > 0:
             return remaining
 
-        bal = await player.balance()
-        await player.balance.set(bal + amount)
-        await player.last_daily.set(now)
+        account["balance"] += amount
+        account["last_daily"] = now
+        await self._persist(user_id, account, "balance", "last_daily")
         return 0
\ No newline at end of file
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Iterator
+
+from redbot.core import Config
+
+from .constants import HISTORY_ARCHIVE_BATCH
+
+log = logging.getLogger("red.opauction")
+
+
+class TransactionHistory:
+    """Bounded economy history with monthly on-disk archive segments.
+
+    The newest ``limit`` entries stay in Config (and in memory) so recent
+    ledger operations such as ``repairlast`` keep working. Once the recent
+    buffer grows ``HISTORY_ARCHIVE_BATCH`` entries past the limit, the oldest
+    overflow is appended to ``history/<YYYY-MM>.jsonl`` in one worker-thread write.
+    """
+
+    def __init__(self, config: Config, directory: Path):
+        self.config = config
+        self.archive_dir = directory / "history"
+        self.limit = 0
+        self._recent: list[dict] = []
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """Load the recent buffer and retention limit from Config."""
+        self.limit = int(await self.config.transaction_history_limit())
+        self._recent = list(await self.config.transaction_history())
+
+    def recent(self) -> list[dict]:
+        """Return the live recent buffer, oldest first; call ``save`` after editing it."""
+        return self._recent
+
+    async def append(self, entries: list[dict]) -> None:
+        """Add entries, spilling the oldest overflow to the archive in batches."""
+        async with self._lock:
+            self._recent.extend(entries)
+            overflow = []
+            if len(self._recent) >= self.limit + HISTORY_ARCHIVE_BATCH:
+                cut = len(self._recent) - self.limit
+                overflow = self._recent[:cut]
+                del self._recent[:cut]
+            if overflow:
+                # Archive first so a failed write never drops entries from Config.
+                try:
+                    await asyncio.to_thread(self._archive_sync, overflow)
+                except OSError:
+                    log.exception("Unable to archive OPAuction transaction history")
+                    self._recent[:0] = overflow
+            await self.config.transaction_history.set(self._recent)
+
+    async def save(self) -> None:
+        async with self._lock:
+            await self.config.transaction_history.set(self._recent)
+
+    async def set_limit(self, limit: int) -> None:
+        """Change how many entries stay in the recent buffer."""
+        self.limit = limit
+        await self.config.transaction_history_limit.set(limit)
+        await self.append([])
+
+    async def clear(self) -> None:
+        """Forget the recent buffer and delete every archive segment."""
+        async with self._lock:
+            self._recent = []
+            await self.config.transaction_history.set([])
+            await asyncio.to_thread(self._clear_archive_sync)
+
+    async def page(self, page: int, page_size: int = 10) -> tuple[list[dict], bool]:
+        """Return one newest-first page of history and whether an older page exists."""
+        skip = page * page_size
+        recent = self._recent[::-1]
+        entries = recent[skip:skip + page_size + 1]
+        if len(entries) <= page_size:
+            wanted = page_size + 1 - len(entries)
+            entries += await asyncio.to_thread(
+                self._archive_slice_sync,
+                max(0, skip - len(recent)),
+                wanted,
+            )
+        return entries[:page_size], len(entries) > page_size
+
+    def iter_archive(self) -> Iterator[dict]:
+        """Stream archived entries newest first, reading one segment at a time."""
+        for segment in sorted(self.archive_dir.glob("*.jsonl"), reverse=True):
+            with segment.open("r", encoding="utf-8") as fp:
+                lines = fp.readlines()
+            for line in reversed(lines):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+    # -----------------------
+    # Worker-thread helpers
+    # -----------------------
+
+    def _archive_sync(self, entries: list[dict]) -> None:
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        segments: dict[str, list[str]] = {}
+        for entry in entries:
+            month = time.strftime("%Y-%m", time.gmtime(int(entry.get("timestamp", 0) or 0)))
+            segments.setdefault(month, []).append(json.dumps(entry, separators=(",", ":")) + "\n")
+        for month, lines in segments.items():
+            with (self.archive_dir / f"{month}.jsonl").open("a", encoding="utf-8") as fp:
+                fp.writelines(lines)
+
+    def _archive_slice_sync(self, skip: int, count: int) -> list[dict]:
+        entries = []
+        for entry in self.iter_archive():
+            if skip:
+                skip -= 1
+                continue
+            entries.append(entry)
+            if len(entries) >= count:
+                break
+        return entries
+
+    def _clear_archive_sync(self) -> None:
+        for segment in self.archive_dir.glob("*.jsonl"):
+            segment.unlink(missing_ok=True)
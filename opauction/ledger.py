@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+log = logging.getLogger("red.opauction")
+
+
+class TaxLedger:
+    """Append-only JSON Lines ledger of daily tax payments.
+
+    ``tax_records.jsonl`` holds one payment per line and only ever grows by
+    appending; each batch is one fsynced append from a worker thread.
+    Per-member totals live in Config (``taxes_paid``), so no index is kept.
+    """
+
+    def __init__(self, directory: Path):
+        self.path = directory / "tax_records.jsonl"
+        self.legacy_path = directory / "tax_records.json"
+        self._lock = asyncio.Lock()
+
+    async def append(self, payments: list[dict]) -> None:
+        """Append a batch of payments in one write."""
+        if not payments:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._append_sync, payments)
+
+    async def replace(self, payments: Iterable[dict]) -> None:
+        """Replace the whole ledger, as done when rebuilding from the log channel."""
+        async with self._lock:
+            await asyncio.to_thread(self._replace_sync, payments)
+
+    # -----------------------
+    # Worker-thread helpers
+    # -----------------------
+
+    @staticmethod
+    def _encode(payments: Iterable[dict]) -> Iterator[bytes]:
+        for payment in payments:
+            yield (json.dumps(payment, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _append_sync(self, payments: list[dict]) -> None:
+        self._migrate_legacy_sync()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a+b") as fp:
+            end = fp.seek(0, os.SEEK_END)
+            if end:
+                fp.seek(end - 1)
+                if fp.read(1) != b"\n":
+                    # finish a line torn by a crash so it can't swallow the first new payment
+                    fp.write(b"\n")
+            fp.writelines(self._encode(payments))
+            fp.flush()
+            os.fsync(fp.fileno())
+
+    def _replace_sync(self, payments: Iterable[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".jsonl.tmp")
+        with temp_path.open("wb") as fp:
+            fp.writelines(self._encode(payments))
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp_path, self.path)
+
+    def _migrate_legacy_sync(self) -> None:
+        """Convert the old whole-file ``tax_records.json`` once, before the first JSONL write."""
+        if self.path.exists() or not self.legacy_path.exists():
+            return
+        try:
+            records = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            log.warning("Legacy OPAuction tax_records.json is unreadable; starting a new ledger")
+            return
+        payments = records.get("payments", []) if isinstance(records, dict) else []
+        self._replace_sync(
+            payment
+            for payment in payments
+            if isinstance(payment, dict) and "user_id" in payment and "amount" in payment
+        )
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import io
 import itertools
-import json
 import logging
 import random
 import re
@@ -15,10 +14,12 @@ from redbot.core import Config, commands
 
 from .auction import AuctionManager
 from .characters import CharacterManager
+from .debts import DebtIndex
 from .constants import (
     AUCTION_TAX,
     DEFAULT_AUCTION_DURATION,
     DEFAULT_AUCTION_INTERVAL,
+    EMBED_UPDATE_INTERVAL,
     LOAN_GRACE_PERIOD_SECONDS,
     OFFER_TIMEOUT_SECONDS,
     LOAN_INTEREST_RATE,
@@ -35,9 +36,13 @@ from .constants import (
     STEAL_MIN_PENALTY,
     STEAL_MIN_REWARD,
     STEAL_SUCCESS_CHANCE,
+    TAX_INTERVAL_SECONDS,
+    TRANSACTION_HISTORY_LIMIT,
 )
 from .economy import Economy
+from .history import TransactionHistory
 from .leaderboard import BalanceLeaderboardView, CharacterListView
+from .ledger import TaxLedger
 from .utils import clean_name, format_berries, format_duration, utc_timestamp
 from .views import AuctionEmbeds, AuctionPingView
 
@@ -72,6 +77,7 @@ class OPAuction(commands.Cog):
             "auction_running": False,
             "auction_duration": DEFAULT_AUCTION_DURATION,
             "auction_interval": DEFAULT_AUCTION_INTERVAL,
+            "embed_update_interval": EMBED_UPDATE_INTERVAL,
             "current_auction": {},
             "auction_runner_id": None,
             "character_roster": None,
@@ -84,6 +90,7 @@ class OPAuction(commands.Cog):
             "total_fees": 0,
             "last_sale_prices": {},
             "transaction_history": [],
+            "transaction_history_limit": TRANSACTION_HISTORY_LIMIT,
             "next_auction_source": "queue",
             "last_auction_source": "pool",
             "forced_next_source": None,
@@ -115,7 +122,11 @@ class OPAuction(commands.Cog):
 
         self.economy = Economy(self.config)
         self.characters = CharacterManager(self)
+        self.debts = DebtIndex()
+        self.tax_ledger = TaxLedger(Path(__file__).parent / "data")
+        self.history = TransactionHistory(self.config, Path(__file__).parent / "data")
         self.auction = AuctionManager(self)
+        self.economy.on_account_change = self.auction.invalidate_bidder
         self.auction_task = None
 
     async def cog_load(self):
@@ -126,12 +137,17 @@ class OPAuction(commands.Cog):
         elif not self.characters.load_roster(saved_roster):
             log.warning("Saved OPAuction character roster was invalid; using the bundled roster.")
             await self.config.character_roster.set(self.characters.all())
-        for user_id, data in (await self.config.all_users()).items():
+        users = await self.config.all_users()
+        for user_id, data in users.items():
             if int(data.get("debt", 0) or 0) and not int(data.get("debt_started_at", 0) or 0):
-                await self.config.user_from_id(int(user_id)).debt_started_at.set(utc_timestamp())
+                data["debt_started_at"] = utc_timestamp()
+                await self.config.user_from_id(int(user_id)).debt_started_at.set(data["debt_started_at"])
         # self.owners is in-memory only; without this, every character looks
         # unowned after a restart until the destructive `wipe` command runs.
         await self.characters.rebuild_owners()
+        self.debts.rebuild(users)
+        await self.history.load()
+        self.auction.renderer.interval = await self.config.embed_update_interval()
         await self.rebuild_reservations()
         self.bot.add_view(AuctionPingView(self))
         self.auction_task = self.bot.loop.create_task(self.auction.background_loop())
@@ -139,6 +155,7 @@ class OPAuction(commands.Cog):
     def cog_unload(self):
         if self.auction_task:
             self.auction_task.cancel()
+        self.auction.renderer.cancel()
 
     async def red_delete_data_for_user(self, **kwargs):
         """Redbot data cleanup hook."""
@@ -243,9 +260,12 @@ class OPAuction(commands.Cog):
 
     async def record_transaction(self, kind: str, **details) -> None:
         """Store a bounded history of completed economy changes."""
-        history = await self.config.transaction_history()
-        history.append({"kind": kind, "timestamp": utc_timestamp(), "reversed": False, **details})
-        await self.config.transaction_history.set(history)
+        await self.record_transactions([{"kind": kind, **details}])
+
+    async def record_transactions(self, entries: list[dict]) -> None:
+        """Append several history entries with a single Config write."""
+        timestamp = utc_timestamp()
+        await self.history.append([{"timestamp": timestamp, "reversed": False, **entry} for entry in entries])
 
     async def record_tax_paid(self, user_id: int, amount: int) -> None:
         """Add a daily tax payment to a member's cumulative tax ledger."""
@@ -253,37 +273,16 @@ class OPAuction(commands.Cog):
             player = self.config.user_from_id(user_id)
             await player.taxes_paid.set(int(await player.taxes_paid() or 0) + amount)
 
-    async def record_tax_json(
-        self,
-        user_id: int,
-        amount: int,
-        rate: float,
-        deduction_used: int,
-    ) -> None:
-        """Append one daily tax payment to the JSON audit ledger."""
-        path = Path(__file__).parent / "data" / "tax_records.json"
+    async def record_tax_payments(self, payments: list[dict]) -> None:
+        """Append a batch of daily tax payments to the JSONL audit ledger.
+
+        Each payment holds ``user_id``, ``amount``, ``rate`` and ``deduction_used``.
+        """
+        timestamp = utc_timestamp()
         try:
-            records = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {"payments": [], "totals": {}}
-            if not isinstance(records, dict):
-                records = {"payments": [], "totals": {}}
-            payments = records.setdefault("payments", [])
-            totals = records.setdefault("totals", {})
-            payments.append(
-                {
-                    "timestamp": utc_timestamp(),
-                    "user_id": user_id,
-                    "amount": amount,
-                    "rate": rate,
-                    "deduction_used": deduction_used,
-                }
-            )
-            records["payments"] = payments
-            user_key = str(user_id)
-            totals[user_key] = int(totals.get(user_key, 0) or 0) + amount
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(json.dumps(records, indent=2), encoding="utf-8")
-        except (OSError, json.JSONDecodeError):
-            log.exception("Unable to write OPAuction tax JSON ledger")
+            await self.tax_ledger.append([{"timestamp": timestamp, **payment} for payment in payments])
+        except (OSError, ValueError):
+            log.exception("Unable to write OPAuction tax ledger")
 
     async def record_fee_paid(self, user_id: int, amount: int) -> None:
         """Add an Auction House fee to a member's cumulative fee ledger."""
@@ -292,7 +291,7 @@ class OPAuction(commands.Cog):
             await player.fees_paid.set(int(await player.fees_paid() or 0) + amount)
 
     async def rebuild_tax_fee_ledgers(self) -> dict[str, int] | None:
-        """Rebuild tax totals from log embeds and fee totals from transaction history."""
+        """Rebuild tax and fee totals, and the tax ledger, from the log channel's transaction embeds."""
         users = await self.config.all_users()
         totals = {
             int(user_id): {"taxes": 0, "fees": 0}
@@ -377,18 +376,7 @@ class OPAuction(commands.Cog):
         except (discord.Forbidden, discord.HTTPException):
             return None
 
-        path = Path(__file__).parent / "data" / "tax_records.json"
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(
-            json.dumps(
-                {
-                    "payments": tax_payments,
-                    "totals": {str(user_id): amounts["taxes"] for user_id, amounts in totals.items()},
-                },
-                indent=2,
-            ),
-            encoding="utf-8",
-        )
+        await self.tax_ledger.replace(tax_payments)
         for user_id, amounts in totals.items():
             player = self.config.user_from_id(user_id)
             await player.taxes_paid.set(amounts["taxes"])
@@ -429,6 +417,7 @@ class OPAuction(commands.Cog):
         for user_id in (await self.config.all_users()):
             reserved = highest_bid if int(user_id) == highest_bidder_id else 0
             await self.config.user_from_id(int(user_id)).reserved.set(reserved)
+        self.economy.invalidate()
 
     async def start_cooldown(self, user_id: int, key: str, seconds: int) -> int:
         """Return 0 and start the named cooldown, or the seconds remaining if still active.
@@ -456,10 +445,26 @@ class OPAuction(commands.Cog):
 
     async def debt_is_overdue(self, user_id: int) -> bool:
         """Return whether a user's unpaid loan has passed its 48-hour grace period."""
+        return self.debts.is_overdue(user_id, utc_timestamp())
+
+    async def store_debt(self, user_id: int, debt: int, *, started_at: int | None = None) -> None:
+        """Persist a member's loan debt and keep the overdue-debt index in step.
+
+        Pass ``started_at`` for a new loan; a zero debt also clears the grace timer.
+        """
         player = self.config.user_from_id(user_id)
-        debt = int(await player.debt() or 0)
-        started_at = int(await player.debt_started_at() or 0)
-        return debt > 0 and started_at > 0 and utc_timestamp() - started_at >= LOAN_GRACE_PERIOD_SECONDS
+        await player.debt.set(debt)
+        if started_at is not None:
+            await player.debt_started_at.set(started_at)
+            await player.debt_recollection_notified.set(False)
+            self.debts.set(user_id, debt, started_at)
+        elif debt == 0:
+            await player.debt_started_at.set(0)
+            self.debts.discard(user_id)
+        else:
+            self.debts.update_debt(user_id, debt)
+        self.auction.invalidate_bidder(user_id)
+        await self.auction.schedule_recollection()
 
     async def debt_blocks_sales(self, user_id: int) -> bool:
         """Return whether overdue debt blocks a user from selling characters."""
@@ -467,17 +472,11 @@ class OPAuction(commands.Cog):
 
     async def notify_recollection_due(self) -> None:
         """Notify the debt log once when unpaid debt passes its grace period."""
-        due_entries = []
-        for user_id, data in (await self.config.all_users()).items():
-            user_id = int(user_id)
-            if (
-                int(data.get("debt", 0) or 0) > 0
-                and not data.get("debt_recollection_notified", False)
-                and await self.debt_is_overdue(user_id)
-            ):
-                due_entries.append((user_id, int(data["debt"])))
-
-        if not due_entries or not await self.log_recollection_due(due_entries):
+        due_entries = self.debts.pop_due(utc_timestamp())
+        if not due_entries:
+            return
+        if not await self.log_recollection_due(due_entries):
+            self.debts.requeue([user_id for user_id, _ in due_entries])
             return
         for user_id, _ in due_entries:
             await self.config.user_from_id(user_id).debt_recollection_notified.set(True)
@@ -489,7 +488,7 @@ class OPAuction(commands.Cog):
 
         now = utc_timestamp()
         last_collected = int(await self.config.tax_last_collected() or 0)
-        if not force and now - last_collected < 24 * 60 * 60:
+        if not force and now - last_collected < TAX_INTERVAL_SECONDS:
             return
 
         tax_rate = float(await self.config.tax_rate() or 0)
@@ -497,49 +496,51 @@ class OPAuction(commands.Cog):
             return
 
         collected = []
-        async with self.auction._state_lock:
-            # Recheck after waiting for the auction lock so only one runner can collect.
+        async with self.auction._tax_lock:
+            # Recheck after waiting for the tax lock so only one runner can collect.
             last_collected = int(await self.config.tax_last_collected() or 0)
-            if utc_timestamp() - last_collected < 24 * 60 * 60:
+            if utc_timestamp() - last_collected < TAX_INTERVAL_SECONDS:
                 return
-            for user_id, data in (await self.config.all_users()).items():
-                if not data.get("started"):
-                    continue
-                user_id = int(user_id)
-                available = await self.economy.available_balance(user_id)
-                deduction = int(data.get("charitable_deductions", 0) or 0)
-                deduction_used = min(available, deduction)
-                taxable_balance = available - deduction_used
-                amount = int(taxable_balance * tax_rate / 100)
-                if deduction_used:
-                    await self.config.user_from_id(user_id).charitable_deductions.set(
-                        deduction - deduction_used
-                    )
-                if amount < 1:
-                    continue
-                await self.economy.adjust_balance(user_id, -amount)
-                await self.record_tax_paid(user_id, amount)
-                await self.record_transaction(
-                    "daily_tax_payment",
-                    user_id=user_id,
-                    amount=amount,
-                    rate=tax_rate,
-                    deduction_used=deduction_used,
-                )
-                await self.record_tax_json(user_id, amount, tax_rate, deduction_used)
-                collected.append((user_id, amount, deduction_used))
+
+            users = await self.config.all_users()
+            started = [int(user_key) for user_key, data in users.items() if data.get("started")]
+
+            # The auction lock is only held to line reservations up with the
+            # current bid. Bids placed afterwards update the cached reservation,
+            # which collect_tax reads under each account lock.
+            async with self.auction._state_lock:
+                state = await self.auction.get_current_auction()
+                holds = self.economy.reconcile_reservations(started, state)
+
+            for user_id in started:
+                amount, deduction_used = await self.economy.collect_tax(user_id, tax_rate, holds.get(user_id))
+                if amount:
+                    collected.append((user_id, amount, deduction_used))
 
             total_collected = sum(amount for _, amount, _ in collected)
             vault_balance = await self.config.total_fees()
             await self.config.total_fees.set(vault_balance + total_collected)
             await self.config.tax_last_collected.set(utc_timestamp())
-            await self.record_transaction(
-                "daily_tax",
-                rate=tax_rate,
-                amount=total_collected,
-                payers=len(collected),
+            await self.record_transactions(
+                [
+                    {
+                        "kind": "daily_tax_payment",
+                        "user_id": user_id,
+                        "amount": amount,
+                        "rate": tax_rate,
+                        "deduction_used": deduction_used,
+                    }
+                    for user_id, amount, deduction_used in collected
+                ]
+                + [{"kind": "daily_tax", "rate": tax_rate, "amount": total_collected, "payers": len(collected)}]
             )
 
+        await self.record_tax_payments(
+            [
+                {"user_id": user_id, "amount": amount, "rate": tax_rate, "deduction_used": deduction_used}
+                for user_id, amount, deduction_used in collected
+            ]
+        )
         for user_id, amount, deduction_used in collected:
             await self.log_transaction(
                 "🏦 Daily Auction Tax",
@@ -616,10 +617,10 @@ class OPAuction(commands.Cog):
         if await self.is_blocked(message.author.id):
             return
 
-        if await self.config.auction_running() is False:
+        if not await self.auction.is_running():
             return
 
-        state = await self.auction.get_current_auction()
+        state = await self.auction.live_state()
         if not state:
             return
 
@@ -1166,6 +1167,7 @@ class OPAuction(commands.Cog):
         trade["message_id"] = offer_message.id
         pending_trades[str(ctx.author.id)] = trade
         await self.config.pending_trades.set(pending_trades)
+        self.auction.schedule_offer_expiry(trade["created_at"])
         try:
             await offer_message.add_reaction("✅")
             await offer_message.add_reaction("❌")
@@ -1637,13 +1639,15 @@ class OPAuction(commands.Cog):
             )
         )
         pending_loans = await self.config.pending_loans()
+        created_at = utc_timestamp()
         pending_loans[str(ctx.author.id)] = {
             "amount": amount,
             "debt": debt,
             "message_id": offer_message.id,
-            "created_at": utc_timestamp(),
+            "created_at": created_at,
         }
         await self.config.pending_loans.set(pending_loans)
+        self.auction.schedule_offer_expiry(created_at)
         try:
             await offer_message.add_reaction("✅")
             await offer_message.add_reaction("❌")
@@ -1747,9 +1751,7 @@ class OPAuction(commands.Cog):
 
             await self.config.total_fees.set(vault_balance - amount)
             await self.economy.deposit(user_id, amount)
-            await player.debt.set(debt)
-            await player.debt_started_at.set(utc_timestamp())
-            await player.debt_recollection_notified.set(False)
+            await self.store_debt(user_id, debt, started_at=utc_timestamp())
             await self.record_transaction("loan", user_id=user_id, amount=amount, debt=debt)
             pending_loans.pop(str(user_id), None)
             await self.config.pending_loans.set(pending_loans)
@@ -1791,9 +1793,7 @@ class OPAuction(commands.Cog):
                 )
 
             await self.economy.adjust_balance(ctx.author.id, -repayment)
-            await player.debt.set(debt - repayment)
-            if debt - repayment == 0:
-                await player.debt_started_at.set(0)
+            await self.store_debt(ctx.author.id, debt - repayment)
             vault_balance = await self.config.total_fees()
             await self.config.total_fees.set(vault_balance + repayment)
             await self.record_transaction(
@@ -1865,9 +1865,7 @@ class OPAuction(commands.Cog):
 
             remaining_debt = debt - payment
             await self.economy.adjust_balance(ctx.author.id, -payment)
-            await borrower.debt.set(remaining_debt)
-            if remaining_debt == 0:
-                await borrower.debt_started_at.set(0)
+            await self.store_debt(member.id, remaining_debt)
             vault_balance = await self.config.total_fees()
             await self.config.total_fees.set(vault_balance + payment)
             await self.record_transaction(
@@ -1915,10 +1913,7 @@ class OPAuction(commands.Cog):
             await self.economy.adjust_balance(ctx.author.id, -donation)
             vault_balance = await self.config.total_fees()
             await self.config.total_fees.set(vault_balance + donation)
-            player = self.config.user_from_id(ctx.author.id)
-            await player.charitable_deductions.set(
-                int(await player.charitable_deductions() or 0) + donation
-            )
+            await self.economy.add_charitable_deduction(ctx.author.id, donation)
             await self.record_transaction("vault_donation", user_id=ctx.author.id, amount=donation)
 
         await self.log_transaction(
@@ -1948,9 +1943,7 @@ class OPAuction(commands.Cog):
 
             await self.economy.adjust_balance(member.id, -collected)
             remaining_debt = debt - collected
-            await player.debt.set(remaining_debt)
-            if remaining_debt == 0:
-                await player.debt_started_at.set(0)
+            await self.store_debt(member.id, remaining_debt)
             vault_balance = await self.config.total_fees()
             await self.config.total_fees.set(vault_balance + collected)
             await self.record_transaction(
@@ -2048,9 +2041,7 @@ class OPAuction(commands.Cog):
             remaining_debt = debt - recovered
             await self.economy.remove_character(member.id, character_id)
             self.characters.unassign(character_id)
-            await player.debt.set(remaining_debt)
-            if remaining_debt == 0:
-                await player.debt_started_at.set(0)
+            await self.store_debt(member.id, remaining_debt)
             vault_balance = await self.config.total_fees()
             await self.config.total_fees.set(vault_balance + recovered)
             await self.record_transaction(
@@ -2153,9 +2144,7 @@ class OPAuction(commands.Cog):
                 self.characters.unassign(character_id)
 
             remaining_debt = debt - recovered
-            await player.debt.set(remaining_debt)
-            if remaining_debt == 0:
-                await player.debt_started_at.set(0)
+            await self.store_debt(member.id, remaining_debt)
             vault_balance = await self.config.total_fees()
             await self.config.total_fees.set(vault_balance + recovered)
             if surplus:
@@ -2195,8 +2184,7 @@ class OPAuction(commands.Cog):
         if debt < 1:
             return await ctx.send(embed=AuctionEmbeds.error("That member has no outstanding debt."))
 
-        await player.debt.set(0)
-        await player.debt_started_at.set(0)
+        await self.store_debt(member.id, 0)
         await self.record_transaction("debt_forgiveness", user_id=member.id, amount=debt)
         await self.log_transaction("🏦 Debt Forgiven", f"Member: {member.mention}\nForgiven debt: **{format_berries(debt)}**")
         await ctx.send(embed=AuctionEmbeds.success(f"Forgave {format_berries(debt)} of debt for {member.mention}."))
@@ -2278,6 +2266,7 @@ class OPAuction(commands.Cog):
         """Reset the daily claim timer for everyone or one member."""
         if member is not None:
             await self.config.user_from_id(member.id).last_daily.set(0)
+            self.economy.invalidate(member.id)
             return await ctx.send(
                 embed=AuctionEmbeds.success(f"Reset the daily claim timer for {member.mention}.")
             )
@@ -2289,6 +2278,7 @@ class OPAuction(commands.Cog):
                 continue
             await self.config.user_from_id(int(user_id)).last_daily.set(0)
             reset_count += 1
+        self.economy.invalidate()
 
         await ctx.send(
             embed=AuctionEmbeds.success(f"Reset the daily claim timer for {reset_count} player(s).")
@@ -2349,7 +2339,7 @@ class OPAuction(commands.Cog):
     @commands.admin_or_permissions(manage_guild=True)
     async def next_pool(self, ctx, *, name: str = None):
         """Make the next auction draw a random or specified pool character."""
-        available_pool = await self.characters.available_pool()
+        available_pool = self.characters.unowned
         if not available_pool:
             return await ctx.send(embed=AuctionEmbeds.error("There are no unowned characters in the pool."))
 
@@ -2422,6 +2412,7 @@ class OPAuction(commands.Cog):
             return await ctx.send(embed=AuctionEmbeds.error("The daily tax rate must be greater than 0 and at most 100%."))
 
         await self.config.tax_rate.set(percent)
+        await self.auction.schedule_taxes()
         await ctx.send(embed=AuctionEmbeds.success(f"Daily tax rate set to **{percent:g}%**."))
 
     @auction_group.command(name="sellhouserate", aliases=["sethousesellrate"])
@@ -2564,6 +2555,7 @@ class OPAuction(commands.Cog):
         await self.config.tax_running.set(True)
         await self.config.tax_last_collected.set(0)
         await self.collect_daily_taxes(force=True)
+        await self.auction.schedule_taxes()
         await ctx.send(
             embed=AuctionEmbeds.success(
                 f"Daily taxes started at **{rate:g}%** and have been collected now. "
@@ -2576,19 +2568,14 @@ class OPAuction(commands.Cog):
     async def stop_taxes(self, ctx):
         """Stop future automatic daily tax collections."""
         await self.config.tax_running.set(False)
+        await self.auction.schedule_taxes()
         await ctx.send(embed=AuctionEmbeds.success("Daily taxes have been stopped."))
 
     @auction_group.command(name="overduedebts", aliases=["debtreport"])
     @commands.admin_or_permissions(manage_guild=True)
     async def overdue_debts(self, ctx):
         """Post a report of members whose 48-hour loan grace period has expired."""
-        entries = []
-        for user_id, data in (await self.config.all_users()).items():
-            user_id = int(user_id)
-            debt = int(data.get("debt", 0) or 0)
-            if debt and await self.debt_is_overdue(user_id):
-                entries.append((user_id, debt))
-
+        entries = self.debts.overdue(utc_timestamp())
         entries.sort(key=lambda entry: entry[1], reverse=True)
         if not await self.log_overdue_debts(entries):
             return await ctx.send(
@@ -2739,6 +2726,7 @@ class OPAuction(commands.Cog):
                 removed_entries += len(set(old_collection) - set(new_collection))
                 restored_entries += len(set(new_collection) - set(old_collection))
                 await self.config.user_from_id(user_id).characters.set(new_collection)
+                self.economy.invalidate(user_id)
                 changed_users += 1
 
             await self.characters.rebuild_owners()
@@ -2766,26 +2754,27 @@ class OPAuction(commands.Cog):
             )
 
         async with self.auction._state_lock:
-            history = await self.config.transaction_history()
             reversed_count = 0
             blocked_reason = None
 
-            for entry_index in range(len(history) - 1, -1, -1):
-                if history[entry_index].get("reversed"):
+            # Walk a snapshot: entries are flagged in place on the live buffer,
+            # which unlocked commands may append to while a reversal awaits.
+            for entry in reversed(list(self.history.recent())):
+                if entry.get("reversed"):
                     continue
 
-                error = await self._reverse_transaction(history[entry_index])
+                error = await self._reverse_transaction(entry)
                 if error:
                     blocked_reason = error
                     break
 
-                history[entry_index]["reversed"] = True
+                entry["reversed"] = True
                 reversed_count += 1
                 if reversed_count >= count:
                     break
 
             if reversed_count:
-                await self.config.transaction_history.set(history)
+                await self.history.save()
 
         if not reversed_count:
             if blocked_reason:
@@ -2858,6 +2847,51 @@ class OPAuction(commands.Cog):
 
         return None
 
+    @auction_group.command(name="history", aliases=["ledger"])
+    @commands.admin_or_permissions(manage_guild=True)
+    async def transaction_history(self, ctx, page: int = 1):
+        """Page through recent and archived economy transactions, newest first."""
+        if page < 1:
+            return await ctx.send(embed=AuctionEmbeds.error("Page numbers start at 1."))
+
+        entries, has_older = await self.history.page(page - 1)
+        if not entries:
+            return await ctx.send(embed=AuctionEmbeds.error("There are no transactions on that page."))
+
+        lines = []
+        for entry in entries:
+            details = ", ".join(
+                f"{key}={value}"
+                for key, value in entry.items()
+                if key not in {"kind", "timestamp", "reversed"}
+            )
+            reversed_text = " (reversed)" if entry.get("reversed") else ""
+            lines.append(f"<t:{int(entry.get('timestamp', 0) or 0)}:R> **{entry.get('kind', 'unknown')}**{reversed_text}\n{details}")
+
+        embed = discord.Embed(title="📒 Transaction History", color=discord.Color.gold())
+        embed.description = "\n".join(lines)[:4000]
+        footer = f"Page {page}"
+        if has_older:
+            footer += f" • Use .auction history {page + 1} for older entries"
+        embed.set_footer(text=footer)
+        await ctx.send(embed=embed)
+
+    @auction_group.command(name="historylimit")
+    @commands.admin_or_permissions(manage_guild=True)
+    async def history_limit(self, ctx, limit: int = None):
+        """View or set how many transactions stay in the live ledger before archiving."""
+        if limit is None:
+            return await ctx.send(
+                embed=AuctionEmbeds.success(
+                    f"The live ledger keeps the latest **{self.history.limit}** transaction(s); older ones are archived to disk."
+                )
+            )
+        if limit < 50:
+            return await ctx.send(embed=AuctionEmbeds.error("Keep at least 50 transactions so `repairlast` can work."))
+
+        await self.history.set_limit(limit)
+        await ctx.send(embed=AuctionEmbeds.success(f"The live ledger now keeps the latest **{limit}** transaction(s)."))
+
     @auction_group.command(name="removecharacter", aliases=["rmchar"])
     @commands.admin_or_permissions(manage_guild=True)
     async def remove_character(self, ctx, *, name: str):
@@ -2898,7 +2932,7 @@ class OPAuction(commands.Cog):
     @commands.admin_or_permissions(manage_guild=True)
     async def wipe(self, ctx):
         """Reset all player, queue, and auction state in the cog."""
-        await self.config.auction_running.set(False)
+        await self.auction.stop()
         await self.auction.cancel_current_auction()
         await self.config.queue.set([])
         await self.config.last_auction_started.set(0)
@@ -2908,15 +2942,18 @@ class OPAuction(commands.Cog):
         await self.config.forced_next_character_id.set(None)
         await self.config.total_fees.set(0)
         await self.config.last_sale_prices.set({})
-        await self.config.transaction_history.set([])
+        await self.history.clear()
         await self.config.pending_trades.set({})
 
         users = await self.config.all_users()
         for user_id in list(users.keys()):
             player = self.config.user_from_id(int(user_id))
             await player.clear()
+        self.economy.invalidate()
 
         await self.characters.rebuild_owners()
+        self.debts.rebuild({})
+        await self.auction.schedule_recollection()
         await ctx.send(embed=AuctionEmbeds.success("All auction data, including the queue, has been wiped."))
 
     @auction_group.command(name="wipeuser", aliases=["resetuser"])
@@ -2943,7 +2980,10 @@ class OPAuction(commands.Cog):
             await self.config.queue.set(remaining_queue)
 
             await self.config.user_from_id(member.id).clear()
+            self.economy.invalidate(member.id)
             await self.characters.rebuild_owners()
+            self.debts.discard(member.id)
+            await self.auction.schedule_recollection()
 
         await ctx.send(
             embed=AuctionEmbeds.success(
@@ -2988,4 +3028,15 @@ class OPAuction(commands.Cog):
         if interval <= 0:
             return await ctx.send(embed=AuctionEmbeds.error("Interval must be positive."))
         await self.config.auction_interval.set(interval)
-        await ctx.send(f"Auction interval set to {interval} seconds.")
\ No newline at end of file
+        await self.auction.schedule_auction()
+        await ctx.send(f"Auction interval set to {interval} seconds.")
+
+    @auction_group.command(name="embedinterval")
+    @commands.admin_or_permissions(manage_guild=True)
+    async def set_embed_interval(self, ctx, seconds: float):
+        """Set the minimum seconds between live auction embed reposts during bidding."""
+        if seconds < 0:
+            return await ctx.send(embed=AuctionEmbeds.error("The embed interval cannot be negative."))
+        await self.config.embed_update_interval.set(seconds)
+        self.auction.renderer.interval = seconds
+        await ctx.send(f"Live auction embeds now refresh at most once every {seconds:g} seconds.")
\ No newline at end of file
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+log = logging.getLogger("red.opauction")
+
+
+class EmbedRenderer:
+    """Coalesces live auction display refreshes into at most one repost per interval.
+
+    ``request`` only marks the display dirty. A single background task draws
+    the newest state as soon as the interval allows, so a burst of bids costs
+    one Discord edit instead of one per bid. ``requested - rendered`` is the
+    number of edits saved for the current auction.
+    """
+
+    def __init__(self, render: Callable[[], Awaitable[None]], interval: float):
+        self._render = render
+        self.interval = interval
+        self._pending = False
+        self._task: asyncio.Task | None = None
+        self._flushing = asyncio.Event()
+        self._last_render = 0.0
+        self.requested = 0
+        self.rendered = 0
+
+    @property
+    def saved(self) -> int:
+        return max(0, self.requested - self.rendered)
+
+    def request(self) -> None:
+        """Mark the display dirty and make sure a render is on its way."""
+        self.requested += 1
+        self._pending = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            delay = self._last_render + self.interval - time.monotonic()
+            if delay > 0 and not self._flushing.is_set():
+                try:
+                    await asyncio.wait_for(self._flushing.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self._draw()
+
+    async def _draw(self) -> None:
+        self._pending = False
+        self._last_render = time.monotonic()
+        self.rendered += 1
+        try:
+            await self._render()
+        except Exception:
+            log.exception("Unable to refresh the live OPAuction embed")
+
+    async def flush(self) -> None:
+        """Draw any pending state now instead of waiting out the interval.
+
+        A render already in progress is allowed to finish. The render callback
+        takes the auction state lock, so callers must not hold it.
+        """
+        task = self._task
+        if task is None or task.done():
+            return
+        self._flushing.set()
+        try:
+            await task
+        finally:
+            self._flushing.clear()
+
+    def reset(self) -> None:
+        """Start counting afresh for the next auction."""
+        self.requested = 0
+        self.rendered = 0
+
+    def cancel(self) -> None:
+        """Drop any pending render, as done on cog unload."""
+        self._pending = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class DeadlineScheduler:
+    """Min-heap of named deadlines that the auction background loop sleeps on.
+
+    Each key holds at most one live deadline. Rescheduling a key leaves its old
+    heap entry behind; stale entries are discarded lazily when they surface.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, str]] = []
+        self._deadlines: dict[str, float] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+    def schedule(self, key: str, when: float, *, keep_earlier: bool = False) -> None:
+        """Set when a key is next due, waking the sleeper if it is now the earliest."""
+        current = self._deadlines.get(key)
+        if keep_earlier and current is not None and current <= when:
+            return
+
+        earliest = self.next_deadline()
+        self._deadlines[key] = when
+        heapq.heappush(self._heap, (when, next(self._counter), key))
+        if earliest is None or when < earliest:
+            self._wakeup.set()
+
+    def cancel(self, key: str) -> None:
+        """Forget a key's deadline; its heap entry is dropped when it surfaces."""
+        self._deadlines.pop(key, None)
+
+    def deadline(self, key: str) -> float | None:
+        return self._deadlines.get(key)
+
+    def next_deadline(self) -> float | None:
+        """Return the earliest live deadline, discarding stale heap entries."""
+        while self._heap:
+            when, _, key = self._heap[0]
+            if self._deadlines.get(key) == when:
+                return when
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: float) -> list[str]:
+        """Remove and return every key whose deadline has been reached."""
+        due = []
+        while True:
+            when = self.next_deadline()
+            if when is None or when > now:
+                return due
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            due.append(key)
+
+    async def wait(self, timeout: float) -> list[str]:
+        """Sleep until the earliest deadline, an earlier reschedule, or the timeout."""
+        self._wakeup.clear()
+        delay = timeout
+        when = self.next_deadline()
+        if when is not None:
+            delay = min(delay, max(0.0, when - time.time()))
+
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+        return self.pop_due(time.time())